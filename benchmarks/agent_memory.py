@@ -0,0 +1,80 @@
+"""Measure memory per agent for agent objects, populations and views.
+
+Reports the traced bytes per agent of ``n`` per-agent ``Household``/``Firm``
+objects, of a population holding ``n`` rows, and of ``n`` slotted views onto
+an existing population, as JSON.
+
+Example::
+
+    python benchmarks/agent_memory.py --agents 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from src.agents import (  # noqa: E402
+    Firm,
+    FirmPopulation,
+    Household,
+    HouseholdPopulation,
+)
+
+
+def _views(population_cls: type) -> Callable[[int], Any]:
+    def build(n: int) -> Callable[[], Any]:
+        population = population_cls(n)
+        return lambda: list(population)
+
+    return build
+
+
+#: Layout name -> ``build(n)`` returning a callable that allocates ``n`` agents.
+LAYOUTS: Dict[str, Callable[[int], Callable[[], Any]]] = {
+    "Household": lambda n: lambda: [Household(i, model=None) for i in range(n)],
+    "HouseholdPopulation": lambda n: lambda: HouseholdPopulation(n),
+    "HouseholdView": _views(HouseholdPopulation),
+    "Firm": lambda n: lambda: [Firm(i, model=None) for i in range(n)],
+    "FirmPopulation": lambda n: lambda: FirmPopulation(n),
+    "FirmView": _views(FirmPopulation),
+}
+
+
+def bytes_per_agent(layout: str, n: int) -> float:
+    """Return the traced memory retained per agent by ``layout``."""
+    allocate = LAYOUTS[layout](n)
+    tracemalloc.start()
+    try:
+        agents = allocate()
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del agents
+    return current / n
+
+
+def measure(n: int) -> List[Dict[str, Any]]:
+    """Return bytes per agent for every layout with ``n`` agents."""
+    return [
+        {"layout": name, "agents": n, "bytes_per_agent": bytes_per_agent(name, n)}
+        for name in LAYOUTS
+    ]
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--agents", type=int, default=100_000)
+    args = parser.parse_args(argv)
+    print(json.dumps(measure(args.agents), indent=2))
+
+
+if __name__ == "__main__":  # pragma: no cover - manual execution
+    main()
@@ -0,0 +1,116 @@
+"""Compare per-agent and batched ``LLMArchetype`` calls against a slow stub.
+
+The stub language model sleeps ``--latency-ms`` per call and answers with
+the prompt length; it also counts the calls it receives and the most it
+saw in flight at once.  ``--agents`` prompts are drawn from ``--distinct``
+different inputs, as when many households share the same situation, and
+the same tick is answered twice to show the effect of the response cache.
+
+Example::
+
+    python benchmarks/llm_batching.py --agents 1000 --distinct 100
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from src.behavior.archetypes import LLMArchetype  # noqa: E402
+
+
+class StubModel:
+    """Language model stub that sleeps ``latency`` seconds a call.
+
+    ``calls`` counts the prompts answered and ``peak`` the largest number
+    of calls that were in flight at the same time.
+    """
+
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+        self.calls = 0
+        self.peak = 0
+        self._active = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, prompt: str) -> str:
+        with self._lock:
+            self.calls += 1
+            self._active += 1
+            self.peak = max(self.peak, self._active)
+        time.sleep(self.latency)
+        with self._lock:
+            self._active -= 1
+        return str(len(prompt))
+
+    def counts(self) -> Dict[str, int]:
+        """Return the call count and peak concurrency seen so far."""
+        return {"calls": self.calls, "peak_concurrency": self.peak}
+
+
+def measure(
+    agents: int,
+    distinct: int,
+    latency_ms: float,
+    concurrency: int = 16,
+    ticks: int = 2,
+) -> Dict[str, Any]:
+    """Time ``ticks`` rounds of ``agents`` decisions, one by one and batched."""
+    inputs = [f"state {i % distinct}" for i in range(agents)]
+
+    sequential_model = StubModel(latency_ms / 1000)
+    sequential = LLMArchetype("decide", sequential_model, cache_size=0)
+    start = time.perf_counter()
+    for _ in range(ticks):
+        expected = [sequential.generate(text) for text in inputs]
+    sequential_s = time.perf_counter() - start
+
+    batched_model = StubModel(latency_ms / 1000)
+    batched = LLMArchetype("decide", batched_model, max_concurrency=concurrency)
+    start = time.perf_counter()
+    for _ in range(ticks):
+        responses = batched.generate_batch(inputs)
+    batched_s = time.perf_counter() - start
+    if responses != expected:
+        raise AssertionError("batched responses differ from sequential ones")
+
+    return {
+        "agents": agents,
+        "distinct": distinct,
+        "latency_ms": latency_ms,
+        "concurrency": concurrency,
+        "ticks": ticks,
+        "sequential_sec": sequential_s,
+        "batched_sec": batched_s,
+        "speedup": sequential_s / batched_s if batched_s else float("inf"),
+        "sequential_calls": sequential_model.counts(),
+        "batched_calls": batched_model.counts(),
+        "cache": batched.stats.to_dict(),
+    }
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--agents", type=int, default=1000)
+    parser.add_argument("--distinct", type=int, default=100)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--ticks", type=int, default=2)
+    args = parser.parse_args(argv)
+    result = measure(
+        args.agents, args.distinct, args.latency_ms, args.concurrency, args.ticks
+    )
+    print(json.dumps(result, indent=2))
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - manual execution
+    sys.exit(main())
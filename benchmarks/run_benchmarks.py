@@ -0,0 +1,250 @@
+"""Benchmark suite for the vector money simulation.
+
+Each benchmark is run for agent counts from ``10**2`` up to ``--max-agents``
+and reports throughput (steps/sec and agents*steps/sec) together with the
+peak traced memory.  Results are written as JSON; passing ``--baseline``
+compares them against a stored result file and exits non-zero when any
+benchmark became slower than the allowed ``--tolerance``.
+
+Example::
+
+    python benchmarks/run_benchmarks.py --output bench.json
+    python benchmarks/run_benchmarks.py --baseline bench.json --max-agents 10000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "scripts"))
+
+from src.biophysics import BioPhysicalStocks  # noqa: E402
+from src.doughnut_abm import DoughnutABM  # noqa: E402
+from src.markets import Market  # noqa: E402
+from src.models import BaselineModel, BatchedBaselineModel  # noqa: E402
+
+
+class _Trader:
+    def __init__(self) -> None:
+        self.wealth = 0.0
+
+
+def _split(agents: int) -> tuple[int, int]:
+    """Return ``(households, firms)`` for a total agent count."""
+    firms = max(1, agents // 10)
+    return agents - firms, firms
+
+
+def _baseline_model(vectorized: bool) -> Callable[[int, int], Callable[[], Any]]:
+    def setup(agents: int, steps: int) -> Callable[[], Any]:
+        households, firms = _split(agents)
+        model = BaselineModel(
+            households=households,
+            firms=firms,
+            vectorized=vectorized,
+            initial_stocks={"carbon_budget": 1e12, "water": 1e12},
+        )
+        return lambda: model.run(steps)
+
+    return setup
+
+
+def _baseline_ensemble(batched: bool) -> Callable[[int, int], Callable[[], Any]]:
+    """Many small models of two households and one firm (the example config)."""
+
+    def setup(agents: int, steps: int) -> Callable[[], Any]:
+        scenario = {"households": 2, "firms": 1, "has_bank": False}
+        models = [BaselineModel(**scenario) for _ in range(max(1, agents // 3))]
+        if batched:
+            batch = BatchedBaselineModel(models)
+            return lambda: batch.run(steps)
+        return lambda: [model.run(steps) for model in models]
+
+    return setup
+
+
+def _doughnut_abm(event_driven: bool) -> Callable[[int, int], Callable[[], Any]]:
+    """Households without income are idle, so the event scheduler skips them."""
+
+    def setup(agents: int, steps: int) -> Callable[[], Any]:
+        households, firms = _split(agents)
+        model = DoughnutABM(
+            N_households=households,
+            N_firms=firms,
+            years=steps,
+            event_driven=event_driven,
+        )
+        return model.run
+
+    return setup
+
+
+def _market(batched: bool) -> Callable[[int, int], Callable[[], Any]]:
+    def setup(agents: int, steps: int) -> Callable[[], Any]:
+        stocks = BioPhysicalStocks(carbon_budget=1e12, water=1e12)
+        market = Market(stocks)
+        traders = [_Trader() for _ in range(agents)]
+
+        def run() -> None:
+            for _ in range(steps):
+                if batched:
+                    market.submit_orders((t, "water", 1.0) for t in traders)
+                    market.clear()
+                else:
+                    for trader in traders:
+                        market.buy(trader, "water", 1.0)
+
+        return run
+
+    return setup
+
+
+def _run_model(agents: int, steps: int) -> Callable[[], Any]:
+    import run_simulation
+
+    households, firms = _split(agents)
+    cfg = {
+        "steps": steps,
+        "agents": {"households": households, "firms": firms, "government": True},
+    }
+    return lambda: run_simulation.run_model(cfg, seed=0)
+
+
+#: Benchmark name -> ``setup(agents, steps)`` returning the callable to time.
+BENCHMARKS: Dict[str, Callable[[int, int], Callable[[], Any]]] = {
+    "baseline_model": _baseline_model(vectorized=False),
+    "baseline_model_vectorized": _baseline_model(vectorized=True),
+    "baseline_ensemble": _baseline_ensemble(batched=False),
+    "baseline_ensemble_batched": _baseline_ensemble(batched=True),
+    "doughnut_abm": _doughnut_abm(event_driven=False),
+    "doughnut_abm_event_driven": _doughnut_abm(event_driven=True),
+    "market_buy": _market(batched=False),
+    "market_clear": _market(batched=True),
+    "run_model": _run_model,
+}
+
+
+def measure(name: str, agents: int, steps: int) -> Dict[str, Any]:
+    """Time one benchmark and trace its peak memory in a separate run."""
+    setup = BENCHMARKS[name]
+
+    run = setup(agents, steps)
+    start = time.perf_counter()
+    run()
+    seconds = time.perf_counter() - start
+
+    tracemalloc.start()
+    try:
+        setup(agents, steps)()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    seconds = max(seconds, 1e-9)
+    return {
+        "benchmark": name,
+        "agents": agents,
+        "steps": steps,
+        "seconds": seconds,
+        "steps_per_sec": steps / seconds,
+        "agent_steps_per_sec": agents * steps / seconds,
+        "peak_bytes": peak,
+    }
+
+
+def agent_counts(max_agents: int) -> List[int]:
+    """Return the powers of ten from ``10**2`` up to ``max_agents``."""
+    counts = []
+    n = 100
+    while n <= max_agents:
+        counts.append(n)
+        n *= 10
+    return counts
+
+
+def run_suite(
+    names: List[str] | None = None, max_agents: int = 10**6, steps: int = 10
+) -> Dict[str, Any]:
+    """Run the selected benchmarks and return the JSON-serialisable report."""
+    results = [
+        measure(name, agents, steps)
+        for name in names or list(BENCHMARKS)
+        for agents in agent_counts(max_agents)
+    ]
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def compare(
+    report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float = 0.2
+) -> List[str]:
+    """Return a description of every result slower than ``baseline``.
+
+    A result regresses when its ``agent_steps_per_sec`` falls more than
+    ``tolerance`` (a fraction) below the baseline entry with the same
+    benchmark name and agent count.
+    """
+    reference = {
+        (r["benchmark"], r["agents"]): r["agent_steps_per_sec"]
+        for r in baseline.get("results", [])
+    }
+    regressions = []
+    for result in report["results"]:
+        key = (result["benchmark"], result["agents"])
+        if key not in reference:
+            continue
+        floor = reference[key] * (1.0 - tolerance)
+        if result["agent_steps_per_sec"] < floor:
+            regressions.append(
+                f"{key[0]} @ {key[1]} agents: "
+                f"{result['agent_steps_per_sec']:.3g} < {floor:.3g} agent-steps/s"
+            )
+    return regressions
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--baseline", help="JSON report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    parser.add_argument("--max-agents", type=int, default=10**6)
+    parser.add_argument("--steps", type=int, default=10)
+    parser.add_argument(
+        "--benchmark",
+        action="append",
+        choices=sorted(BENCHMARKS),
+        help="benchmark to run (repeatable, default: all)",
+    )
+    args = parser.parse_args(argv)
+
+    report = run_suite(args.benchmark, args.max_agents, args.steps)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        regressions = compare(report, baseline, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - manual execution
+    sys.exit(main())
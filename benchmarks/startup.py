@@ -0,0 +1,100 @@
+"""Measure the import time of the ``src`` package and its modules.
+
+Each module is imported in a fresh interpreter with ``-X importtime`` and the
+cumulative import time of the module is reported, together with the heavy
+third-party packages the import pulled in.  ``--max-ms`` fails the run when
+``import src`` takes longer than the budget or loads a heavy package.
+
+Example::
+
+    python benchmarks/startup.py --max-ms 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+ROOT = Path(__file__).resolve().parents[1]
+
+#: Modules timed by default; the first one is checked against ``--max-ms``.
+MODULES = ["src", "src.data", "src.metrics", "src.markets.market"]
+
+#: Packages that ``import src`` must not load.
+HEAVY = ("numpy", "pandas", "mesa")
+
+_SCRIPT = (
+    "import json, sys\n"
+    "import {module}\n"
+    "print(json.dumps([m for m in {heavy!r} if m in sys.modules]))\n"
+)
+
+
+def import_time(module: str) -> Dict[str, Any]:
+    """Import ``module`` in a new interpreter and return its timing."""
+    script = _SCRIPT.format(module=module, heavy=HEAVY)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", script],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    cumulative_us = 0
+    for line in proc.stderr.splitlines():
+        fields = [part.strip() for part in line.split("|")]
+        if len(fields) == 3 and fields[2] == module:
+            cumulative_us = int(fields[1])
+    return {
+        "module": module,
+        "cumulative_ms": cumulative_us / 1000,
+        "heavy_imports": json.loads(proc.stdout),
+    }
+
+
+def measure(modules: List[str], repeats: int = 5) -> List[Dict[str, Any]]:
+    """Return the median import time of each module over ``repeats`` runs."""
+    results = []
+    for module in modules:
+        runs = [import_time(module) for _ in range(repeats)]
+        results.append(
+            {
+                "module": module,
+                "median_ms": statistics.median(r["cumulative_ms"] for r in runs),
+                "heavy_imports": runs[0]["heavy_imports"],
+            }
+        )
+    return results
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", action="append", help="module to time (repeatable)")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--max-ms", type=float, help="import time budget for `src`")
+    args = parser.parse_args(argv)
+
+    results = measure(args.module or MODULES, args.repeats)
+    print(json.dumps(results, indent=2))
+
+    if args.max_ms is not None:
+        src = next((r for r in results if r["module"] == "src"), None)
+        if src is None:
+            src = measure(["src"], args.repeats)[0]
+        if src["heavy_imports"] or src["median_ms"] > args.max_ms:
+            print(
+                f"REGRESSION import src: {src['median_ms']:.1f} ms, "
+                f"heavy imports {src['heavy_imports']}",
+                file=sys.stderr,
+            )
+            return 1
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - manual execution
+    sys.exit(main())
@@ -1,16 +1,42 @@
 from __future__ import annotations
 
+from array import array
 from pathlib import Path
 import csv
+import warnings
+from itertools import islice
+from operator import itemgetter
 from typing import Iterable, List, Dict
 
+#: Rows used to infer the type of each column in ``read_csv``.
+SAMPLE_ROWS = 1000
+
+#: Rows split into columns at a time by ``read_csv``.
+CHUNK_ROWS = 8192
+
+
+def _column(values: Iterable) -> List | array:
+    if isinstance(values, array):
+        return array(values.typecode, values)
+    return list(values)
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
 class DataFrame:
+    """Column store: numeric columns read from files are ``array('d')``."""
+
     def __init__(self, data: Dict[str, Iterable]):
-        self._data = {k: list(v) for k, v in data.items()}
+        self._data = {k: _column(v) for k, v in data.items()}
         self.columns = list(data.keys())
 
     def equals(self, other: 'DataFrame') -> bool:
-        return self._data == getattr(other, '_data', None)
+        theirs = getattr(other, '_data', None)
+        if theirs is None or list(theirs) != list(self._data):
+            return False
+        return all(list(v) == list(theirs[k]) for k, v in self._data.items())
 
     @property
     def shape(self) -> tuple[int, int]:
@@ -21,11 +47,23 @@ class DataFrame:
         return DataFrame({k: v[:] for k, v in self._data.items()})
 
     def select_dtypes(self, _type: str) -> 'DataFrame':
-        return DataFrame({k: v[:] for k, v in self._data.items()})
+        if _type != "number":
+            return DataFrame({k: v[:] for k, v in self._data.items()})
+        return DataFrame(
+            {
+                k: v[:]
+                for k, v in self._data.items()
+                if isinstance(v, array) or all(_is_number(x) for x in v)
+            }
+        )
 
     def div(self, value: float) -> 'DataFrame':
         for k in self.columns:
-            self._data[k] = [x / value for x in self._data[k]]
+            col = self._data[k]
+            if isinstance(col, array):
+                self._data[k] = array('d', [x / value for x in col])
+            else:
+                self._data[k] = [x / value for x in col]
         return self
 
     def __getitem__(self, key):
@@ -38,6 +76,8 @@ class DataFrame:
             for k in key:
                 self._data[k] = value._data[k]
         else:
+            if key not in self._data:
+                self.columns.append(key)
             self._data[key] = value
 
     @property
@@ -52,18 +92,124 @@ class DataFrame:
 
         return _ILoc()
 
-def read_csv(path: str | Path) -> DataFrame:
-    with open(Path(path)) as f:
-        reader = csv.DictReader(f)
-        data: Dict[str, List] = {field: [] for field in reader.fieldnames or []}
-        for row in reader:
-            for field in data:
-                val = row[field]
-                try:
-                    data[field].append(float(val))
-                except ValueError:
-                    data[field].append(val)
-    return DataFrame(data)
+
+def _mixed(values: Iterable[str]) -> List:
+    """Parse each cell as a float where possible, keeping other cells as text."""
+    out = []
+    for val in values:
+        try:
+            out.append(float(val))
+        except ValueError:
+            out.append(val)
+    return out
+
+
+def _infer_kind(sample: List[str]) -> str:
+    """Return ``"d"`` (numbers), ``"s"`` (text) or ``"m"`` (mixed) for a sample."""
+    try:
+        array('d', map(float, sample))
+        return "d"
+    except ValueError:
+        return "m" if any(_is_number(x) for x in _mixed(sample)) else "s"
+
+
+def _append(column: List | array, kind: str, values: List[str]) -> tuple:
+    """Add parsed ``values`` to ``column``; returns the column and its kind.
+
+    A numeric column that meets a non-number becomes a mixed column.
+    """
+    if kind == "d":
+        try:
+            column.extend(array('d', map(float, values)))
+            return column, kind
+        except ValueError:
+            column, kind = column.tolist(), "m"
+    column.extend(values if kind == "s" else _mixed(values))
+    return column, kind
+
+
+def _read_rows(path: Path, kinds: List[str]) -> List:
+    """Parse the columns of ``path`` with the :mod:`csv` module.
+
+    Rows are split into columns a chunk at a time, so only a few raw rows
+    are alive at once.
+    """
+    width = len(kinds)
+    getters = [itemgetter(i) for i in range(width)]
+    columns: List = [array('d') if k == "d" else [] for k in kinds]
+    with open(path, newline="") as f:
+        reader = csv.reader(f)
+        next(reader, None)
+        while True:
+            chunk = list(islice(reader, CHUNK_ROWS))
+            if not chunk:
+                break
+            rows = [row for row in chunk if row]
+            if any(len(row) != width for row in rows):
+                rows = [(row + [""] * width)[:width] for row in rows]
+            for i, get in enumerate(getters):
+                values = list(map(get, rows))
+                columns[i], kinds[i] = _append(columns[i], kinds[i], values)
+    return columns
+
+
+def _read_numpy(path: Path, kinds: List[str]) -> List | None:
+    """Parse the columns of ``path`` with NumPy's C reader, if available.
+
+    Returns ``None`` when NumPy is missing or too old for ``quotechar``
+    (before 1.23), or a cell does not fit the type inferred for its column
+    (or a row is short), leaving those files to :func:`_read_rows`.
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        return None
+    numeric = [i for i, k in enumerate(kinds) if k == "d"]
+    other = [i for i, k in enumerate(kinds) if k != "d"]
+    options = dict(delimiter=",", skiprows=1, quotechar='"', comments=None, ndmin=2)
+    try:
+        with warnings.catch_warnings():
+            # NumPy notes that blank lines are skipped, as csv.reader does.
+            warnings.simplefilter("ignore", UserWarning)
+            numbers = np.loadtxt(path, usecols=numeric, **options) if numeric else None
+            text = (
+                np.loadtxt(path, usecols=other, dtype=str, **options) if other else None
+            )
+    except (TypeError, ValueError):
+        return None
+    columns: List = [None] * len(kinds)
+    for j, i in enumerate(numeric):
+        columns[i] = array('d', numbers[:, j].tobytes())
+    for j, i in enumerate(other):
+        values = text[:, j].tolist()
+        columns[i] = values if kinds[i] == "s" else _mixed(values)
+    return columns
+
+
+def read_csv(path: str | Path, sample_rows: int = SAMPLE_ROWS) -> DataFrame:
+    """Read a CSV file into typed columns.
+
+    Each column's type is inferred once from its first ``sample_rows`` cells:
+    numeric columns are parsed in bulk into ``array('d')``, text columns keep
+    their strings and columns mixing both hold a float where a cell parses
+    and the text otherwise.  A numeric column with a later non-number becomes
+    mixed.  Files are parsed by NumPy's C reader when possible and chunk by
+    chunk with the :mod:`csv` module otherwise.
+    """
+    path = Path(path)
+    with open(path, newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, None) or []
+        sample = [row for row in islice(reader, sample_rows) if row]
+    kinds = [
+        _infer_kind([row[i] if i < len(row) else "" for row in sample])
+        for i in range(len(header))
+    ]
+    columns = _read_numpy(path, kinds) if sample and header else None
+    if columns is None:
+        columns = _read_rows(path, kinds)
+    return DataFrame(dict(zip(header, columns)))
+
 
 def read_excel(path: str | Path) -> DataFrame:
     return read_csv(path)
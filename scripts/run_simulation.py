@@ -5,6 +5,9 @@ from __future__ import annotations
 import argparse
 import csv
 import random
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import groupby
 from pathlib import Path
 from typing import Any, Dict, List
 
@@ -15,10 +18,15 @@ from src import (
     BioPhysicalStocks,
     FinancialIntermediary,
     Firm,
+    FirmPopulation,
     Government,
     Household,
+    HouseholdPopulation,
     Market,
 )
+from src.cache import ResultCache, code_version
+from src.data import EnsembleWriter
+from src.instrumentation import Profiler, phases
 
 
 def set_seeds(seed: int) -> None:
@@ -33,8 +41,87 @@ def load_config(path: str | Path) -> Dict[str, Any]:
         return yaml.safe_load(fh)
 
 
-def run_model(cfg: Dict[str, Any], seed: int) -> List[Dict[str, Any]]:
-    """Execute one simulation and return recorded time series."""
+class _World:
+    """Model context handed to the agents of :func:`run_model`.
+
+    Agents draw their resource use from ``stocks`` and the government taxes
+    the ``agents`` and ``populations`` it finds here.
+    """
+
+    def __init__(self, stocks: BioPhysicalStocks, market: Market) -> None:
+        self.stocks = stocks
+        self.market = market
+        self.agents: List[Any] = []
+        self.populations: List[Any] = []
+
+
+def _tick(
+    populations: List[Any],
+    agents: List[Any],
+    stocks: BioPhysicalStocks,
+    market: Market,
+    profiler: Profiler | None = None,
+) -> None:
+    """Advance one tick, timing each phase and agent class with ``profiler``."""
+    phase = phases(profiler)
+    with phase("step"):
+        with phase("populations"):
+            for pop in populations:
+                with phase(type(pop).__name__):
+                    pop.step()
+        with phase("agents"):
+            for cls, group in groupby(agents, key=type):
+                with phase(cls.__name__):
+                    for ag in group:
+                        ag.step()
+        with phase("stocks"):
+            stocks.step()
+        with phase("market"):
+            market.adjust_prices()
+
+
+def open_cache(
+    directory: str | Path, max_bytes: int | None = None, bypass: bool = False
+) -> ResultCache:
+    """Return a result cache versioned by ``src`` and this script."""
+    return ResultCache(
+        directory,
+        max_bytes=max_bytes,
+        code_version=code_version(Path(__file__).resolve()),
+        bypass=bypass,
+    )
+
+
+def run_model(
+    cfg: Dict[str, Any],
+    seed: int,
+    profiler: Profiler | None = None,
+    cache: ResultCache | None = None,
+) -> List[Dict[str, Any]]:
+    """Execute one simulation and return recorded time series.
+
+    Agents are built without a model and leave the stocks untouched unless
+    ``cfg["draw_down"]`` is true, in which case they draw their resource use
+    from the run's stocks at the rates in ``cfg["rates"]`` (per-agent rates
+    for ``households`` and ``firms``, e.g.
+    ``{"households": {"water_rate": 0.4}}``).  Pass a
+    :class:`~src.instrumentation.Profiler` to time each phase.  With a
+    ``cache`` (see :func:`open_cache`) identical runs are returned from disk;
+    profiled runs are always simulated.
+    """
+    if cache is not None and profiler is None:
+        records = cache.get(cfg, seed)
+        if records is not None:
+            return records
+    records = _simulate(cfg, seed, profiler)
+    if cache is not None:
+        cache.put(cfg, seed, records)
+    return records
+
+
+def _simulate(
+    cfg: Dict[str, Any], seed: int, profiler: Profiler | None
+) -> List[Dict[str, Any]]:
     set_seeds(seed)
 
     agents_cfg = cfg.get("agents", {})
@@ -43,23 +130,38 @@ def run_model(cfg: Dict[str, Any], seed: int) -> List[Dict[str, Any]]:
     stocks = BioPhysicalStocks(**cfg.get("initial_stocks", {}))
     market = Market(stocks, price_sensitivity=cfg.get("price_sensitivity", 0.5))
 
-    agents = []
-    for i in range(int(agents_cfg.get("households", 0))):
-        agents.append(Household(i, model=None))  # type: ignore[arg-type]
-    offset = len(agents)
-    for j in range(int(agents_cfg.get("firms", 0))):
-        agents.append(Firm(offset + j, model=None))  # type: ignore[arg-type]
+    n_households = int(agents_cfg.get("households", 0))
+    n_firms = int(agents_cfg.get("firms", 0))
+    rates_cfg = cfg.get("rates", {})
+    household_rates = rates_cfg.get("households", {})
+    firm_rates = rates_cfg.get("firms", {})
+
+    world = _World(stocks, market)
+    populations = world.populations
+    agents = world.agents
+    # Without ``draw_down`` agents get no model, as before, and never touch
+    # the stocks.
+    context: Any = world if cfg.get("draw_down") else None
+    if cfg.get("vectorized"):
+        populations.append(
+            HouseholdPopulation(n_households, context, **household_rates)
+        )
+        populations.append(
+            FirmPopulation(n_firms, context, id_offset=n_households, **firm_rates)
+        )
+    else:
+        for i in range(n_households):
+            agents.append(Household(i, context, **household_rates))
+        for j in range(n_firms):
+            agents.append(Firm(n_households + j, context, **firm_rates))
     if agents_cfg.get("government"):
-        agents.append(Government("gov", model=None))  # type: ignore[arg-type]
+        agents.append(Government("gov", context))
     if agents_cfg.get("bank"):
-        agents.append(FinancialIntermediary("bank", model=None))  # type: ignore[arg-type]
+        agents.append(FinancialIntermediary("bank", context))
 
     records: List[Dict[str, Any]] = []
     for step in range(steps):
-        for ag in agents:
-            ag.step()
-        stocks.step()
-        market.adjust_prices()
+        _tick(populations, agents, stocks, market, profiler)
         records.append(
             {
                 "step": step,
@@ -81,21 +183,124 @@ def save_records(records: List[Dict[str, Any]], path: str | Path) -> None:
         writer.writerows(records)
 
 
+def run_ensemble(
+    cfg: Dict[str, Any],
+    workers: int = 1,
+    profiler: Profiler | None = None,
+    cache: ResultCache | None = None,
+) -> None:
+    """Run every ensemble member in ``cfg`` and write each run to disk.
+
+    With ``workers > 1`` members are dispatched to a process pool and each
+    run is saved as soon as it finishes.  Every member is seeded from its
+    index alone, so the output is identical to a serial run.
+
+    ``output_format: csv`` (the default) writes one ``run_{idx}.csv`` per
+    member; ``output_format: npy`` writes all members to ``ensemble.npy``
+    (see :func:`src.data.load_ensemble`).
+
+    A ``profiler`` accumulates timings over all members and requires a
+    serial run.  Members found in ``cache`` are not simulated again.
+    """
+    if profiler is not None and workers > 1:
+        raise ValueError("profiling requires workers=1")
+    base_seed = int(cfg.get("seed", 0))
+    ensembles = int(cfg.get("ensembles", 1))
+    output_dir = Path(cfg.get("output_dir", "outputs"))
+    output_format = cfg.get("output_format", "csv")
+
+    if output_format == "npy":
+        writer = EnsembleWriter(
+            output_dir / "ensemble.npy", ensembles, int(cfg.get("steps", 1))
+        )
+        save = writer.write
+    elif output_format == "csv":
+        writer = None
+
+        def save(idx: int, records: List[Dict[str, Any]]) -> None:
+            save_records(records, output_dir / f"run_{idx}.csv")
+
+    else:
+        raise ValueError(f"unknown output_format: {output_format!r}")
+
+    try:
+        if workers <= 1:
+            for idx in range(ensembles):
+                seed = base_seed + idx
+                save(idx, run_model(cfg, seed, profiler=profiler, cache=cache))
+        else:
+            pending = []
+            for idx in range(ensembles):
+                records = cache.get(cfg, base_seed + idx) if cache else None
+                if records is None:
+                    pending.append(idx)
+                else:
+                    save(idx, records)
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = {
+                    pool.submit(run_model, cfg, base_seed + idx): idx
+                    for idx in pending
+                }
+                for future in as_completed(futures):
+                    idx = futures[future]
+                    records = future.result()
+                    if cache is not None:
+                        cache.put(cfg, base_seed + idx, records)
+                    save(idx, records)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
 def main(argv: List[str] | None = None) -> None:
     parser = argparse.ArgumentParser()
     parser.add_argument("config", help="YAML configuration file")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="number of worker processes (default: 'workers' in config or 1)",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="PATH",
+        help="write per-phase timings to PATH (JSON, or folded stacks if PATH "
+        "ends in .folded)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help="reuse run results cached in this directory (default: "
+        "'cache_dir' in config, no cache if unset)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="recompute every run, refreshing the cache",
+    )
     args = parser.parse_args(argv)
 
     cfg = load_config(args.config)
-    base_seed = int(cfg.get("seed", 0))
-    ensembles = int(cfg.get("ensembles", 1))
-    output_dir = Path(cfg.get("output_dir", "outputs"))
-
-    for idx in range(ensembles):
-        run_seed = base_seed + idx
-        records = run_model(cfg, seed=run_seed)
-        out_file = output_dir / f"run_{idx}.csv"
-        save_records(records, out_file)
+    workers = args.workers if args.workers is not None else cfg.get("workers", 1)
+    if args.profile and int(workers) > 1:
+        parser.error("--profile requires a serial run (--workers 1)")
+    profiler = Profiler() if args.profile else None
+    cache = None
+    cache_dir = args.cache_dir or cfg.get("cache_dir")
+    if cache_dir:
+        cache = open_cache(cache_dir, cfg.get("cache_max_bytes"), args.no_cache)
+    run_ensemble(cfg, workers=int(workers), profiler=profiler, cache=cache)
+    if cache is not None:
+        stats = cache.stats
+        print(
+            f"cache: {stats.hits} hits, {stats.misses} misses, "
+            f"{stats.bypassed} bypassed, {stats.evictions} evictions",
+            file=sys.stderr,
+        )
+    if profiler is not None:
+        if args.profile.endswith(".folded"):
+            profiler.to_folded(args.profile)
+        else:
+            profiler.to_json(args.profile)
 
 
 if __name__ == "__main__":  # pragma: no cover - manual execution
@@ -1,20 +1,62 @@
-"""Vector Money Simulation package."""
+"""Vector Money Simulation package.
 
-from .agents import FinancialIntermediary, Firm, Government, Household
-from .biophysics import BioPhysicalStocks
-from .doughnut_abm import DoughnutABM
-from .environment import BiophysicalStock
-from .markets import Market
-from .models import BaselineModel
+Public classes are imported lazily on first access (see :mod:`src._lazy`).
+"""
+
+from typing import TYPE_CHECKING
+
+from ._lazy import attach
+
+if TYPE_CHECKING:  # pragma: no cover - imports for type checkers only
+    from .agents import (
+        FinancialIntermediary,
+        Firm,
+        FirmPopulation,
+        Government,
+        Household,
+        HouseholdPopulation,
+    )
+    from .biophysics import BioPhysicalStocks
+    from .doughnut_abm import DoughnutABM
+    from .environment import BiophysicalStock
+    from .instrumentation import Profiler
+    from .markets import Market
+    from .models import BaselineModel
+    from .production import ProductionNetwork
+    from .scheduler import EventScheduler
+
+_EXPORTS = {
+    "Household": ".agents",
+    "Firm": ".agents",
+    "Government": ".agents",
+    "FinancialIntermediary": ".agents",
+    "HouseholdPopulation": ".agents",
+    "FirmPopulation": ".agents",
+    "BioPhysicalStocks": ".biophysics",
+    "Market": ".markets",
+    "BiophysicalStock": ".environment",
+    "DoughnutABM": ".doughnut_abm",
+    "BaselineModel": ".models",
+    "Profiler": ".instrumentation",
+    "ProductionNetwork": ".production",
+    "EventScheduler": ".scheduler",
+}
 
 __all__ = [
     "Household",
     "Firm",
     "Government",
     "FinancialIntermediary",
+    "HouseholdPopulation",
+    "FirmPopulation",
     "BioPhysicalStocks",
     "Market",
     "BiophysicalStock",
     "DoughnutABM",
     "BaselineModel",
+    "Profiler",
+    "ProductionNetwork",
+    "EventScheduler",
 ]
+
+__getattr__, __dir__ = attach(globals(), _EXPORTS)
@@ -0,0 +1,41 @@
+"""Lazy package attributes (PEP 562).
+
+Package ``__init__`` modules declare which submodule provides each public
+name and call :func:`attach`; the submodule is imported the first time the
+name is accessed, so ``import src`` does not pull in NumPy, pandas or mesa.
+
+Each package ``__init__`` also lists its names under ``if TYPE_CHECKING:`` so
+that type checkers see the real imports.
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import Any, Callable, Dict, List, Tuple
+
+
+def attach(
+    namespace: Dict[str, Any], exports: Dict[str, str]
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """Return ``(__getattr__, __dir__)`` for a package namespace.
+
+    ``exports`` maps each public name to the relative module defining it.
+    Names cached by an earlier import are dropped so that reloading the
+    package also picks up reloaded submodules.
+    """
+    package = namespace["__name__"]
+    for name in exports:
+        namespace.pop(name, None)
+
+    def __getattr__(name: str) -> Any:
+        module = exports.get(name)
+        if module is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module, package), name)
+        namespace[name] = value
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(namespace) | set(exports))
+
+    return __getattr__, __dir__
@@ -1,13 +1,41 @@
 """Agent classes used in the vector money simulation."""
 
-from .financial_intermediary import FinancialIntermediary
-from .firm import Firm
-from .government import Government
-from .household import Household
+from typing import TYPE_CHECKING
+
+from .._lazy import attach
+
+if TYPE_CHECKING:  # pragma: no cover - imports for type checkers only
+    from .aggregates import NeedsLedger, TaxBase
+    from .financial_intermediary import FinancialIntermediary
+    from .firm import Firm
+    from .government import Government
+    from .household import Household
+    from .population import FirmPopulation, FirmView, HouseholdPopulation, HouseholdView
+
+_EXPORTS = {
+    "Household": ".household",
+    "Firm": ".firm",
+    "Government": ".government",
+    "FinancialIntermediary": ".financial_intermediary",
+    "HouseholdPopulation": ".population",
+    "FirmPopulation": ".population",
+    "HouseholdView": ".population",
+    "FirmView": ".population",
+    "TaxBase": ".aggregates",
+    "NeedsLedger": ".aggregates",
+}
 
 __all__ = [
     "Household",
     "Firm",
     "Government",
     "FinancialIntermediary",
+    "HouseholdPopulation",
+    "FirmPopulation",
+    "HouseholdView",
+    "FirmView",
+    "TaxBase",
+    "NeedsLedger",
 ]
+
+__getattr__, __dir__ = attach(globals(), _EXPORTS)
@@ -0,0 +1,169 @@
+"""Model-level running aggregates maintained by agents.
+
+Agents push changes to these aggregates as their attributes are assigned so
+that consumers such as :class:`~src.agents.government.Government` can read a
+precomputed total instead of scanning every agent each tick.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Any, List, Sequence
+
+import numpy as np
+
+
+def _add_exact(partials: List[float], x: float) -> None:
+    """Add ``x`` to the non-overlapping ``partials`` without rounding error.
+
+    This is the incremental form of Shewchuk's algorithm used by
+    :func:`math.fsum`, so a long history of updates never accumulates drift.
+    """
+    i = 0
+    for y in partials:
+        if abs(x) < abs(y):
+            x, y = y, x
+        hi = x + y
+        lo = y - (hi - x)
+        if lo:
+            partials[i] = lo
+            i += 1
+        x = hi
+    partials[i:] = [x]
+
+
+def _exact_partials(values: Sequence[float]) -> List[float]:
+    """Return non-overlapping partials summing exactly to ``values``.
+
+    Each :func:`math.fsum` rounds what is left of the sum once, so a couple
+    of passes usually suffice however many values there are.
+    """
+    values = list(values)
+    partials: List[float] = []
+    total = math.fsum(values)
+    while total:
+        partials.insert(0, total)
+        values.append(-total)
+        total = math.fsum(values)
+    return partials
+
+
+class TaxBase:
+    """Running totals of taxable household income and firm output.
+
+    Households and firms report every assignment to ``income`` and ``output``
+    through :meth:`update_income` and :meth:`update_output`.  Totals are kept
+    exactly, so they equal a fresh sum over the agents no matter how many
+    updates have been applied.  With ``debug`` enabled the government
+    cross-checks the aggregate against a full scan each tick.
+    """
+
+    def __init__(self, debug: bool = False) -> None:
+        self.debug = debug
+        self._income: List[float] = []
+        self._output: List[float] = []
+
+    def update_income(self, old: float, new: float) -> None:
+        """Replace an ``old`` income contribution with ``new``."""
+        _add_exact(self._income, new)
+        _add_exact(self._income, -old)
+
+    def update_output(self, old: float, new: float) -> None:
+        """Replace an ``old`` output contribution with ``new``."""
+        _add_exact(self._output, new)
+        _add_exact(self._output, -old)
+
+    @property
+    def income(self) -> float:
+        return math.fsum(self._income)
+
+    @property
+    def output(self) -> float:
+        return math.fsum(self._output)
+
+    @property
+    def total(self) -> float:
+        """Return total taxable income plus output."""
+        return math.fsum(self._income + self._output)
+
+
+class NeedsLedger:
+    """Household needs vectors with running satisfaction aggregates.
+
+    Needs are stored as rows of an ``(N, k)`` array.  Households register on
+    creation (or in bulk through :meth:`register_households`) and report
+    every assignment to ``needs_vector``, which keeps the per-dimension sums
+    and the number of households below ``social_floor`` in each dimension
+    current, so reading them is O(1).
+    """
+
+    def __init__(self, social_floor: Sequence[float], capacity: int = 0) -> None:
+        self.social_floor = np.asarray(social_floor, dtype=float)
+        k = self.social_floor.shape[0]
+        self.needs = np.zeros((capacity, k))
+        self.shortfall = np.zeros(k, dtype=np.int64)
+        self._sums: List[List[float]] = [[] for _ in range(k)]
+        self._rows = 0
+
+    def __len__(self) -> int:
+        return self._rows
+
+    def _add(self, values: np.ndarray, sign: float) -> None:
+        for partials, value in zip(self._sums, values.tolist()):
+            _add_exact(partials, sign * value)
+        below = values < self.social_floor
+        if sign > 0:
+            self.shortfall += below
+        else:
+            self.shortfall -= below
+
+    def _reserve(self, rows: int) -> None:
+        if rows > self.needs.shape[0]:
+            grown = np.zeros((max(rows, 2 * self._rows), self.needs.shape[1]))
+            grown[: self._rows] = self.needs[: self._rows]
+            self.needs = grown
+
+    def register(self, values: Sequence[float]) -> int:
+        """Store a new household's needs and return its row."""
+        row = self._rows
+        self._reserve(row + 1)
+        self.needs[row] = values
+        self._add(self.needs[row], 1.0)
+        self._rows = row + 1
+        return row
+
+    def register_households(self, households: Sequence[Any]) -> None:
+        """Register ``households`` not yet in a ledger with one bulk update.
+
+        Sets each household's ledger row, so later ``needs_vector``
+        assignments update the aggregates.
+        """
+        start = self._rows
+        stop = start + len(households)
+        self._reserve(stop)
+        block = self.needs[start:stop]
+        block[:] = [household.needs_vector for household in households]
+        for d, partials in enumerate(self._sums):
+            for value in _exact_partials(block[:, d].tolist()):
+                _add_exact(partials, value)
+        self.shortfall += (block < self.social_floor).sum(axis=0)
+        for row, household in enumerate(households, start):
+            household._needs_row = row
+        self._rows = stop
+
+    def update(self, row: int, values: Sequence[float]) -> None:
+        """Replace the needs stored in ``row`` with ``values``."""
+        self._add(self.needs[row], -1.0)
+        self.needs[row] = values
+        self._add(self.needs[row], 1.0)
+
+    def sums(self) -> np.ndarray:
+        """Return the total need satisfaction in each dimension."""
+        return np.array([math.fsum(partials) for partials in self._sums])
+
+    def mean(self) -> float:
+        """Return the average need satisfaction over households and dimensions."""
+        if self._rows == 0:
+            return 0.0
+        total = math.fsum(math.fsum(partials) for partials in self._sums)
+        return total / (self._rows * len(self._sums))
@@ -4,6 +4,19 @@ from mesa import Agent
 class FinancialIntermediary(Agent):
     """Agent modeling a simple financial intermediary."""
 
+    #: Numeric attributes saved in checkpoints (see :mod:`src.checkpoint`).
+    checkpoint_fields = (
+        "deposits",
+        "loans",
+        "interest_rate",
+        "carbon_rate",
+        "water_rate",
+        "biomass_rate",
+        "mineral_rate",
+    )
+    #: Attributes saved as JSON in checkpoints.
+    checkpoint_objects = ()
+
     def __init__(
         self,
         unique_id,
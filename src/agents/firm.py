@@ -4,6 +4,19 @@ from mesa import Agent
 class Firm(Agent):
     """Firm agent representing a production unit."""
 
+    #: Numeric attributes saved in checkpoints (see :mod:`src.checkpoint`).
+    checkpoint_fields = (
+        "capital",
+        "productivity",
+        "output",
+        "carbon_rate",
+        "water_rate",
+        "biomass_rate",
+        "mineral_rate",
+    )
+    #: Attributes saved as JSON in checkpoints.
+    checkpoint_objects = ()
+
     def __init__(
         self,
         unique_id,
@@ -24,6 +37,20 @@ class Firm(Agent):
         self.biomass_rate = biomass_rate
         self.mineral_rate = mineral_rate
 
+    @property
+    def output(self) -> float:
+        return self._output
+
+    @output.setter
+    def output(self, value: float) -> None:
+        old = getattr(self, "_output", 0.0)
+        self._output = value
+        if value == old:
+            return
+        tax_base = getattr(self.model, "tax_base", None)
+        if tax_base is not None:
+            tax_base.update_output(old, value)
+
     def step(self):
         """Produce output based on current capital and productivity."""
         self.output = self.capital * self.productivity
@@ -34,3 +61,19 @@ class Firm(Agent):
             stocks.water.apply(-self.water_rate)
             stocks.biomass.apply(-self.biomass_rate)
             stocks.minerals.apply(-self.mineral_rate)
+
+    def scale_output(self, factor: float) -> None:
+        """Scale this tick's output by ``factor``, extracting resources in step.
+
+        Used by the sector-linked production stage (see
+        :mod:`src.production`) to add the firm's share of intermediate demand.
+        """
+        self.output = self.output * factor
+
+        stocks = getattr(self.model, "stocks", None)
+        if stocks:
+            extra = factor - 1.0
+            stocks.carbon_budget.apply(-extra * self.carbon_rate)
+            stocks.water.apply(-extra * self.water_rate)
+            stocks.biomass.apply(-extra * self.biomass_rate)
+            stocks.minerals.apply(-extra * self.mineral_rate)
@@ -1,9 +1,37 @@
+import sys
+from typing import Tuple
+
 from mesa import Agent
 
 
+def scan_tolerance(terms: int, magnitude: float) -> float:
+    """Return how far aggregate revenue may differ from the per-agent scan.
+
+    The scan rounds each of its ``terms`` products ``(income + output) *
+    tax_rate`` and adds them in agent order, so it is within ``terms + 1``
+    unit roundoffs of ``magnitude`` (the sum of the absolute products) of
+    the exact revenue.  ``TaxBase.total * tax_rate`` rounds the exact sum
+    once and then multiplies, so it is within two.  ``epsilon`` is two unit
+    roundoffs, which leaves room for second-order terms.
+    """
+    return (terms + 2) * sys.float_info.epsilon * magnitude
+
+
 class Government(Agent):
     """Government agent collecting taxes and providing spending."""
 
+    #: Numeric attributes saved in checkpoints (see :mod:`src.checkpoint`).
+    checkpoint_fields = (
+        "tax_rate",
+        "revenue",
+        "carbon_capture",
+        "water_supply",
+        "biomass_program",
+        "mineral_program",
+    )
+    #: Attributes saved as JSON in checkpoints.
+    checkpoint_objects = ()
+
     def __init__(
         self,
         unique_id,
@@ -22,14 +50,52 @@ class Government(Agent):
         self.biomass_program = biomass_program
         self.mineral_program = mineral_program
 
-    def step(self):
-        """Collect taxes from households and firms in the model."""
+    def _scan_taxes(self) -> Tuple[float, float]:
+        """Scan the model's agents for the tax due.
+
+        Returns the tax and the largest rounding error the scan can differ
+        from the aggregate by (see :func:`scan_tolerance`).
+        """
         total_tax = 0.0
+        magnitude = 0.0
+        terms = 0
         if hasattr(self.model, "schedule"):
-            for agent in self.model.schedule.agents:
-                income = getattr(agent, "income", 0.0)
-                profit = getattr(agent, "output", 0.0)
-                total_tax += (income + profit) * self.tax_rate
+            agents = self.model.schedule.agents
+        else:
+            agents = getattr(self.model, "agents", [])
+        for agent in agents:
+            income = getattr(agent, "income", 0.0)
+            profit = getattr(agent, "output", 0.0)
+            tax = (income + profit) * self.tax_rate
+            total_tax += tax
+            magnitude += abs(tax)
+            terms += 1
+        for population in getattr(self.model, "populations", []):
+            tax = population.taxable() * self.tax_rate
+            total_tax += tax
+            magnitude += abs(tax)
+            terms += 1
+        return total_tax, scan_tolerance(terms, magnitude)
+
+    def step(self):
+        """Collect taxes from households and firms in the model.
+
+        With a ``tax_base`` the revenue is its exact total times
+        ``tax_rate``; it can differ from a scan over the agents only by the
+        scan's own rounding error, which debug mode checks.
+        """
+        tax_base = getattr(self.model, "tax_base", None)
+        if tax_base is None:
+            total_tax, _ = self._scan_taxes()
+        else:
+            total_tax = tax_base.total * self.tax_rate
+            if tax_base.debug:
+                scanned, tolerance = self._scan_taxes()
+                if abs(total_tax - scanned) > tolerance:
+                    raise RuntimeError(
+                        f"tax base aggregate {total_tax!r} does not match "
+                        f"scan {scanned!r}"
+                    )
         self.revenue += total_tax
 
         stocks = getattr(self.model, "stocks", None)
@@ -4,6 +4,21 @@ from mesa import Agent
 class Household(Agent):
     """Household agent with income, wealth and technology choice."""
 
+    #: Numeric attributes saved in checkpoints (see :mod:`src.checkpoint`).
+    checkpoint_fields = (
+        "income",
+        "wealth",
+        "carbon_rate",
+        "water_rate",
+        "biomass_rate",
+        "mineral_rate",
+        "needs_vector",
+    )
+    #: Attributes saved as JSON in checkpoints.
+    checkpoint_objects = ("technology",)
+    #: Events that wake the household in an event-driven scheduler.
+    wake_events = ("technologies",)
+
     def __init__(
         self,
         unique_id,
@@ -25,12 +40,58 @@ class Household(Agent):
         self.water_rate = water_rate
         self.biomass_rate = biomass_rate
         self.mineral_rate = mineral_rate
-        self.needs_vector = list(needs_vector or [0.0, 0.0, 0.0, 0.0])
+        self.needs_vector = needs_vector or (0.0, 0.0, 0.0, 0.0)
+
+    @property
+    def income(self) -> float:
+        return self._income
+
+    @income.setter
+    def income(self, value: float) -> None:
+        old = getattr(self, "_income", 0.0)
+        self._income = value
+        if value == old:
+            return
+        tax_base = getattr(self.model, "tax_base", None)
+        if tax_base is not None:
+            tax_base.update_income(old, value)
+        wake = getattr(getattr(self.model, "schedule", None), "wake", None)
+        if wake is not None:
+            wake(self)
+
+    @property
+    def needs_vector(self) -> tuple:
+        """Needs satisfaction per dimension; assign a new vector to change it."""
+        return self._needs_vector
+
+    @needs_vector.setter
+    def needs_vector(self, value) -> None:
+        value = tuple(value)
+        ledger = getattr(self.model, "needs_ledger", None)
+        if ledger is not None:
+            row = getattr(self, "_needs_row", None)
+            if row is None:
+                self._needs_row = ledger.register(value)
+            else:
+                ledger.update(row, value)
+        self._needs_vector = value
+
+    def is_idle(self) -> bool:
+        """Return whether :meth:`step` currently does nothing.
+
+        That is the case without income, technologies on offer or stocks to
+        draw on; see :class:`~src.scheduler.EventScheduler`.
+        """
+        return (
+            self.income == 0
+            and not getattr(self.model, "technologies", None)
+            and not getattr(self.model, "stocks", None)
+        )
 
     def step(self):
         """Update the household's wealth and potentially its technology choice."""
         # Accumulate income into wealth
-        self.wealth += self.income
+        self.wealth += self._income
 
         # Example placeholder for technology choice update
         technologies = getattr(self.model, "technologies", None)
@@ -0,0 +1,370 @@
+"""Struct-of-arrays agent populations.
+
+Per-agent classes such as :class:`~src.agents.household.Household` are easy to
+reason about but every ``step`` call pays for Python attribute lookups and
+four separate stock updates.  The populations in this module keep the same
+state in NumPy columns so that a whole population advances with a handful of
+array operations per tick.
+
+Indexing a population returns a lightweight view (:class:`HouseholdView`,
+:class:`FirmView`) with the attribute API of the per-agent classes.  Views use
+``__slots__`` and hold only a reference to the population and a row index,
+so they cost a few dozen bytes instead of a full agent object.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, Sequence, Tuple
+
+import numpy as np
+
+from ..biophysics.stocks import STOCK_NAMES
+
+
+def _column(value, n: int) -> np.ndarray:
+    """Return ``value`` broadcast to a writable float column of length ``n``."""
+    return np.array(np.broadcast_to(np.asarray(value, dtype=float), (n,)))
+
+
+def _rate_matrix(n: int, *rates) -> np.ndarray:
+    """Return the ``(n, 4)`` rate array with one column per stock."""
+    return np.column_stack([_column(rate, n) for rate in rates])
+
+
+def _rate_column(index: int) -> property:
+    """Return a property exposing column ``index`` of ``rates`` as a view."""
+
+    def getter(self) -> np.ndarray:
+        return self.rates[:, index]
+
+    def setter(self, value) -> None:
+        self.rates[:, index] = value
+
+    return property(getter, setter, doc=f"Per-agent {STOCK_NAMES[index]} rate.")
+
+
+class _Population:
+    """Shared storage for populations that draw on the bio-physical stocks.
+
+    Resource rates are stored in a single ``(n, 4)`` array ordered like
+    :data:`STOCK_NAMES`, so the tick's draw-down on the model's stocks is one
+    column sum per resource.  Row ``i`` is the agent with ``unique_id``
+    ``id_offset + i``, so firms placed after ``n`` households use
+    ``id_offset=n`` as in :class:`~src.models.BaselineModel`.
+    """
+
+    model = None
+    id_offset = 0
+    rates: np.ndarray
+    #: Column reported to the model's :class:`~src.agents.aggregates.TaxBase`.
+    _taxable_column = ""
+    _reported_taxable = 0.0
+
+    carbon_rate = _rate_column(0)
+    water_rate = _rate_column(1)
+    biomass_rate = _rate_column(2)
+    mineral_rate = _rate_column(3)
+
+    #: View class returned when indexing the population.
+    _view: type
+    #: Array attributes saved in checkpoints (see :mod:`src.checkpoint`).
+    _checkpoint_columns: Tuple[str, ...] = ()
+
+    def __len__(self) -> int:
+        return self.rates.shape[0]
+
+    def __getitem__(self, index: int):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("population index out of range")
+        return self._view(self, index)
+
+    def __iter__(self):
+        view = self._view
+        return (view(self, i) for i in range(len(self)))
+
+    def resource_demand(self) -> np.ndarray:
+        """Return the population's total draw on each stock for one tick."""
+        return self.rates.sum(axis=0)
+
+    def taxable(self) -> float:
+        """Return the population's total taxable income or output."""
+        return float(getattr(self, self._taxable_column).sum())
+
+    def _sync_tax_base(self) -> None:
+        tax_base = getattr(self.model, "tax_base", None)
+        if tax_base is not None:
+            new = self.taxable()
+            update = getattr(tax_base, f"update_{self._taxable_column}")
+            update(self._reported_taxable, new)
+            self._reported_taxable = new
+
+    def _adopt(self, agents: Sequence[Any], model) -> None:
+        """Attach to ``model`` and take over the tax base share of ``agents``.
+
+        Agents of ``model`` already report their income or output to its tax
+        base through their setters; the population counts those amounts as
+        its own instead of adding them a second time.
+        """
+        self.model = model
+        tax_base = getattr(model, "tax_base", None)
+        if tax_base is None:
+            return
+        column = self._taxable_column
+        self._reported_taxable = float(
+            sum(
+                getattr(agent, column)
+                for agent in agents
+                if getattr(getattr(agent, "model", None), "tax_base", None)
+                is tax_base
+            )
+        )
+        self._sync_tax_base()
+
+    def checkpoint_state(
+        self, prefix: str
+    ) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+        """Return copies of the population's arrays keyed ``prefix.column``."""
+        arrays = {
+            f"{prefix}.{name}": getattr(self, name).copy()
+            for name in self._checkpoint_columns
+        }
+        return arrays, {}
+
+    def restore_checkpoint(
+        self, prefix: str, arrays: Dict[str, np.ndarray], meta: Dict[str, Any]
+    ) -> None:
+        """Restore state saved by :meth:`checkpoint_state`."""
+        for name in self._checkpoint_columns:
+            setattr(self, name, np.array(arrays[f"{prefix}.{name}"]))
+        self._sync_tax_base()
+
+    def _draw_down(self) -> None:
+        stocks = getattr(self.model, "stocks", None)
+        if stocks:
+            stocks.apply(-self.resource_demand())
+
+
+def _view_column(name: str) -> property:
+    """Return a property reading and writing row ``_index`` of column ``name``."""
+
+    def getter(self):
+        return getattr(self._population, name)[self._index]
+
+    def setter(self, value) -> None:
+        getattr(self._population, name)[self._index] = value
+
+    return property(getter, setter)
+
+
+class _AgentView:
+    """Array-backed view of one row of a population."""
+
+    __slots__ = ("_population", "_index")
+
+    def __init__(self, population: _Population, index: int) -> None:
+        self._population = population
+        self._index = index
+
+    @property
+    def unique_id(self) -> int:
+        return self._population.id_offset + self._index
+
+    @property
+    def model(self):
+        return self._population.model
+
+    carbon_rate = _view_column("carbon_rate")
+    water_rate = _view_column("water_rate")
+    biomass_rate = _view_column("biomass_rate")
+    mineral_rate = _view_column("mineral_rate")
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} {self._index}>"
+
+
+class HouseholdView(_AgentView):
+    """Household-like view of one row of a :class:`HouseholdPopulation`."""
+
+    __slots__ = ()
+
+    income = _view_column("income")
+    wealth = _view_column("wealth")
+    technology = _view_column("technology")
+    needs_vector = _view_column("needs_vector")
+
+
+class FirmView(_AgentView):
+    """Firm-like view of one row of a :class:`FirmPopulation`."""
+
+    __slots__ = ()
+
+    capital = _view_column("capital")
+    productivity = _view_column("productivity")
+    output = _view_column("output")
+
+
+class HouseholdPopulation(_Population):
+    """Vectorised population of households stored as NumPy columns.
+
+    The columns mirror the attributes of
+    :class:`~src.agents.household.Household`.
+    """
+
+    _taxable_column = "income"
+    _view = HouseholdView
+    _checkpoint_columns = ("income", "wealth", "rates", "needs_vector")
+
+    def __init__(
+        self,
+        n: int,
+        model=None,
+        income=0.0,
+        wealth=0.0,
+        technology=None,
+        carbon_rate=1.0,
+        water_rate=0.5,
+        biomass_rate=0.1,
+        mineral_rate=0.05,
+        needs_vector: Sequence[float] | None = None,
+        seed: int | None = None,
+        id_offset: int = 0,
+    ) -> None:
+        self.model = model
+        self.id_offset = id_offset
+        self.income = _column(income, n)
+        self.wealth = _column(wealth, n)
+        self.technology = np.full(n, None, dtype=object)
+        self.technology[:] = technology
+        self.rates = _rate_matrix(
+            n, carbon_rate, water_rate, biomass_rate, mineral_rate
+        )
+        needs = np.asarray(
+            needs_vector if needs_vector is not None else [0.0] * 4, dtype=float
+        )
+        self.needs_vector = np.array(np.broadcast_to(needs, (n, 4)))
+        self.rng = np.random.default_rng(seed)
+        self._sync_tax_base()
+
+    @classmethod
+    def from_agents(
+        cls,
+        agents: Iterable,
+        model=None,
+        seed: int | None = None,
+        id_offset: int = 0,
+    ):
+        """Return a population holding the state of existing household agents."""
+        agents = list(agents)
+        pop = cls(
+            len(agents),
+            income=[a.income for a in agents],
+            wealth=[a.wealth for a in agents],
+            carbon_rate=[a.carbon_rate for a in agents],
+            water_rate=[a.water_rate for a in agents],
+            biomass_rate=[a.biomass_rate for a in agents],
+            mineral_rate=[a.mineral_rate for a in agents],
+            seed=seed,
+            id_offset=id_offset,
+        )
+        pop.technology[:] = [a.technology for a in agents]
+        if agents:
+            pop.needs_vector[:] = [list(a.needs_vector) for a in agents]
+        pop._adopt(agents, model)
+        return pop
+
+    def checkpoint_state(
+        self, prefix: str
+    ) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+        arrays, meta = super().checkpoint_state(prefix)
+        meta["technology"] = self.technology.tolist()
+        meta["rng"] = self.rng.bit_generator.state
+        return arrays, meta
+
+    def restore_checkpoint(
+        self, prefix: str, arrays: Dict[str, np.ndarray], meta: Dict[str, Any]
+    ) -> None:
+        super().restore_checkpoint(prefix, arrays, meta)
+        self.technology = np.empty(len(meta["technology"]), dtype=object)
+        self.technology[:] = meta["technology"]
+        self.rng.bit_generator.state = meta["rng"]
+
+    def step(self) -> None:
+        """Advance every household by one tick."""
+        self.wealth += self.income
+
+        technologies = getattr(self.model, "technologies", None)
+        if technologies:
+            choices = np.empty(len(technologies), dtype=object)
+            choices[:] = list(technologies)
+            self.technology = choices[self.rng.integers(len(choices), size=len(self))]
+
+        self._sync_tax_base()
+        self._draw_down()
+
+
+class FirmPopulation(_Population):
+    """Vectorised population of firms stored as NumPy columns.
+
+    The columns mirror the attributes of :class:`~src.agents.firm.Firm`.
+    Output for every firm is computed in one pass and the total extraction is
+    applied to each stock once per tick.
+    """
+
+    _taxable_column = "output"
+    _view = FirmView
+    _checkpoint_columns = ("capital", "productivity", "output", "rates")
+
+    def __init__(
+        self,
+        n: int,
+        model=None,
+        capital=1.0,
+        productivity=1.0,
+        carbon_rate=2.0,
+        water_rate=1.0,
+        biomass_rate=0.5,
+        mineral_rate=0.3,
+        id_offset: int = 0,
+    ) -> None:
+        self.model = model
+        self.id_offset = id_offset
+        self.capital = _column(capital, n)
+        self.productivity = _column(productivity, n)
+        self.output = np.zeros(n)
+        self.rates = _rate_matrix(
+            n, carbon_rate, water_rate, biomass_rate, mineral_rate
+        )
+
+    @classmethod
+    def from_agents(cls, agents: Iterable, model=None, id_offset: int = 0):
+        """Return a population holding the state of existing firm agents."""
+        agents = list(agents)
+        pop = cls(
+            len(agents),
+            capital=[a.capital for a in agents],
+            productivity=[a.productivity for a in agents],
+            carbon_rate=[a.carbon_rate for a in agents],
+            water_rate=[a.water_rate for a in agents],
+            biomass_rate=[a.biomass_rate for a in agents],
+            mineral_rate=[a.mineral_rate for a in agents],
+            id_offset=id_offset,
+        )
+        pop.output[:] = [a.output for a in agents]
+        pop._adopt(agents, model)
+        return pop
+
+    def step(self) -> None:
+        """Produce output for every firm and extract the resources it needs."""
+        np.multiply(self.capital, self.productivity, out=self.output)
+        self._sync_tax_base()
+        self._draw_down()
+
+    def scale_output(self, factors: np.ndarray) -> None:
+        """Scale each firm's output by ``factors``, extracting resources in step."""
+        self.output *= factors
+        self._sync_tax_base()
+        stocks = getattr(self.model, "stocks", None)
+        if stocks:
+            stocks.apply(-((factors - 1.0) @ self.rates))
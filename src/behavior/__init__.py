@@ -1,5 +1,24 @@
 """Behavioral archetypes package."""
 
-from .archetypes import LLMArchetype, RLArchetype
+from typing import TYPE_CHECKING
 
-__all__ = ["RLArchetype", "LLMArchetype"]
+from .._lazy import attach
+
+if TYPE_CHECKING:  # pragma: no cover - imports for type checkers only
+    from .archetypes import LLMArchetype, QTable, QTableView, RLArchetype
+
+_EXPORTS = {
+    "RLArchetype": ".archetypes",
+    "LLMArchetype": ".archetypes",
+    "QTable": ".archetypes",
+    "QTableView": ".archetypes",
+}
+
+__all__ = [
+    "RLArchetype",
+    "LLMArchetype",
+    "QTable",
+    "QTableView",
+]
+
+__getattr__, __dir__ = attach(globals(), _EXPORTS)
@@ -2,13 +2,204 @@
 
 from __future__ import annotations
 
-import random
-from collections import defaultdict
-from typing import Callable, Dict, Hashable, List, MutableMapping
+import asyncio
+import inspect
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    MutableMapping,
+    Sequence,
+)
+
+import numpy as np
+
+from ..instrumentation import LookupStats
+
+
+class QTable:
+    """Array-backed Q-values indexed by hashable states and actions.
+
+    Each known state owns one row of ``values`` (one column per action).
+    Rows are added the first time a state is seen and the array grows by
+    doubling, so many agents can share one table and look up whole batches
+    of states with NumPy indexing.  ``visited`` marks the ``(state, action)``
+    entries that have been written or read; unvisited entries hold zeros
+    and are left out of the maximum over next-state values.
+    """
+
+    def __init__(self, actions: Sequence[Hashable], capacity: int = 64) -> None:
+        self.actions = list(actions)
+        if not self.actions:
+            raise ValueError("QTable needs at least one action")
+        self.action_index: Dict[Hashable, int] = {
+            action: i for i, action in enumerate(self.actions)
+        }
+        self.state_index: Dict[Hashable, int] = {}
+        self.values = np.zeros((max(capacity, 1), len(self.actions)))
+        self.visited = np.zeros(self.values.shape, dtype=bool)
+
+    def __len__(self) -> int:
+        return len(self.state_index)
+
+    def _grow(self, rows: int) -> None:
+        capacity = len(self.values)
+        while capacity < rows:
+            capacity *= 2
+        if capacity != len(self.values):
+            values = np.zeros((capacity, len(self.actions)))
+            values[: len(self.values)] = self.values
+            visited = np.zeros(values.shape, dtype=bool)
+            visited[: len(self.visited)] = self.visited
+            self.values, self.visited = values, visited
+
+    def state_ids(self, states: Iterable[Hashable]) -> np.ndarray:
+        """Return the row of each state, adding rows for new states."""
+        index = self.state_index
+        ids = np.fromiter(
+            (index.setdefault(state, len(index)) for state in states), dtype=np.intp
+        )
+        self._grow(len(index))
+        return ids
+
+    def action_ids(self, actions: Iterable[Hashable]) -> np.ndarray:
+        """Return the column of each action."""
+        index = self.action_index
+        return np.fromiter((index[action] for action in actions), dtype=np.intp)
+
+    def get(self, state: Hashable, action: Hashable) -> float:
+        """Return one Q-value (zero for unseen states)."""
+        row = self.state_index.get(state)
+        if row is None:
+            return 0.0
+        return float(self.values[row, self.action_index[action]])
+
+    def max_values(self, state_ids: np.ndarray) -> np.ndarray:
+        """Return the largest visited Q-value of each row (0 if none)."""
+        visited = self.visited[state_ids]
+        masked = np.where(visited, self.values[state_ids], -np.inf).max(axis=1)
+        return np.where(visited.any(axis=1), masked, 0.0)
+
+    def to_dict(self) -> Dict[Hashable, Dict[Hashable, float]]:
+        """Return the visited Q-values as nested ``{state: {action: value}}``."""
+        result: Dict[Hashable, Dict[Hashable, float]] = {}
+        for state, row in self.state_index.items():
+            columns = np.flatnonzero(self.visited[row]).tolist()
+            if columns:
+                values = self.values[row]
+                result[state] = {self.actions[c]: float(values[c]) for c in columns}
+        return result
+
+
+class _QRowView(MutableMapping[Hashable, float]):
+    """The Q-values of one state, read and written through a :class:`QTable`.
+
+    Reading an action counts as visiting it and gives 0.0 for new entries,
+    as with the ``defaultdict`` the table replaced.
+    """
+
+    def __init__(self, table: QTable, state: Hashable) -> None:
+        self._table = table
+        self._state = state
+
+    def _cell(self, action: Hashable) -> tuple[int, int]:
+        column = self._table.action_index[action]
+        return int(self._table.state_ids([self._state])[0]), column
+
+    def _visited_row(self) -> int | None:
+        row = self._table.state_index.get(self._state)
+        if row is None or not self._table.visited[row].any():
+            return None
+        return row
+
+    def __getitem__(self, action: Hashable) -> float:
+        row, column = self._cell(action)
+        self._table.visited[row, column] = True
+        return float(self._table.values[row, column])
+
+    def __setitem__(self, action: Hashable, value: float) -> None:
+        row, column = self._cell(action)
+        self._table.values[row, column] = value
+        self._table.visited[row, column] = True
+
+    def __delitem__(self, action: Hashable) -> None:
+        if action not in self:
+            raise KeyError(action)
+        row, column = self._cell(action)
+        self._table.values[row, column] = 0.0
+        self._table.visited[row, column] = False
+
+    def __contains__(self, action: object) -> bool:
+        row = self._visited_row()
+        column = self._table.action_index.get(action)  # type: ignore[arg-type]
+        if row is None or column is None:
+            return False
+        return bool(self._table.visited[row, column])
+
+    def __iter__(self) -> Iterator[Hashable]:
+        row = self._visited_row()
+        if row is None:
+            return iter(())
+        actions = self._table.actions
+        return iter([actions[c] for c in np.flatnonzero(self._table.visited[row])])
+
+    def __len__(self) -> int:
+        row = self._visited_row()
+        return 0 if row is None else int(np.count_nonzero(self._table.visited[row]))
+
+
+class QTableView(MutableMapping[Hashable, MutableMapping[Hashable, float]]):
+    """``{state: {action: value}}`` mapping backed by a :class:`QTable`.
+
+    States and actions are listed once visited.  ``view[state][action]``
+    reads 0.0 for new entries and assignments write through to the table.
+    """
+
+    def __init__(self, table: QTable) -> None:
+        self._table = table
+
+    def __getitem__(self, state: Hashable) -> _QRowView:
+        return _QRowView(self._table, state)
+
+    def __setitem__(self, state: Hashable, values: Mapping[Hashable, float]) -> None:
+        row = self[state]
+        row.clear()
+        row.update(values)
+
+    def __delitem__(self, state: Hashable) -> None:
+        if state not in self:
+            raise KeyError(state)
+        self[state].clear()
+
+    def __contains__(self, state: object) -> bool:
+        return len(self[state]) > 0
+
+    def __iter__(self) -> Iterator[Hashable]:
+        visited = self._table.visited
+        index = self._table.state_index
+        return iter([state for state, row in index.items() if visited[row].any()])
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
 
 
 class RLArchetype:
-    """Simple Q-learning based reinforcement learning archetype."""
+    """Q-learning archetype acting for a whole population at once.
+
+    Pass the same ``table`` to several archetypes to let them learn together.
+    Exploration draws from ``rng`` (a NumPy ``Generator``, created from
+    ``seed`` if not given).  States without visited entries get a uniformly
+    random action; otherwise unvisited actions count as zero, ties go to the
+    first action and the greedy choice marks every action of the state as
+    visited.
+    """
 
     def __init__(
         self,
@@ -16,45 +207,218 @@ class RLArchetype:
         learning_rate: float = 0.1,
         discount: float = 0.95,
         epsilon: float = 0.1,
+        table: QTable | None = None,
+        rng: np.random.Generator | None = None,
+        seed: int | None = None,
     ) -> None:
-        self.actions = actions
+        self.table = table if table is not None else QTable(actions)
+        if list(actions) != self.table.actions:
+            raise ValueError("actions must match the shared table's actions")
+        self.actions = self.table.actions
         self.learning_rate = learning_rate
         self.discount = discount
         self.epsilon = epsilon
-        self.q_table: MutableMapping[Hashable, MutableMapping[Hashable, float]] = (
-            defaultdict(lambda: defaultdict(float))
-        )
+        self.rng = rng if rng is not None else np.random.default_rng(seed)
+
+    @property
+    def q_table(self) -> QTableView:
+        """The learned Q-values as a mutable ``{state: {action: value}}`` view."""
+        return QTableView(self.table)
+
+    def choose_action_ids(self, state_ids: np.ndarray) -> np.ndarray:
+        """Return an ε-greedy action column for each table row."""
+        table = self.table
+        n = len(state_ids)
+        greedy = table.values[state_ids].argmax(axis=1)
+        explore = ~table.visited[state_ids].any(axis=1)
+        if self.epsilon > 0:
+            explore |= self.rng.random(n) < self.epsilon
+        count = int(np.count_nonzero(explore))
+        if count:
+            greedy[explore] = self.rng.integers(len(self.actions), size=count)
+        if count < n:
+            table.visited[state_ids[~explore]] = True
+        return greedy
+
+    def choose_actions(self, states: Iterable[Hashable]) -> List[Hashable]:
+        """Return an ε-greedy action for each state."""
+        ids = self.choose_action_ids(self.table.state_ids(states))
+        actions = self.actions
+        return [actions[i] for i in ids.tolist()]
 
     def choose_action(self, state: Hashable) -> Hashable:
-        """Return an action using an \epsilon-greedy policy."""
-        if random.random() < self.epsilon:
-            return random.choice(self.actions)
-        q_values = self.q_table[state]
-        if not q_values:
-            return random.choice(self.actions)
-        return max(self.actions, key=lambda a: q_values[a])
+        """Return an action using an ε-greedy policy."""
+        return self.choose_actions([state])[0]
+
+    def update_ids(
+        self,
+        state_ids: np.ndarray,
+        action_ids: np.ndarray,
+        rewards: Any,
+        next_state_ids: np.ndarray,
+    ) -> None:
+        """Apply a batch of experiences given as table rows and columns."""
+        table = self.table
+        values = table.values
+        rewards = np.broadcast_to(np.asarray(rewards, dtype=float), state_ids.shape)
+        table.visited[state_ids, action_ids] = True
+        targets = rewards + self.discount * table.max_values(next_state_ids)
+        deltas = self.learning_rate * (targets - values[state_ids, action_ids])
+        np.add.at(values, (state_ids, action_ids), deltas)
+
+    def update_batch(
+        self,
+        states: Sequence[Hashable],
+        actions: Sequence[Hashable],
+        rewards: Any,
+        next_states: Sequence[Hashable],
+    ) -> None:
+        """Update the Q-table from a batch of experiences.
+
+        Every update is computed from the table as it was before the batch;
+        repeated ``(state, action)`` pairs add up their changes.
+        """
+        table = self.table
+        self.update_ids(
+            table.state_ids(states),
+            table.action_ids(actions),
+            rewards,
+            table.state_ids(next_states),
+        )
 
     def update(
         self, state: Hashable, action: Hashable, reward: float, next_state: Hashable
     ) -> None:
         """Update the Q-table from an experience."""
-        current = self.q_table[state][action]
-        next_values = self.q_table[next_state]
-        next_max = max(next_values.values()) if next_values else 0.0
-        target = reward + self.discount * next_max
-        self.q_table[state][action] = current + self.learning_rate * (target - current)
+        self.update_batch([state], [action], reward, [next_state])
+
+
+def _check_no_running_loop(method: str) -> None:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    raise RuntimeError(
+        f"LLMArchetype.{method}() cannot run inside a running event loop; "
+        "await agenerate_batch() instead"
+    )
 
 
 class LLMArchetype:
-    """Lightweight archetype wrapper around a language model function."""
+    """Lightweight archetype wrapper around a language model function.
+
+    ``call_func`` may be a plain function or a coroutine function.
+    :meth:`generate_batch` answers the prompts of a whole population at once:
+    identical prompts are sent once, at most ``max_concurrency`` calls run at
+    the same time (plain functions run in worker threads) and responses are
+    memoised in an LRU cache of ``cache_size`` prompts (``0`` disables it,
+    and with it the :attr:`stats` counters).  The blocking :meth:`generate`
+    and :meth:`generate_batch` start their own event loop; from async code
+    await :meth:`agenerate_batch` instead.
+    """
 
     def __init__(
-        self, prompt: str, call_func: Callable[[str], str] | None = None
+        self,
+        prompt: str,
+        call_func: Callable[[str], str] | None = None,
+        max_concurrency: int = 16,
+        cache_size: int = 1024,
     ) -> None:
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
         self.prompt = prompt
         self.call_func = call_func or (lambda x: "")
+        self.max_concurrency = max_concurrency
+        self.cache_size = cache_size
+        self.stats = LookupStats()
+        # Full prompt -> response, least recently used first.
+        self._cache: OrderedDict[str, str] = OrderedDict()
+
+    def _full_prompt(self, user_input: str) -> str:
+        return f"{self.prompt}\n{user_input}"
+
+    def _lookup(self, prompt: str) -> str | None:
+        if self.cache_size <= 0:
+            return None
+        response = self._cache.get(prompt)
+        if response is None:
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        self._cache.move_to_end(prompt)
+        return response
+
+    def _store(self, prompt: str, response: str) -> None:
+        if self.cache_size <= 0:
+            return
+        self._cache[prompt] = response
+        self._cache.move_to_end(prompt)
+        self.stats.stores += 1
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+            self.stats.evictions += 1
+
+    def clear_cache(self) -> None:
+        """Forget every memoised response."""
+        self._cache.clear()
 
     def generate(self, user_input: str) -> str:
         """Generate text using ``call_func``."""
-        full_prompt = f"{self.prompt}\n{user_input}"
-        return self.call_func(full_prompt)
+        full_prompt = self._full_prompt(user_input)
+        response = self._lookup(full_prompt)
+        if response is None:
+            response = self.call_func(full_prompt)
+            if inspect.iscoroutine(response):
+                try:
+                    _check_no_running_loop("generate")
+                except RuntimeError:
+                    response.close()
+                    raise
+                response = asyncio.run(response)
+            self._store(full_prompt, response)
+        return response
+
+    async def agenerate_batch(self, user_inputs: Iterable[str]) -> List[str]:
+        """Return the response to each input, calling ``call_func`` concurrently."""
+        prompts = [self._full_prompt(text) for text in user_inputs]
+        responses: Dict[str, str] = {}
+        missing: List[str] = []
+        for prompt in dict.fromkeys(prompts):
+            response = self._lookup(prompt)
+            if response is None:
+                missing.append(prompt)
+            else:
+                responses[prompt] = response
+
+        if missing:
+            results = await self._dispatch(missing)
+            for prompt, response in zip(missing, results):
+                responses[prompt] = response
+                self._store(prompt, response)
+        return [responses[prompt] for prompt in prompts]
+
+    async def _dispatch(self, prompts: List[str]) -> List[str]:
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        if inspect.iscoroutinefunction(self.call_func):
+
+            async def call(prompt: str) -> str:
+                async with semaphore:
+                    return await self.call_func(prompt)
+
+            return list(await asyncio.gather(*(call(p) for p in prompts)))
+
+        loop = asyncio.get_running_loop()
+        workers = min(self.max_concurrency, len(prompts))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+
+            async def run(prompt: str) -> str:
+                async with semaphore:
+                    return await loop.run_in_executor(pool, self.call_func, prompt)
+
+            return list(await asyncio.gather(*(run(p) for p in prompts)))
+
+    def generate_batch(self, user_inputs: Iterable[str]) -> List[str]:
+        """Blocking wrapper around :meth:`agenerate_batch`."""
+        _check_no_running_loop("generate_batch")
+        return asyncio.run(self.agenerate_batch(user_inputs))
+
@@ -1,5 +1,24 @@
 """Biophysical components for the vector money simulation."""
 
-from .stocks import BioPhysicalStocks, StockModel
+from typing import TYPE_CHECKING
 
-__all__ = ["BioPhysicalStocks", "StockModel"]
+from .._lazy import attach
+
+if TYPE_CHECKING:  # pragma: no cover - imports for type checkers only
+    from .stocks import BioPhysicalStocks, LinearFlow, STOCK_NAMES, StockModel
+
+_EXPORTS = {
+    "BioPhysicalStocks": ".stocks",
+    "StockModel": ".stocks",
+    "LinearFlow": ".stocks",
+    "STOCK_NAMES": ".stocks",
+}
+
+__all__ = [
+    "BioPhysicalStocks",
+    "StockModel",
+    "LinearFlow",
+    "STOCK_NAMES",
+]
+
+__getattr__, __dir__ = attach(globals(), _EXPORTS)
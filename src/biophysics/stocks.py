@@ -6,12 +6,24 @@ simulation can run even when the dependency is not available.  If
 :mod:`pysd` is installed we make use of its :class:`Integ` integrator.  In
 other environments we fall back to a minimal replacement that replicates the
 same interface needed for this project.
+
+:class:`BioPhysicalStocks` additionally keeps its four stock levels in a
+single NumPy state vector (``stocks.state``); each of its stocks uses a
+:class:`VectorInteg` whose scalar level is mirrored into one entry of that
+vector.  Flows may be arbitrary callables or :class:`LinearFlow` instances of
+the form ``rate + coefficient * stock``.  When every flow is linear the whole vector
+is advanced with one array expression per tick, and
+:meth:`BioPhysicalStocks.advance` jumps ``k`` ticks ahead analytically.
+Otherwise the stocks are stepped one after the other, so a callable flow
+sees the stocks updated before it in the same tick.
 """
 
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Callable
+from typing import Callable, Union
+
+import numpy as np
 
 try:  # pragma: no cover - optional import
     from pysd.py_backend.functions import Integ  # type: ignore
@@ -29,27 +41,160 @@ except Exception:  # pragma: no cover - pysd may not be installed
             return self.state
 
 
+#: Names of the stocks held by :class:`BioPhysicalStocks`, in canonical order.
+STOCK_NAMES = ("carbon_budget", "water", "biomass", "minerals")
+
+
+@dataclass(frozen=True)
+class LinearFlow:
+    """Flow ``rate + coefficient * stock``; constant when ``coefficient`` is 0."""
+
+    rate: float = 0.0
+    coefficient: float = 0.0
+
+    def __call__(self, stock: float = 0.0) -> float:
+        return self.rate + self.coefficient * stock
+
+
+Flow = Union[LinearFlow, Callable[[], float], float]
+
+
+class VectorInteg:
+    """Euler integrator mirrored into one entry of a shared NumPy vector.
+
+    The level itself is the plain float :attr:`state`, so per-agent updates
+    cost no more than with :class:`Integ`; :meth:`store` and :meth:`load`
+    copy it to and from ``vector[index]`` around whole-vector operations.
+    """
+
+    __slots__ = ("func", "state", "_vector", "_index")
+
+    def __init__(
+        self,
+        func: Callable[[], float],
+        initial: float,
+        vector: np.ndarray,
+        index: int,
+    ) -> None:
+        self.func = func
+        self.state = float(initial)
+        self._vector = vector
+        self._index = index
+        vector[index] = initial
+
+    def store(self) -> None:
+        """Write the level into the vector."""
+        self._vector[self._index] = self.state
+
+    def load(self) -> None:
+        """Read the level back from the vector."""
+        self.state = self._vector.item(self._index)
+
+    def step(self, dt: float = 1.0) -> float:
+        self.state += self.func() * dt
+        return self.state
+
+
+def _advance_linear(
+    state: np.ndarray,
+    rates: np.ndarray,
+    coefficients: np.ndarray,
+    k: int,
+    dt: float,
+) -> None:
+    """Apply ``k`` Euler steps of linear flows to ``state`` in closed form.
+
+    One step maps ``x`` to ``g * x + rate * dt`` with
+    ``g = 1 + coefficient * dt``, so after ``k`` steps
+    ``x = g**k * x + rate * dt * (g**k - 1) / (g - 1)`` (or ``k * rate * dt``
+    when ``g == 1``).
+    """
+    growth = 1.0 + coefficients * dt
+    power = growth**k
+    constant = growth == 1.0
+    safe = np.where(constant, 2.0, growth)
+    factor = np.where(constant, float(k), (power - 1.0) / (safe - 1.0))
+    state *= power
+    state += rates * dt * factor
+
+
 @dataclass
 class StockModel:
-    """Wrapper around a stock/integrator."""
+    """Wrapper around a stock/integrator.
+
+    With ``state`` the stock level is mirrored into ``state[index]`` (see
+    :class:`VectorInteg`); otherwise it uses its own :class:`Integ`.
+    Assigning ``flow`` (or calling :meth:`set_flow`) updates the integrator;
+    a plain number sets a constant :class:`LinearFlow`.
+    """
 
     initial: float = 0.0
-    flow: Callable[[], float] = lambda: 0.0
+    flow: Flow = LinearFlow()
     integ: Integ = field(init=False)
+    state: np.ndarray | None = field(default=None, repr=False, compare=False)
+    index: int = 0
+    _on_flow_change: Callable[[], None] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     def __post_init__(self) -> None:
-        self.integ = Integ(self.flow, self.initial)
+        if self.state is None:
+            self.integ = Integ(self._integrand(), self.initial)
+        else:
+            self.integ = VectorInteg(
+                self._integrand(), self.initial, self.state, self.index
+            )
+
+    def __setattr__(self, name: str, value) -> None:
+        if name == "flow" and isinstance(value, (int, float)):
+            value = LinearFlow(float(value))
+        object.__setattr__(self, name, value)
+        if name == "flow" and hasattr(self, "integ"):
+            self.integ.func = self._integrand()
+            if self._on_flow_change is not None:
+                self._on_flow_change()
+
+    def _integrand(self) -> Callable[[], float]:
+        flow = self.flow
+        if isinstance(flow, LinearFlow):
+            return lambda: flow(self.value)
+        return flow
 
     @property
     def value(self) -> float:
         return getattr(self.integ, "state", 0.0)
 
+    @property
+    def is_linear(self) -> bool:
+        """Whether the flow is a :class:`LinearFlow`."""
+        return isinstance(self.flow, LinearFlow)
+
+    def rate(self) -> float:
+        """Return the current flow rate."""
+        return self.integ.func()
+
     def step(self, dt: float = 1.0) -> None:
         self.integ.step(dt)
 
-    def set_flow(self, flow: Callable[[], float]) -> None:
+    def advance(self, k: int, dt: float = 1.0) -> None:
+        """Advance ``k`` steps, analytically when the flow is linear."""
+        if self.is_linear:
+            level = np.array([self.value])
+            flow = self.flow
+            _advance_linear(
+                level,
+                np.array([flow.rate]),
+                np.array([flow.coefficient]),
+                k,
+                dt,
+            )
+            self.integ.state = level.item(0)
+        else:
+            for _ in range(k):
+                self.step(dt)
+
+    def set_flow(self, flow: Flow) -> None:
         self.flow = flow
-        self.integ.func = flow
 
     def apply(self, change: float) -> None:
         """Directly modify the stock level by ``change``."""
@@ -66,14 +211,77 @@ class BioPhysicalStocks:
         biomass: float = 0.0,
         minerals: float = 0.0,
     ) -> None:
-        self.carbon_budget = StockModel(carbon_budget)
-        self.water = StockModel(water)
-        self.biomass = StockModel(biomass)
-        self.minerals = StockModel(minerals)
-
-    def step(self) -> None:
-        """Advance all stocks one tick."""
-        self.carbon_budget.step()
-        self.water.step()
-        self.biomass.step()
-        self.minerals.step()
+        self._state = np.zeros(len(STOCK_NAMES))
+        self.carbon_budget = StockModel(carbon_budget, state=self._state, index=0)
+        self.water = StockModel(water, state=self._state, index=1)
+        self.biomass = StockModel(biomass, state=self._state, index=2)
+        self.minerals = StockModel(minerals, state=self._state, index=3)
+        self._integs = [stock.integ for stock in self.stocks()]
+        for stock in self.stocks():
+            stock._on_flow_change = self._refresh_flows
+        self._refresh_flows()
+
+    @property
+    def state(self) -> np.ndarray:
+        """The stock levels in :data:`STOCK_NAMES` order.
+
+        Agents update the scalar levels, which are copied into the vector on
+        each read; assign to ``state`` to set the levels.
+        """
+        for integ in self._integs:
+            integ.store()
+        return self._state
+
+    @state.setter
+    def state(self, value) -> None:
+        self._state[:] = value
+        self._load()
+
+    def _load(self) -> None:
+        for integ in self._integs:
+            integ.load()
+
+    def stocks(self) -> list[StockModel]:
+        """Return the stocks in :data:`STOCK_NAMES` order."""
+        return [getattr(self, name) for name in STOCK_NAMES]
+
+    def _refresh_flows(self) -> None:
+        stocks = self.stocks()
+        self._linear = all(stock.is_linear for stock in stocks)
+        if self._linear:
+            self._rates = np.array([stock.flow.rate for stock in stocks])
+            self._coefficients = np.array([stock.flow.coefficient for stock in stocks])
+            self._static = not self._rates.any() and not self._coefficients.any()
+
+    def apply(self, changes) -> None:
+        """Add a vector of ``changes`` (in :data:`STOCK_NAMES` order)."""
+        self.state += changes
+
+    def step(self, dt: float = 1.0) -> None:
+        """Advance all stocks one tick.
+
+        Linear flows only depend on their own stock, so they are applied as
+        one vector update; otherwise the stocks step in order.
+        """
+        if not self._linear:
+            self.carbon_budget.step(dt)
+            self.water.step(dt)
+            self.biomass.step(dt)
+            self.minerals.step(dt)
+        elif not self._static:
+            state = self.state
+            state += (self._rates + self._coefficients * state) * dt
+            self._load()
+
+    def advance(self, k: int, dt: float = 1.0) -> None:
+        """Advance all stocks ``k`` ticks.
+
+        Linear flows are advanced in closed form in a single call; otherwise
+        this is equivalent to calling :meth:`step` ``k`` times.
+        """
+        if not self._linear:
+            for _ in range(k):
+                self.step(dt)
+        elif not self._static:
+            _advance_linear(self.state, self._rates, self._coefficients, k, dt)
+            self._load()
@@ -0,0 +1,183 @@
+"""Content-addressed on-disk cache of simulation results.
+
+Results are keyed by a hash of the canonical run configuration, the seed and
+the code version, i.e. a hash of the simulation source files, so editing the
+model invalidates earlier results automatically.  Configuration keys that
+only control how an ensemble is run or where it is written (``seed``,
+``ensembles``, ``workers``, ``output_dir``, ``output_format`` and the cache
+settings) do not affect a single run and are left out of the hash.
+
+Each entry is one JSON file, so cached float values round-trip exactly.
+With ``max_bytes`` the least recently used entries are evicted once the
+cache grows beyond that size; recency is kept in the files' modification
+times and therefore shared between processes using the same directory.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List
+
+#: Configuration keys ignored when hashing a run configuration.
+RUN_ONLY_KEYS = frozenset(
+    {
+        "seed",
+        "ensembles",
+        "workers",
+        "output_dir",
+        "output_format",
+        "cache_dir",
+        "cache_max_bytes",
+    }
+)
+
+_PACKAGE_DIR = Path(__file__).resolve().parent
+
+
+def canonical_config(cfg: Dict[str, Any]) -> str:
+    """Return ``cfg`` without run-only keys as canonical JSON."""
+    relevant = {k: v for k, v in cfg.items() if k not in RUN_ONLY_KEYS}
+    return json.dumps(relevant, sort_keys=True, separators=(",", ":"))
+
+
+def config_hash(cfg: Dict[str, Any]) -> str:
+    """Return the SHA-256 hex digest of :func:`canonical_config`."""
+    return hashlib.sha256(canonical_config(cfg).encode("utf-8")).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def code_version(*paths: str | Path) -> str:
+    """Return a hash of the ``src`` package sources and any extra ``paths``.
+
+    Directories are searched for ``*.py`` files recursively.  The result is
+    computed once per process and set of paths.
+    """
+    digest = hashlib.sha256()
+    for root in (_PACKAGE_DIR, *map(Path, paths)):
+        files = sorted(root.rglob("*.py")) if root.is_dir() else [root]
+        for path in files:
+            digest.update(path.name.encode("utf-8"))
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def _default_version() -> str:
+    return code_version()
+
+
+@dataclass
+class CacheStats:
+    """Lookup and storage counters of a :class:`ResultCache`."""
+
+    hits: int = 0
+    misses: int = 0
+    bypassed: int = 0
+    stores: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**asdict(self), "hit_rate": self.hit_rate}
+
+
+class ResultCache:
+    """Directory of cached run results keyed by config, seed and code version.
+
+    ``code_version`` defaults to :func:`code_version` of the ``src`` package.
+    With ``bypass=True`` lookups always miss (and are counted as bypassed)
+    while new results are still stored, refreshing the cache.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        max_bytes: int | None = None,
+        code_version: str | None = None,
+        bypass: bool = False,
+    ) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        if code_version is None:
+            code_version = _default_version()
+        self.code_version = code_version
+        self.bypass = bypass
+        self.stats = CacheStats()
+        # Entry name -> size in bytes, least recently used first.
+        self._entries: OrderedDict[str, int] = OrderedDict()
+        self._size = 0
+        files = [(p.stat(), p.name) for p in self.directory.glob("*.json")]
+        for stat, name in sorted(files, key=lambda item: item[0].st_mtime_ns):
+            self._entries[name] = stat.st_size
+            self._size += stat.st_size
+
+    def key(self, cfg: Dict[str, Any], seed: int) -> str:
+        """Return the cache key of running ``cfg`` with ``seed``."""
+        content = f"{canonical_config(cfg)}\n{int(seed)}\n{self.code_version}"
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def get(self, cfg: Dict[str, Any], seed: int) -> List[Dict[str, Any]] | None:
+        """Return the cached records, or ``None`` if they are not cached."""
+        if self.bypass:
+            self.stats.bypassed += 1
+            return None
+        name = f"{self.key(cfg, seed)}.json"
+        path = self.directory / name
+        try:
+            text = path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            self._forget(name)
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        os.utime(path)
+        if name in self._entries:
+            self._entries.move_to_end(name)
+        return json.loads(text)
+
+    def put(
+        self, cfg: Dict[str, Any], seed: int, records: List[Dict[str, Any]]
+    ) -> None:
+        """Store ``records`` for ``cfg`` and ``seed`` and evict old entries."""
+        name = f"{self.key(cfg, seed)}.json"
+        path = self.directory / name
+        data = json.dumps(records).encode("utf-8")
+        tmp = path.with_name(name + ".tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+        self._forget(name)
+        self._entries[name] = len(data)
+        self._size += len(data)
+        self.stats.stores += 1
+        self._evict()
+
+    def _forget(self, name: str) -> None:
+        self._size -= self._entries.pop(name, 0)
+
+    def _evict(self) -> None:
+        if self.max_bytes is None:
+            return
+        # The newest entry is always kept, even if it alone exceeds max_bytes.
+        while self._size > self.max_bytes and len(self._entries) > 1:
+            name, size = self._entries.popitem(last=False)
+            self._size -= size
+            (self.directory / name).unlink(missing_ok=True)
+            self.stats.evictions += 1
+
+    @property
+    def size_bytes(self) -> int:
+        """Total size of the cached entries known to this instance."""
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,162 @@
+"""Binary checkpoints for long simulations.
+
+A checkpoint is an uncompressed ``.npz`` archive.  Every array of model state
+(stocks, agent columns, recorded series) is stored under a dotted key such as
+``households.wealth``, and scalar state (parameters, prices, RNG states) is
+stored as JSON under ``__meta__``.  Float values round-trip exactly, so a
+restored model continues bit-identically.
+
+:class:`Checkpointer` writes snapshots on a background thread: the state is
+copied when the snapshot is taken and the run continues while the file is
+written.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+_META_KEY = "__meta__"
+
+
+def write_checkpoint(
+    path: str | Path, arrays: Dict[str, np.ndarray], meta: Dict[str, Any]
+) -> None:
+    """Write ``arrays`` and JSON-serialisable ``meta`` to ``path`` atomically."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = np.frombuffer(json.dumps(meta).encode("utf-8"), dtype=np.uint8)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as fh:
+        np.savez(fh, **{_META_KEY: payload}, **arrays)
+    os.replace(tmp, path)
+
+
+def read_checkpoint(path: str | Path) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+    """Return the ``(arrays, meta)`` stored at ``path``."""
+    with np.load(Path(path), allow_pickle=False) as data:
+        arrays = {key: data[key] for key in data.files if key != _META_KEY}
+        meta = json.loads(data[_META_KEY].tobytes().decode("utf-8"))
+    return arrays, meta
+
+
+def agent_columns(
+    prefix: str, agents: Sequence[Any], fields: Iterable[str]
+) -> Dict[str, np.ndarray]:
+    """Return ``fields`` of ``agents`` as float arrays keyed ``prefix.field``."""
+    return {
+        f"{prefix}.{name}": np.array([getattr(a, name) for a in agents], dtype=float)
+        for name in fields
+    }
+
+
+def agent_objects(agents: Sequence[Any], fields: Iterable[str]) -> Dict[str, list]:
+    """Return JSON-serialisable (non-numeric) ``fields`` of ``agents`` as lists."""
+    return {name: [getattr(a, name) for a in agents] for name in fields}
+
+
+def set_agent_columns(
+    prefix: str, agents: Sequence[Any], arrays: Dict[str, np.ndarray]
+) -> None:
+    """Assign every ``prefix.field`` array in ``arrays`` back onto ``agents``."""
+    start = len(prefix) + 1
+    for key, values in arrays.items():
+        if key.startswith(prefix + "."):
+            for agent, value in zip(agents, values.tolist()):
+                setattr(agent, key[start:], value)
+
+
+def random_state(rng) -> Any:
+    """Return the JSON-serialisable state of a ``random.Random`` or NumPy RNG."""
+    if hasattr(rng, "bit_generator"):
+        return rng.bit_generator.state
+    version, internal, gauss = rng.getstate()
+    return [version, list(internal), gauss]
+
+
+def set_random_state(rng, state: Any) -> None:
+    """Restore a state produced by :func:`random_state`."""
+    if hasattr(rng, "bit_generator"):
+        rng.bit_generator.state = state
+    else:
+        version, internal, gauss = state
+        rng.setstate((version, tuple(internal), gauss))
+
+
+def agent_random_states(
+    prefix: str, agents: Sequence[Any], shared: Any = None
+) -> Tuple[Dict[str, np.ndarray], Any]:
+    """Return the states of the agents' own ``random.Random`` generators.
+
+    The Mersenne Twister states are stored as one ``(N, 625)`` array keyed
+    ``random.prefix`` (outside the ``prefix.`` agent columns).  When an agent has no ``random`` or uses the
+    ``shared`` model generator (saved with the model), nothing is returned.
+    """
+    rngs = [getattr(agent, "random", None) for agent in agents]
+    if not rngs or any(rng is None or rng is shared for rng in rngs):
+        return {}, None
+    states = [rng.getstate() for rng in rngs]
+    internal = np.array([state[1] for state in states], dtype=np.uint32)
+    meta = {"version": states[0][0], "gauss": [state[2] for state in states]}
+    return {f"random.{prefix}": internal}, meta
+
+
+def set_agent_random_states(
+    prefix: str, agents: Sequence[Any], arrays: Dict[str, np.ndarray], meta: Any
+) -> None:
+    """Restore states produced by :func:`agent_random_states`."""
+    if meta is None:
+        return
+    internal = arrays[f"random.{prefix}"].tolist()
+    for agent, state, gauss in zip(agents, internal, meta["gauss"]):
+        agent.random.setstate((meta["version"], tuple(state), gauss))
+
+
+class Checkpointer:
+    """Write checkpoints every ``every`` ticks without stalling the run.
+
+    ``path`` may contain ``{tick}``, which is replaced by the tick count of
+    the snapshot; otherwise each snapshot overwrites the previous one.
+    Snapshots are written in order by a single background thread.
+    """
+
+    def __init__(self, path: str | Path, every: int) -> None:
+        if every <= 0:
+            raise ValueError("every must be positive")
+        self.path = str(path)
+        self.every = every
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._pending: List[Future] = []
+
+    def maybe_save(self, model, tick: int) -> None:
+        """Snapshot ``model`` if ``tick`` is a multiple of ``every``."""
+        if tick % self.every == 0:
+            self._collect_finished()
+            arrays, meta = model._checkpoint_state()
+            path = self.path.format(tick=tick)
+            self._pending.append(
+                self._executor.submit(write_checkpoint, path, arrays, meta)
+            )
+
+    def _collect_finished(self) -> None:
+        pending = []
+        for future in self._pending:
+            if future.done():
+                future.result()
+            else:
+                pending.append(future)
+        self._pending = pending
+
+    def close(self) -> None:
+        """Wait for outstanding writes and re-raise any write error."""
+        pending, self._pending = self._pending, []
+        try:
+            for future in pending:
+                future.result()
+        finally:
+            self._executor.shutdown()
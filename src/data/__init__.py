@@ -1,6 +1,46 @@
-"""Data loading and normalisation utilities."""
+"""Data loading, normalisation and ensemble storage utilities."""
 
-from .io import read_inventory, read_io_table
-from .normalise import normalise_per_capita
+from typing import TYPE_CHECKING
 
-__all__ = ["read_io_table", "read_inventory", "normalise_per_capita"]
+from .._lazy import attach
+
+if TYPE_CHECKING:  # pragma: no cover - imports for type checkers only
+    from .ensemble import EnsembleWriter, load_ensemble, run_matrix, save_ensemble
+    from .io import (
+        IOMatrix,
+        convert_io_table,
+        open_io_matrix,
+        read_inventory,
+        read_io_table,
+    )
+    from .normalise import normalise_matrix, normalise_per_capita
+
+_EXPORTS = {
+    "read_io_table": ".io",
+    "read_inventory": ".io",
+    "IOMatrix": ".io",
+    "convert_io_table": ".io",
+    "open_io_matrix": ".io",
+    "normalise_per_capita": ".normalise",
+    "normalise_matrix": ".normalise",
+    "EnsembleWriter": ".ensemble",
+    "save_ensemble": ".ensemble",
+    "load_ensemble": ".ensemble",
+    "run_matrix": ".ensemble",
+}
+
+__all__ = [
+    "read_io_table",
+    "read_inventory",
+    "IOMatrix",
+    "convert_io_table",
+    "open_io_matrix",
+    "normalise_per_capita",
+    "normalise_matrix",
+    "EnsembleWriter",
+    "save_ensemble",
+    "load_ensemble",
+    "run_matrix",
+]
+
+__getattr__, __dir__ = attach(globals(), _EXPORTS)
@@ -0,0 +1,102 @@
+"""Single-file storage for ensemble time series.
+
+All ensemble members are stored in one ``.npy`` file holding a structured
+array with an ``int64`` ``run_id`` and ``step`` followed by one ``float64``
+field per recorded stock.  Rows for run ``i`` occupy the contiguous block
+``[i * steps, (i + 1) * steps)``, so runs can be written as they finish and a
+single stock across the ensemble reshapes to a ``(runs, steps)`` matrix.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Sequence
+
+import numpy as np
+
+from ..biophysics.stocks import STOCK_NAMES
+
+
+def ensemble_dtype(columns: Iterable[str] = STOCK_NAMES) -> np.dtype:
+    """Return the structured dtype used for ensemble files."""
+    fields = [("run_id", np.int64), ("step", np.int64)]
+    fields += [(name, np.float64) for name in columns]
+    return np.dtype(fields)
+
+
+class EnsembleWriter:
+    """Write ensemble members into one preallocated, memory-mapped file.
+
+    The file is sized for ``runs * steps`` rows up front and each call to
+    :meth:`write` fills one run's block in place, in any order.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        runs: int,
+        steps: int,
+        columns: Sequence[str] = STOCK_NAMES,
+    ) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.runs = runs
+        self.steps = steps
+        self.columns = list(columns)
+        self._array = np.lib.format.open_memmap(
+            self.path,
+            mode="w+",
+            dtype=ensemble_dtype(self.columns),
+            shape=(runs * steps,),
+        )
+
+    def write(self, run_id: int, records: List[Dict[str, Any]]) -> None:
+        """Store ``records`` of one run (as returned by ``run_model``)."""
+        if len(records) != self.steps:
+            raise ValueError(f"expected {self.steps} records, got {len(records)}")
+        block = self._array[run_id * self.steps : (run_id + 1) * self.steps]
+        block["run_id"] = run_id
+        block["step"] = [rec["step"] for rec in records]
+        for name in self.columns:
+            block[name] = [rec[name] for rec in records]
+
+    def close(self) -> None:
+        """Flush the file to disk."""
+        if self._array is not None:
+            self._array.flush()
+            self._array = None
+
+    def __enter__(self) -> "EnsembleWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def save_ensemble(
+    runs: Sequence[List[Dict[str, Any]]],
+    path: str | Path,
+    columns: Sequence[str] = STOCK_NAMES,
+) -> None:
+    """Write all ``runs`` to ``path`` in the ensemble format."""
+    steps = len(runs[0]) if runs else 0
+    with EnsembleWriter(path, len(runs), steps, columns) as writer:
+        for run_id, records in enumerate(runs):
+            writer.write(run_id, records)
+
+
+def load_ensemble(path: str | Path, mmap: bool = True) -> np.ndarray:
+    """Return the structured array stored at ``path``.
+
+    With ``mmap`` the file is memory-mapped read-only rather than read into
+    memory, so selecting a few columns or runs only touches those pages.
+    """
+    return np.load(Path(path), mmap_mode="r" if mmap else None)
+
+
+def run_matrix(data: np.ndarray, column: str) -> np.ndarray:
+    """Return ``column`` of an ensemble array as a ``(runs, steps)`` matrix."""
+    if data.shape[0] == 0:
+        return np.empty((0, 0))
+    runs = int(data["run_id"].max()) + 1
+    return np.asarray(data[column]).reshape(runs, -1)
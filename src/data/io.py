@@ -1,11 +1,35 @@
-"""Functions to load input-output tables and ecological inventories."""
+"""Functions to load input-output tables and ecological inventories.
+
+Large input-output tables can be converted once into a binary matrix cache
+with :func:`convert_io_table` and opened with :func:`open_io_matrix`.  The
+matrix is a ``float64`` array in C order stored next to the source (or in
+``cache_dir``) together with a JSON file holding its shape and labels.  It is
+memory-mapped, so selecting a few sectors or regions only reads those rows
+from disk.  The cache is rebuilt when the source file's size or modification
+time changes.
+
+Matrix tables have a header row of column labels and one row per sector,
+whose first field is the row label.  Labels of the form ``region:sector``
+can be selected by region.
+"""
 
 from __future__ import annotations
 
+import csv
+import json
+import os
 from pathlib import Path
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
 
+import numpy as np
 import pandas as pd
 
+#: Separator between region and sector in matrix labels.
+REGION_SEP = ":"
+
+#: Rows parsed before they are written to the matrix cache.
+CHUNK_ROWS = 4096
+
 
 def _read_file(path: str | Path) -> pd.DataFrame:
     path = Path(path)
@@ -22,3 +46,201 @@ def read_io_table(path: str | Path) -> pd.DataFrame:
 def read_inventory(path: str | Path) -> pd.DataFrame:
     """Return an ecological inventory located at ``path``."""
     return _read_file(path)
+
+
+def _cache_paths(path: Path, cache_dir: str | Path | None) -> Tuple[Path, Path]:
+    directory = Path(cache_dir) if cache_dir is not None else path.parent
+    stem = directory / f"{path.name}.matrix"
+    return stem, stem.with_name(stem.name + ".json")
+
+
+def _source_meta(path: Path) -> Dict[str, int]:
+    stat = path.stat()
+    return {"source_size": stat.st_size, "source_mtime_ns": stat.st_mtime_ns}
+
+
+def _csv_rows(path: Path) -> Tuple[List[str], Iterator[List[str]]]:
+    handle = open(path, newline="")
+    reader = csv.reader(handle)
+    header = next(reader, None)
+    if header is None:
+        handle.close()
+        raise ValueError(f"{path} is empty")
+
+    def rows() -> Iterator[List[str]]:
+        with handle:
+            yield from (row for row in reader if row)
+
+    return header[1:], rows()
+
+
+def _frame_rows(path: Path) -> Tuple[List[str], Iterator[List[Any]]]:
+    frame = _read_file(path)
+    label, *columns = list(frame.columns)
+    data = [list(frame[label])] + [list(frame[c]) for c in columns]
+    return [str(c) for c in columns], (list(row) for row in zip(*data))
+
+
+def convert_io_table(
+    path: str | Path,
+    cache_dir: str | Path | None = None,
+    chunk_rows: int = CHUNK_ROWS,
+) -> Path:
+    """Write the binary matrix cache of the table at ``path`` and return it.
+
+    CSV files are streamed ``chunk_rows`` rows at a time, so the table never
+    has to fit in memory; Excel files are read through :func:`read_io_table`.
+    """
+    path = Path(path)
+    matrix_path, meta_path = _cache_paths(path, cache_dir)
+    matrix_path.parent.mkdir(parents=True, exist_ok=True)
+    if path.suffix in {".xlsx", ".xls"}:
+        col_labels, rows = _frame_rows(path)
+    else:
+        col_labels, rows = _csv_rows(path)
+
+    width = len(col_labels)
+    row_labels: List[str] = []
+    buffer = np.empty((chunk_rows, width))
+    filled = 0
+    tmp = matrix_path.with_name(matrix_path.name + ".tmp")
+    with open(tmp, "wb") as out:
+        for row in rows:
+            if len(row) != width + 1:
+                raise ValueError(
+                    f"{path}: row {len(row_labels) + 1} has {len(row) - 1} "
+                    f"values, expected {width}"
+                )
+            row_labels.append(str(row[0]))
+            buffer[filled] = row[1:]
+            filled += 1
+            if filled == chunk_rows:
+                buffer.tofile(out)
+                filled = 0
+        buffer[:filled].tofile(out)
+    os.replace(tmp, matrix_path)
+
+    meta = {
+        "dtype": "float64",
+        "shape": [len(row_labels), width],
+        "row_labels": row_labels,
+        "col_labels": col_labels,
+        **_source_meta(path),
+    }
+    meta_path.write_text(json.dumps(meta), encoding="utf-8")
+    return matrix_path
+
+
+def _load_meta(path: Path, meta_path: Path) -> Dict[str, Any] | None:
+    try:
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return None
+    if meta.get("modified"):
+        return None
+    current = _source_meta(path)
+    if any(meta.get(key) != value for key, value in current.items()):
+        return None
+    return meta
+
+
+class IOMatrix:
+    """Memory-mapped input-output matrix with labelled rows and columns.
+
+    ``data`` is a read-only ``numpy.memmap`` unless the matrix was opened
+    with ``mode="c"`` or ``"r+"``; :meth:`block` copies only the requested
+    entries.
+    """
+
+    def __init__(
+        self,
+        data: np.ndarray,
+        row_labels: Sequence[str],
+        col_labels: Sequence[str],
+    ) -> None:
+        self.data = data
+        self.row_labels = list(row_labels)
+        self.col_labels = list(col_labels)
+        self._row_index = {label: i for i, label in enumerate(self.row_labels)}
+        self._col_index = {label: i for i, label in enumerate(self.col_labels)}
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.data.shape
+
+    def row_indices(self, labels: Sequence[str]) -> np.ndarray:
+        """Return the row numbers of ``labels``."""
+        return np.array([self._row_index[label] for label in labels], dtype=np.intp)
+
+    def col_indices(self, labels: Sequence[str]) -> np.ndarray:
+        """Return the column numbers of ``labels``."""
+        return np.array([self._col_index[label] for label in labels], dtype=np.intp)
+
+    def regions(self) -> List[str]:
+        """Return the regions of the row labels in order of appearance."""
+        found = (label.partition(REGION_SEP) for label in self.row_labels)
+        return list(dict.fromkeys(region for region, sep, _ in found if sep))
+
+    def region_labels(self, region: str, axis: int = 0) -> List[str]:
+        """Return the row (``axis=0``) or column labels of ``region``."""
+        labels = self.row_labels if axis == 0 else self.col_labels
+        prefix = region + REGION_SEP
+        return [label for label in labels if label.startswith(prefix)]
+
+    def block(
+        self,
+        rows: Sequence[str] | None = None,
+        cols: Sequence[str] | None = None,
+    ) -> np.ndarray:
+        """Return the submatrix of the ``rows`` and ``cols`` labels (or all)."""
+        data = self.data
+        if rows is not None:
+            data = data[self.row_indices(rows)]
+        if cols is not None:
+            data = data[:, self.col_indices(cols)]
+        return np.array(data)
+
+    def region(self, row_region: str, col_region: str | None = None) -> np.ndarray:
+        """Return the block of ``row_region`` rows and ``col_region`` columns.
+
+        ``col_region`` defaults to ``row_region``, giving its domestic block.
+        """
+        col_region = row_region if col_region is None else col_region
+        return self.block(
+            self.region_labels(row_region), self.region_labels(col_region, axis=1)
+        )
+
+    def chunks(self, chunk_rows: int = CHUNK_ROWS) -> Iterator[Tuple[int, np.ndarray]]:
+        """Yield ``(start, rows)`` views of ``chunk_rows`` consecutive rows."""
+        for start in range(0, self.shape[0], chunk_rows):
+            yield start, self.data[start : start + chunk_rows]
+
+
+def open_io_matrix(
+    path: str | Path,
+    cache_dir: str | Path | None = None,
+    mode: str = "r",
+) -> IOMatrix:
+    """Return the memory-mapped matrix of the table at ``path``.
+
+    The binary cache is built by :func:`convert_io_table` on first use and
+    whenever the source has changed.  ``mode`` is passed to ``numpy.memmap``;
+    ``"c"`` keeps changes in memory.  ``"r+"`` writes them into the cache
+    file itself, which is then marked as modified so that the next call
+    rebuilds it from the source instead of returning the edited values.
+    """
+    path = Path(path)
+    matrix_path, meta_path = _cache_paths(path, cache_dir)
+    meta = _load_meta(path, meta_path)
+    if meta is None or not matrix_path.exists():
+        convert_io_table(path, cache_dir)
+        meta = _load_meta(path, meta_path)
+    shape = tuple(meta["shape"])
+    if 0 in shape:
+        data = np.zeros(shape, dtype=meta["dtype"])
+    else:
+        data = np.memmap(matrix_path, dtype=meta["dtype"], mode=mode, shape=shape)
+        if mode in {"r+", "w+", "readwrite", "write"}:
+            meta["modified"] = True
+            meta_path.write_text(json.dumps(meta), encoding="utf-8")
+    return IOMatrix(data, meta["row_labels"], meta["col_labels"])
@@ -2,19 +2,67 @@
 
 from __future__ import annotations
 
+from pathlib import Path
 from typing import Iterable
 
+import numpy as np
 import pandas as pd
 
+from .io import CHUNK_ROWS, IOMatrix
+
 
 def normalise_per_capita(
-    data: pd.DataFrame, population: float, columns: Iterable[str] | None = None
+    data: pd.DataFrame,
+    population: float,
+    columns: Iterable[str] | None = None,
+    inplace: bool = False,
 ) -> pd.DataFrame:
-    """Return a per-capita normalised copy of ``data``."""
+    """Return a per-capita normalised copy of ``data``.
+
+    With ``inplace`` the columns of ``data`` itself are replaced and ``data``
+    is returned, avoiding a copy of the whole frame.
+    """
     if population == 0:
         raise ValueError("population must be non-zero")
 
-    df = data.copy()
+    df = data if inplace else data.copy()
     cols = list(columns) if columns is not None else df.select_dtypes("number").columns
     df[cols] = df[cols].div(population)
     return df
+
+
+def normalise_matrix(
+    matrix: np.ndarray | IOMatrix,
+    population: float | np.ndarray,
+    out: np.ndarray | str | Path | None = None,
+    chunk_rows: int = CHUNK_ROWS,
+) -> np.ndarray | IOMatrix:
+    """Divide ``matrix`` by ``population`` ``chunk_rows`` rows at a time.
+
+    ``population`` is a number or one value per column, e.g. the population
+    of each column's region.  Without ``out`` the matrix must be writable
+    and is normalised in place; for an :class:`~src.data.io.IOMatrix` open
+    it with ``mode="c"`` so the cached raw table is left untouched.  ``out``
+    may be another array or a path for a new ``.npy`` file, which is
+    memory-mapped so the result need not fit in memory either.  Returns the
+    normalised array, wrapped in an ``IOMatrix`` with the same labels when
+    an ``IOMatrix`` was passed.
+    """
+    if isinstance(matrix, IOMatrix):
+        data = normalise_matrix(matrix.data, population, out, chunk_rows)
+        return IOMatrix(data, matrix.row_labels, matrix.col_labels)
+    population = np.asarray(population, dtype=float)
+    if np.any(population == 0):
+        raise ValueError("population must be non-zero")
+    if out is None:
+        out = matrix
+    elif isinstance(out, (str, Path)):
+        out = np.lib.format.open_memmap(
+            Path(out), mode="w+", dtype=np.float64, shape=matrix.shape
+        )
+    for start in range(0, matrix.shape[0], chunk_rows):
+        stop = start + chunk_rows
+        np.divide(matrix[start:stop], population, out=out[start:stop])
+    if isinstance(out, np.memmap):
+        out.flush()
+    return out
@@ -19,7 +19,6 @@ except Exception:  # pragma: no cover - provide minimal fallback
 
 try:  # pragma: no cover - optional mesa
     from mesa import Model
-    from mesa.datacollection import DataCollector
     from mesa.time import SimultaneousActivation
 except Exception:  # pragma: no cover - mesa might be missing
 
@@ -39,31 +38,37 @@ except Exception:  # pragma: no cover - mesa might be missing
                 if hasattr(agent, "step"):
                     agent.step()
 
-    class DataCollector:  # pragma: no cover - simple stand in
-        def __init__(self, model_reporters=None, agent_reporters=None) -> None:
-            self.model_reporters = model_reporters or {}
-            self.agent_reporters = agent_reporters or {}
-            self.data = []
 
-        def collect(self, model) -> None:
-            self.data.append({k: f(model) for k, f in self.model_reporters.items()})
+from pathlib import Path
+from typing import Any, Dict, Tuple
 
-        def get_model_vars_dataframe(self):
-            import pandas as pd
-
-            if not self.data:
-                return pd.DataFrame({})
-            keys = self.data[0].keys()
-            cols = {k: [d.get(k) for d in self.data] for k in keys}
-            return pd.DataFrame(cols)
-
-
-from .agents import Firm, Household
+from .agents import Firm, Household, NeedsLedger, TaxBase
+from .checkpoint import (
+    Checkpointer,
+    agent_columns,
+    agent_objects,
+    agent_random_states,
+    random_state,
+    read_checkpoint,
+    set_agent_columns,
+    set_agent_random_states,
+    set_random_state,
+    write_checkpoint,
+)
 from .environment import BiophysicalStock
+from .instrumentation import Profiler, agent_classes, phases
+from .recording import ArrayRecorder
+from .scheduler import EventScheduler
+from .streaming import monitor_state, observe_all, restore_monitors
 
 
 class DoughnutABM(Model):
-    """Agent-based model with social floors and ecological ceilings."""
+    """Agent-based model with social floors and ecological ceilings.
+
+    With ``event_driven=True`` agents are activated by an
+    :class:`~src.scheduler.EventScheduler`, which skips idle households.
+    Setting :attr:`technologies` wakes every household.
+    """
 
     def __init__(
         self,
@@ -72,10 +77,24 @@ class DoughnutABM(Model):
         years: int = 100,
         social_floor: list[float] | None = None,
         bio_max: float | None = None,
+        profiler: Profiler | None = None,
+        monitors: Dict[str, Any] | None = None,
+        record: bool = True,
+        event_driven: bool = False,
     ) -> None:
         super().__init__()
-        self.schedule = SimultaneousActivation(self)
+        self.profiler = profiler
+        self.monitors = monitors if monitors is not None else {}
+        self.record = record
+        self.event_driven = event_driven
+        self._technologies = None
+        if event_driven:
+            self.schedule = EventScheduler(self)
+        else:
+            self.schedule = SimultaneousActivation(self)
         self.years = years
+        self.tick = 0
+        self._bio_max = bio_max
         self.social_floor = np.array(social_floor or [1.0, 1.0, 1.0, 1.0])
         limit = bio_max or 1000.0
         self.bio_stocks = {
@@ -83,22 +102,30 @@ class DoughnutABM(Model):
             "water": BiophysicalStock("water", value=10_000.0, max_boundary=10_000.0),
         }
         self.market_price = 1.0
+        self.tax_base = TaxBase()
         self.households = []
         for i in range(N_households):
             h = Household(i, self)
             self.schedule.add(h)
             self.households.append(h)
+        self.needs_ledger = NeedsLedger(self.social_floor, capacity=N_households)
+        self.needs_ledger.register_households(self.households)
         self.firms = []
         for j in range(N_firms):
             f = Firm(j + N_households, self)
             self.schedule.add(f)
             self.firms.append(f)
-        self.datacollector = DataCollector(
+        self.datacollector = ArrayRecorder(
             model_reporters={
                 "CarbonStock": lambda m: m.bio_stocks["carbon"].value,
                 "CarbonOvershoot": lambda m: m.bio_stocks["carbon"].overshoot,
                 "AvgNeedSatisfaction": lambda m: m._avg_need_satisfaction(),
+                **{
+                    f"FloorShortfall{d}": (lambda m, d=d: m.needs_ledger.shortfall[d])
+                    for d in range(len(self.social_floor))
+                },
             },
+            capacity=years if record else 0,
             agent_reporters={"Wealth": lambda a: getattr(a, "wealth", float("nan"))},
         )
 
@@ -110,15 +137,145 @@ class DoughnutABM(Model):
         stock.step(outflow=amount)
         return amount
 
+    @property
+    def technologies(self):
+        """Technologies households choose from each tick (``None`` for none)."""
+        return self._technologies
+
+    @technologies.setter
+    def technologies(self, value) -> None:
+        self._technologies = value
+        publish = getattr(self.schedule, "publish", None)
+        if publish is not None:
+            publish("technologies")
+
+    def household_wealth(self):
+        """Return the wealth of every household."""
+        return np.array([h.wealth for h in self.households])
+
     def _avg_need_satisfaction(self) -> float:
-        sats = [sum(h.needs_vector) / len(h.needs_vector) for h in self.households]
-        return sum(sats) / len(sats) if sats else 0.0
+        return self.needs_ledger.mean()
 
     def step(self) -> None:
-        self.schedule.step()
-        self.datacollector.collect(self)
+        """Advance one year; a :attr:`profiler` times each agent class."""
+        self.tick += 1
+        phase = phases(self.profiler)
+        with phase("step"):
+            with phase("schedule"):
+                with agent_classes(self.profiler, self.schedule.agents):
+                    self.schedule.step()
+                if self.event_driven:
+                    self.schedule.observe_price(self.market_price)
+            with phase("collect"):
+                if self.record:
+                    self.datacollector.collect(self)
+                observe_all(self.monitors, self)
+
+    def run(
+        self,
+        checkpoint_every: int | None = None,
+        checkpoint_path: str | Path = "checkpoint_{tick}.npz",
+    ):
+        """Run the remaining years and return the recorded series.
 
-    def run(self):
-        for _ in range(self.years):
-            self.step()
+        A model restored with :meth:`load_checkpoint` continues from the
+        saved year.  ``checkpoint_every`` and ``checkpoint_path`` behave as
+        in :meth:`BaselineModel.run <src.models.BaselineModel.run>`.
+        """
+        checkpointer = None
+        if checkpoint_every:
+            checkpointer = Checkpointer(checkpoint_path, checkpoint_every)
+        try:
+            while self.tick < self.years:
+                self.step()
+                if checkpointer is not None:
+                    checkpointer.maybe_save(self, self.tick)
+        finally:
+            if checkpointer is not None:
+                checkpointer.close()
         return self.datacollector.get_model_vars_dataframe()
+
+    def _checkpoint_state(self) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Return copies of all model state as arrays plus JSON metadata."""
+        meta: Dict[str, Any] = {
+            "model": type(self).__name__,
+            "params": {
+                "N_households": len(self.households),
+                "N_firms": len(self.firms),
+                "years": self.years,
+                "social_floor": [float(v) for v in self.social_floor],
+                "bio_max": self._bio_max,
+                "record": self.record,
+                "event_driven": self.event_driven,
+            },
+            "tick": self.tick,
+            "market_price": self.market_price,
+            "bio_stocks": {name: s.value for name, s in self.bio_stocks.items()},
+            "households": agent_objects(self.households, Household.checkpoint_objects),
+            "agent_ids": self.datacollector.agent_ids,
+            "technologies": (
+                None if self.technologies is None else list(self.technologies)
+            ),
+            "random": None,
+            "agent_random": {},
+        }
+        rng = getattr(self, "random", None)
+        if rng is not None:
+            meta["random"] = random_state(rng)
+        arrays = {
+            **agent_columns("households", self.households, Household.checkpoint_fields),
+            **agent_columns("firms", self.firms, Firm.checkpoint_fields),
+            "recorder.array": self.datacollector.array.copy(),
+            "recorder.steps": self.datacollector.steps.copy(),
+            "recorder.agent_array": self.datacollector.agent_array.copy(),
+        }
+        for name, agents in (("households", self.households), ("firms", self.firms)):
+            rng_arrays, meta["agent_random"][name] = agent_random_states(
+                name, agents, shared=rng
+            )
+            arrays.update(rng_arrays)
+        monitor_arrays, meta["monitors"] = monitor_state(self.monitors)
+        arrays.update(monitor_arrays)
+        return arrays, meta
+
+    def save_checkpoint(self, path: str | Path) -> None:
+        """Write the complete model state to ``path``."""
+        arrays, meta = self._checkpoint_state()
+        write_checkpoint(path, arrays, meta)
+
+    @classmethod
+    def load_checkpoint(
+        cls, path: str | Path, monitors: Dict[str, Any] | None = None
+    ) -> "DoughnutABM":
+        """Return a model restored from a checkpoint written by this class.
+
+        A checkpoint taken with monitors attached needs fresh ``monitors``
+        of the same names and types; their saved state is loaded into them.
+        """
+        arrays, meta = read_checkpoint(path)
+        model = cls(**meta["params"], monitors=monitors)
+        restore_monitors(model.monitors, arrays, meta.get("monitors", {}))
+        model.tick = meta["tick"]
+        model.market_price = meta["market_price"]
+        for name, value in meta["bio_stocks"].items():
+            model.bio_stocks[name].value = value
+        set_agent_columns("households", model.households, arrays)
+        set_agent_columns("firms", model.firms, arrays)
+        for attr, values in meta["households"].items():
+            for agent, value in zip(model.households, values):
+                setattr(agent, attr, value)
+        if meta["random"] is not None and hasattr(model, "random"):
+            set_random_state(model.random, meta["random"])
+        for name, agents in (("households", model.households), ("firms", model.firms)):
+            set_agent_random_states(name, agents, arrays, meta["agent_random"][name])
+        if meta["technologies"] is not None:
+            model.technologies = meta["technologies"]
+        model.datacollector.load(
+            arrays["recorder.array"],
+            arrays["recorder.steps"],
+            arrays["recorder.agent_array"],
+            meta["agent_ids"],
+        )
+        if model.record:
+            model.datacollector.reserve(model.years - model.tick)
+        return model
@@ -0,0 +1,213 @@
+"""Opt-in per-phase timing instrumentation.
+
+Models accept an optional :class:`Profiler`.  When one is attached, each tick
+is split into named phases (agent steps per agent class, stock integration,
+price adjustment, recording) and the wall time and net number of allocated
+memory blocks of every phase are aggregated into log2 histograms.  Models
+open their phases through :func:`phases`, which without a profiler returns a
+no-op context, so the same step code runs with and without instrumentation.
+
+Phase names are nested with ``;`` (e.g. ``step;agents;Household``), which is
+also the separator of the folded-stack format read by flamegraph tools.
+:class:`LookupStats` counts the hits and misses of in-memory caches.
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Any, Callable, ContextManager, Dict, Iterable, Iterator, List
+
+
+def _no_blocks() -> int:
+    return 0
+
+
+_NO_PHASE = nullcontext()
+
+
+def _no_phase(name: str) -> ContextManager[None]:
+    return _NO_PHASE
+
+
+def phases(profiler: "Profiler | None") -> Callable[[str], ContextManager[None]]:
+    """Return ``profiler.phase``, or a no-op of the same signature for ``None``."""
+    return _no_phase if profiler is None else profiler.phase
+
+
+def agent_classes(
+    profiler: "Profiler | None", agents: Iterable[Any]
+) -> ContextManager[None]:
+    """Return :meth:`Profiler.agent_classes`, or a no-op for ``None``."""
+    return _NO_PHASE if profiler is None else profiler.agent_classes(agents)
+
+
+class PhaseStats:
+    """Aggregated timings of one phase."""
+
+    __slots__ = ("count", "total_ns", "min_ns", "max_ns", "blocks", "histogram")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns = 0
+        self.max_ns = 0
+        self.blocks = 0
+        self.histogram: Dict[int, int] = {}
+
+    def add(self, elapsed_ns: int, blocks: int) -> None:
+        if self.count == 0 or elapsed_ns < self.min_ns:
+            self.min_ns = elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+        self.count += 1
+        self.total_ns += elapsed_ns
+        self.blocks += blocks
+        bucket = 1 << max(0, elapsed_ns.bit_length() - 1)
+        self.histogram[bucket] = self.histogram.get(bucket, 0) + 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "total_ns": self.total_ns,
+            "mean_ns": self.total_ns / self.count if self.count else 0.0,
+            "min_ns": self.min_ns,
+            "max_ns": self.max_ns,
+            "allocated_blocks": self.blocks,
+            # Keys are the lower bound of each power-of-two bucket in ns.
+            "histogram_ns": {str(k): v for k, v in sorted(self.histogram.items())},
+        }
+
+
+def _timed(func: Callable[[], Any], total: List[int]) -> Callable[[], Any]:
+    def timed() -> Any:
+        start = time.perf_counter_ns()
+        try:
+            return func()
+        finally:
+            total[0] += time.perf_counter_ns() - start
+
+    return timed
+
+
+class LookupStats:
+    """Hit, miss, store and eviction counters of an in-memory cache."""
+
+    __slots__ = ("hits", "misses", "stores", "evictions")
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "hit_rate": self.hit_rate,
+        }
+
+
+class Profiler:
+    """Collect wall time and allocation counts per named phase.
+
+    Allocation counts are the change in :func:`sys.getallocatedblocks` over a
+    phase, i.e. the net number of memory blocks the phase left allocated.
+    That call walks the allocator's arenas and gets slower as the heap grows,
+    so pass ``track_allocations=False`` to time very large models.
+    """
+
+    def __init__(self, track_allocations: bool = True) -> None:
+        self.phases: Dict[str, PhaseStats] = {}
+        self._stack: List[str] = []
+        self._blocks = sys.getallocatedblocks if track_allocations else _no_blocks
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as ``name`` nested in the current phase."""
+        self._stack.append(name)
+        key = ";".join(self._stack)
+        blocks = self._blocks()
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter_ns() - start
+            self._stack.pop()
+            self.record(key, elapsed, self._blocks() - blocks)
+
+    @contextmanager
+    def agent_classes(
+        self, agents: Iterable[Any], method: str = "step"
+    ) -> Iterator[None]:
+        """Time ``method`` of ``agents`` per agent class within the block.
+
+        For code that steps agents it does not control, such as a scheduler:
+        each agent's ``method`` is shadowed by a timing wrapper until the
+        block ends, and the summed wall time of every class is then recorded
+        once as a phase nested in the current one.  Allocations are left to
+        the enclosing phase, since counting them per call is too slow.
+        """
+        prefix = "".join(f"{name};" for name in self._stack)
+        totals: Dict[str, List[int]] = {}
+        wrapped = []
+        for agent in agents:
+            bound = getattr(agent, method, None)
+            if bound is None:
+                continue
+            total = totals.setdefault(type(agent).__name__, [0])
+            setattr(agent, method, _timed(bound, total))
+            wrapped.append(agent)
+        try:
+            yield
+        finally:
+            for agent in wrapped:
+                delattr(agent, method)
+            for name, (elapsed,) in totals.items():
+                self.record(prefix + name, elapsed)
+
+    def record(self, key: str, elapsed_ns: int, blocks: int = 0) -> None:
+        """Add one measurement for the phase ``key``."""
+        stats = self.phases.get(key)
+        if stats is None:
+            stats = self.phases[key] = PhaseStats()
+        stats.add(elapsed_ns, blocks)
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Return the aggregated statistics of every phase."""
+        return {key: stats.to_dict() for key, stats in sorted(self.phases.items())}
+
+    def to_json(self, path: str | Path | None = None) -> str:
+        """Return (and optionally write) the summary as JSON."""
+        text = json.dumps(self.summary(), indent=2)
+        if path is not None:
+            Path(path).write_text(text + "\n", encoding="utf-8")
+        return text
+
+    def to_folded(self, path: str | Path | None = None) -> str:
+        """Return (and optionally write) folded stacks in microseconds.
+
+        Each line is ``parent;child self_time`` where self time excludes
+        nested phases, the input format of ``flamegraph.pl`` and speedscope.
+        """
+        self_ns = {key: stats.total_ns for key, stats in self.phases.items()}
+        for key, stats in self.phases.items():
+            parent = key.rpartition(";")[0]
+            if parent in self_ns:
+                self_ns[parent] -= stats.total_ns
+        lines = [f"{key} {max(0, ns) // 1000}" for key, ns in sorted(self_ns.items())]
+        text = "\n".join(lines)
+        if path is not None:
+            Path(path).write_text(text + "\n", encoding="utf-8")
+        return text
@@ -1,5 +1,18 @@
 """Market components used in the vector money simulation."""
 
-from .market import Market
+from typing import TYPE_CHECKING
 
-__all__ = ["Market"]
+from .._lazy import attach
+
+if TYPE_CHECKING:  # pragma: no cover - imports for type checkers only
+    from .market import Market
+
+_EXPORTS = {
+    "Market": ".market",
+}
+
+__all__ = [
+    "Market",
+]
+
+__getattr__, __dir__ = attach(globals(), _EXPORTS)
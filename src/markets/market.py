@@ -1,10 +1,19 @@
-"""Market module for resource trading."""
+"""Market module for resource trading.
+
+Trades can be executed one at a time with :meth:`Market.buy` and
+:meth:`Market.sell`, which adjust prices after every trade, or queued with
+:meth:`Market.submit_orders` and settled together by :meth:`Market.clear`.
+"""
 
 from __future__ import annotations
 
-from typing import Dict
+from typing import Any, Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from ..biophysics import STOCK_NAMES, BioPhysicalStocks
 
-from ..biophysics import BioPhysicalStocks
+_RESOURCE_INDEX = {name: i for i, name in enumerate(STOCK_NAMES)}
 
 
 class Market:
@@ -16,6 +25,7 @@ class Market:
         base_prices: Dict[str, float] | None = None,
         ecological_limits: Dict[str, float] | None = None,
         price_sensitivity: float = 0.5,
+        per_trade: bool = False,
     ) -> None:
         self.stocks = stocks
         self.prices: Dict[str, float] = base_prices or {
@@ -31,6 +41,8 @@ class Market:
             "minerals": 1.0,
         }
         self.price_sensitivity = price_sensitivity
+        self.per_trade = per_trade
+        self._orders: List[Tuple[Any, str, float]] = []
 
     def adjust_prices(self) -> None:
         """Update prices based on current stock levels."""
@@ -58,3 +70,47 @@ class Market:
             agent.wealth += revenue
         getattr(self.stocks, resource).apply(quantity)
         self.adjust_prices()
+
+    def submit_order(self, agent, resource: str, quantity: float) -> None:
+        """Queue an order; positive ``quantity`` buys, negative sells."""
+        if resource not in _RESOURCE_INDEX:
+            raise ValueError(f"unknown resource: {resource!r}")
+        self._orders.append((agent, resource, quantity))
+
+    def submit_orders(self, orders: Iterable[Tuple[Any, str, float]]) -> None:
+        """Queue ``(agent, resource, quantity)`` orders for the next :meth:`clear`."""
+        for agent, resource, quantity in orders:
+            self.submit_order(agent, resource, quantity)
+
+    def clear(self) -> None:
+        """Settle all queued orders.
+
+        All orders are priced at the current prices, the net quantity of each
+        resource is applied to the stocks at once and prices are adjusted a
+        single time.  With ``per_trade`` the orders are instead replayed
+        through :meth:`buy` and :meth:`sell`, re-pricing after every trade.
+        """
+        orders, self._orders = self._orders, []
+        if not orders:
+            return
+        if self.per_trade:
+            for agent, resource, quantity in orders:
+                if quantity >= 0:
+                    self.buy(agent, resource, quantity)
+                else:
+                    self.sell(agent, resource, -quantity)
+            return
+
+        agents, resources, quantities = zip(*orders)
+        index = np.fromiter(
+            (_RESOURCE_INDEX[r] for r in resources), dtype=np.intp, count=len(orders)
+        )
+        quantity = np.asarray(quantities, dtype=float)
+        prices = np.array([self.prices.get(name, 0.0) for name in STOCK_NAMES])
+        costs = prices[index] * quantity
+        for agent, cost in zip(agents, costs.tolist()):
+            if hasattr(agent, "wealth"):
+                agent.wealth -= cost
+        net = np.bincount(index, weights=quantity, minlength=len(STOCK_NAMES))
+        self.stocks.apply(-net)
+        self.adjust_prices()
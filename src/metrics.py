@@ -1,8 +1,19 @@
-"""Simulation metrics utilities."""
+"""Simulation metrics utilities.
+
+The scalar functions take a single series.  The ``ensemble_*`` functions take
+a ``(runs, steps)`` matrix, for example from
+:func:`src.data.run_matrix`, (or a ``(runs, agents)`` wealth matrix for the
+Gini coefficient) and return one value per run, matching the scalar functions
+applied to each row.  NumPy is only imported by the ``ensemble_*``
+functions, so the scalar metrics stay cheap to import in worker processes.
+"""
 
 from __future__ import annotations
 
-from typing import Dict, Iterable, Sequence
+from typing import TYPE_CHECKING, Dict, Iterable, Sequence
+
+if TYPE_CHECKING:  # pragma: no cover
+    import numpy as np
 
 
 def overshoot_depth(series: Sequence[float], limit: float) -> float:
@@ -60,3 +71,86 @@ def return_time_to_boundaries(
             if inside(value):
                 return steps
     return steps if crossed else 0
+
+
+def _as_matrix(values) -> np.ndarray:
+    import numpy as np
+
+    matrix = np.asarray(values, dtype=float)
+    if matrix.ndim != 2:
+        raise ValueError(f"expected a (runs, steps) matrix, got shape {matrix.shape}")
+    return matrix
+
+
+def ensemble_overshoot_depth(matrix, limit: float) -> np.ndarray:
+    """Return :func:`overshoot_depth` of every row of ``matrix``."""
+    import numpy as np
+
+    matrix = _as_matrix(matrix)
+    if matrix.shape[1] == 0:
+        return np.zeros(matrix.shape[0])
+    return np.maximum(0.0, (limit - matrix).max(axis=1))
+
+
+def ensemble_inequality_index(wealth) -> np.ndarray:
+    """Return the Gini coefficient of every row of a ``(runs, agents)`` matrix.
+
+    Agrees with :func:`inequality_index` up to floating point rounding.
+    """
+    import numpy as np
+
+    wealth = _as_matrix(wealth)
+    runs, n = wealth.shape
+    if n == 0:
+        return np.zeros(runs)
+    ordered = np.sort(wealth, axis=1)
+    weights = 2.0 * np.arange(1, n + 1) - n - 1
+    cumulative = ordered @ weights
+    mean = ordered.sum(axis=1) / n
+    gini = np.zeros(runs)
+    nonzero = mean != 0
+    gini[nonzero] = cumulative[nonzero] / (n**2 * mean[nonzero])
+    return gini
+
+
+def ensemble_welfare_indices(matrix) -> Dict[str, np.ndarray]:
+    """Return :func:`welfare_indices` of every row of ``matrix`` as arrays."""
+    import numpy as np
+
+    matrix = _as_matrix(matrix)
+    runs, n = matrix.shape
+    if n == 0:
+        zeros = np.zeros(runs)
+        return {"utilitarian": zeros, "average": zeros.copy(), "rawlsian": zeros.copy()}
+    utilitarian = matrix.sum(axis=1)
+    return {
+        "utilitarian": utilitarian,
+        "average": utilitarian / n,
+        "rawlsian": matrix.min(axis=1),
+    }
+
+
+def ensemble_return_time_to_boundaries(
+    matrix, lower: float, upper: float
+) -> np.ndarray:
+    """Return :func:`return_time_to_boundaries` of every row of ``matrix``.
+
+    Rows that never leave ``[lower, upper]`` give 0; rows that leave and do
+    not return give the number of steps after the first exit.
+    """
+    import numpy as np
+
+    matrix = _as_matrix(matrix)
+    runs, n = matrix.shape
+    if n == 0:
+        return np.zeros(runs, dtype=int)
+    inside = (matrix >= lower) & (matrix <= upper)
+    outside = ~inside
+    exited = outside.any(axis=1)
+    first_exit = outside.argmax(axis=1)
+    after_exit = np.arange(n) > first_exit[:, None]
+    back = inside & after_exit
+    returned = back.any(axis=1)
+    first_return = back.argmax(axis=1)
+    steps = np.where(returned, first_return - first_exit, n - 1 - first_exit)
+    return np.where(exited, steps, 0)
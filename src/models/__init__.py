@@ -1,5 +1,21 @@
 """Simulation models used to orchestrate agents and resource flows."""
 
-from .baseline import BaselineModel
+from typing import TYPE_CHECKING
 
-__all__ = ["BaselineModel"]
+from .._lazy import attach
+
+if TYPE_CHECKING:  # pragma: no cover - imports for type checkers only
+    from .baseline import BaselineModel
+    from .batched import BatchedBaselineModel
+
+_EXPORTS = {
+    "BaselineModel": ".baseline",
+    "BatchedBaselineModel": ".batched",
+}
+
+__all__ = [
+    "BaselineModel",
+    "BatchedBaselineModel",
+]
+
+__getattr__, __dir__ = attach(globals(), _EXPORTS)
@@ -4,16 +4,58 @@ This model approximates late 20th century economic dynamics using the
 agent classes defined in this package.  It orchestrates households,
 firms, government and a financial intermediary interacting through a
 resource market.
+
+Setting ``vectorized=True`` stores households and firms in a
+:class:`~src.agents.population.HouseholdPopulation` and
+:class:`~src.agents.population.FirmPopulation` instead of individual agent
+objects, which is much faster for large populations.
+
+:meth:`BaselineModel.save_checkpoint` and
+:meth:`BaselineModel.load_checkpoint` snapshot and restore the full model
+state; :meth:`BaselineModel.run` can also take snapshots every ``K`` ticks.
+
+``production`` links firms through an input-output table: after firms
+produce, a :class:`~src.production.ProductionNetwork` scales their output to
+the gross output needed to also supply each other's inputs.
+
+``monitors`` maps names to accumulators from :mod:`src.streaming`, which are
+updated after every tick of :meth:`BaselineModel.run`.
 """
 
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Dict, List
+from itertools import groupby
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
 
-from ..agents import FinancialIntermediary, Firm, Government, Household
-from ..biophysics import BioPhysicalStocks
+from ..agents import (
+    FinancialIntermediary,
+    Firm,
+    FirmPopulation,
+    Government,
+    Household,
+    HouseholdPopulation,
+    TaxBase,
+)
+from ..biophysics import BioPhysicalStocks, LinearFlow
+from ..checkpoint import (
+    Checkpointer,
+    agent_columns,
+    agent_objects,
+    agent_random_states,
+    read_checkpoint,
+    set_agent_columns,
+    set_agent_random_states,
+    write_checkpoint,
+)
+from ..instrumentation import Profiler, phases
 from ..markets import Market
+from ..production import ProductionNetwork
+from ..recording import STOCK_REPORTERS, ArrayRecorder
+from ..streaming import monitor_state, observe_all, restore_monitors
 
 
 @dataclass
@@ -26,44 +68,275 @@ class BaselineModel:
     has_bank: bool = True
     initial_stocks: Dict[str, float] | None = None
     price_sensitivity: float = 0.5
+    vectorized: bool = False
+    tax_debug: bool = False
+    profiler: Profiler | None = None
+    production: ProductionNetwork | None = None
+    monitors: Dict[str, Any] = field(default_factory=dict)
 
     stocks: BioPhysicalStocks = field(init=False)
     market: Market = field(init=False)
+    tax_base: TaxBase = field(init=False)
     agents: List[object] = field(init=False, default_factory=list)
+    household_population: HouseholdPopulation | None = field(
+        init=False, default=None
+    )
+    firm_population: FirmPopulation | None = field(init=False, default=None)
+    recorder: ArrayRecorder | None = field(init=False, default=None)
+    tick: int = field(init=False, default=0)
+    firm_sectors: np.ndarray = field(
+        init=False, repr=False, default_factory=lambda: np.zeros(0, dtype=int)
+    )
 
     def __post_init__(self) -> None:
         self.stocks = BioPhysicalStocks(**(self.initial_stocks or {}))
         self.market = Market(self.stocks, price_sensitivity=self.price_sensitivity)
+        self.tax_base = TaxBase(debug=self.tax_debug)
         self.agents = []
-        for i in range(self.households):
-            self.agents.append(Household(i, model=self))
-        offset = self.households
-        for j in range(self.firms):
-            self.agents.append(Firm(offset + j, model=self))
+        if self.vectorized:
+            self.household_population = HouseholdPopulation(self.households, model=self)
+            self.firm_population = FirmPopulation(
+                self.firms, model=self, id_offset=self.households
+            )
+        else:
+            for i in range(self.households):
+                self.agents.append(Household(i, model=self))
+            offset = self.households
+            for j in range(self.firms):
+                self.agents.append(Firm(offset + j, model=self))
         if self.has_government:
             self.agents.append(Government("gov", model=self))
         if self.has_bank:
             self.agents.append(FinancialIntermediary("bank", model=self))
 
+    def household_wealth(self) -> np.ndarray:
+        """Return the wealth of every household."""
+        if self.household_population is not None:
+            return self.household_population.wealth
+        return np.array([a.wealth for a in self.agents if isinstance(a, Household)])
+
+    @property
+    def populations(self) -> List[object]:
+        """Return the vectorised agent populations used by this model."""
+        return [
+            pop
+            for pop in (self.household_population, self.firm_population)
+            if pop is not None
+        ]
+
     def step(self) -> None:
-        """Advance the model by one time step."""
-        for agent in self.agents:
-            agent.step()
-        self.stocks.step()
-        self.market.adjust_prices()
-
-    def run(self, steps: int) -> List[Dict[str, float]]:
-        """Run the simulation for ``steps`` and return recorded series."""
-        records: List[Dict[str, float]] = []
-        for idx in range(steps):
-            self.step()
-            records.append(
-                {
-                    "step": idx,
-                    "carbon_budget": self.stocks.carbon_budget.value,
-                    "water": self.stocks.water.value,
-                    "biomass": self.stocks.biomass.value,
-                    "minerals": self.stocks.minerals.value,
-                }
+        """Advance the model by one time step.
+
+        With a :attr:`profiler` each phase and agent class is timed.
+        """
+        phase = phases(self.profiler)
+        with phase("step"):
+            with phase("populations"):
+                for population in self.populations:
+                    with phase(type(population).__name__):
+                        population.step()
+            if self.production is not None and self.firm_population is not None:
+                with phase("production"):
+                    self._produce()
+            with phase("agents"):
+                for cls, group in groupby(self.agents, key=type):
+                    with phase(cls.__name__):
+                        for agent in group:
+                            agent.step()
+                    if cls is Firm and self.production is not None:
+                        with phase("production"):
+                            self._produce()
+            with phase("stocks"):
+                self.stocks.step()
+            with phase("market"):
+                self.market.adjust_prices()
+        self.tick += 1
+
+    def _produce(self) -> None:
+        """Scale this tick's firm output by the IO network's multipliers.
+
+        Firms are assigned to sectors round robin unless :attr:`firm_sectors`
+        already holds one sector index per firm.
+        """
+        population = self.firm_population
+        if population is not None:
+            firms = None
+            output = population.output
+        else:
+            firms = [agent for agent in self.agents if isinstance(agent, Firm)]
+            output = np.array([firm.output for firm in firms])
+        if len(self.firm_sectors) != len(output):
+            self.firm_sectors = self.production.assign_sectors(len(output))
+        factors = self.production.multipliers(output, self.firm_sectors)
+        if firms is None:
+            population.scale_output(factors)
+        else:
+            for firm, factor in zip(firms, factors.tolist()):
+                firm.scale_output(factor)
+
+    def run(
+        self,
+        steps: int,
+        checkpoint_every: int | None = None,
+        checkpoint_path: str | Path = "checkpoint_{tick}.npz",
+        record: bool = True,
+    ) -> List[Dict[str, float]]:
+        """Run the simulation for ``steps`` and return this call's records.
+
+        The series are kept in :attr:`recorder` as a preallocated array and
+        the return value is the list-of-dicts view of the rows added by this
+        call.  Repeated calls (or a run restored from a checkpoint) continue
+        the same series; ``recorder.to_records()`` returns all of it.  With
+        ``checkpoint_every`` a snapshot is written to ``checkpoint_path``
+        every that many ticks; ``{tick}`` in the path is replaced by the tick.
+        ``record=False`` skips the per-step series, leaving only
+        :attr:`monitors` updated.
+        """
+        if self.recorder is None:
+            self.recorder = ArrayRecorder(
+                STOCK_REPORTERS, capacity=steps if record else 0, index="step"
             )
-        return records
+        elif record:
+            self.recorder.reserve(steps)
+        start = len(self.recorder)
+        checkpointer = None
+        if checkpoint_every:
+            checkpointer = Checkpointer(checkpoint_path, checkpoint_every)
+        try:
+            phase = phases(self.profiler)
+            for _ in range(steps):
+                self.step()
+                with phase("record"):
+                    if record:
+                        self.recorder.collect(self, step=self.tick - 1)
+                    observe_all(self.monitors, self)
+                if checkpointer is not None:
+                    checkpointer.maybe_save(self, self.tick)
+        finally:
+            if checkpointer is not None:
+                checkpointer.close()
+        return self.recorder.to_records(start)
+
+    def _agent_groups(self) -> Dict[str, List[Any]]:
+        groups: Dict[str, List[Any]] = {}
+        for agent in self.agents:
+            groups.setdefault(type(agent).__name__, []).append(agent)
+        return groups
+
+    def _checkpoint_state(self) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+        """Return copies of all model state as arrays plus JSON metadata."""
+        meta: Dict[str, Any] = {
+            "model": type(self).__name__,
+            "params": {
+                "households": self.households,
+                "firms": self.firms,
+                "has_government": self.has_government,
+                "has_bank": self.has_bank,
+                "initial_stocks": self.initial_stocks,
+                "price_sensitivity": self.price_sensitivity,
+                "vectorized": self.vectorized,
+                "tax_debug": self.tax_debug,
+            },
+            "tick": self.tick,
+            "flows": [
+                [stock.flow.rate, stock.flow.coefficient] if stock.is_linear else None
+                for stock in self.stocks.stocks()
+            ],
+            "prices": dict(self.market.prices),
+            "ecological_limits": dict(self.market.ecological_limits),
+            "per_trade": self.market.per_trade,
+            "orders": self._order_state(),
+            "technologies": self._technology_state(),
+            "agents": {},
+            "agent_random": {},
+            "populations": {},
+        }
+        arrays: Dict[str, np.ndarray] = {"stocks.state": self.stocks.state.copy()}
+        for name, agents in self._agent_groups().items():
+            arrays.update(agent_columns(name, agents, agents[0].checkpoint_fields))
+            meta["agents"][name] = agent_objects(agents, agents[0].checkpoint_objects)
+            rng_arrays, meta["agent_random"][name] = agent_random_states(name, agents)
+            arrays.update(rng_arrays)
+        for population in self.populations:
+            name = type(population).__name__
+            pop_arrays, meta["populations"][name] = population.checkpoint_state(name)
+            arrays.update(pop_arrays)
+        if self.recorder is not None:
+            arrays["recorder.array"] = self.recorder.array.copy()
+            arrays["recorder.steps"] = self.recorder.steps.copy()
+        monitor_arrays, meta["monitors"] = monitor_state(self.monitors)
+        arrays.update(monitor_arrays)
+        return arrays, meta
+
+    def _technology_state(self) -> List[Any] | None:
+        technologies = getattr(self, "technologies", None)
+        return None if technologies is None else list(technologies)
+
+    def _order_state(self) -> List[List[Any]]:
+        # Pending market orders by the position of their agent in ``agents``.
+        position = {id(agent): i for i, agent in enumerate(self.agents)}
+        orders = []
+        for agent, resource, quantity in self.market._orders:
+            if id(agent) not in position:
+                raise ValueError(
+                    "pending market orders of agents outside the model cannot "
+                    "be checkpointed"
+                )
+            orders.append([position[id(agent)], resource, quantity])
+        return orders
+
+    def save_checkpoint(self, path: str | Path) -> None:
+        """Write the model state to ``path``.
+
+        This covers stocks, agents (with their own random generators) and
+        populations, market prices, limits, ``per_trade`` and pending orders,
+        the model's ``technologies`` (which must be JSON-serialisable) and the
+        recorded series.  Stock flows are
+        saved when they are :class:`LinearFlow` instances; other callables,
+        the ``production`` network and the ``profiler`` must be set again
+        after loading.  Of the :attr:`monitors` only the accumulated state
+        is saved, since their ``source`` callables cannot be.  Pending orders
+        must come from agents in :attr:`agents`.
+        """
+        arrays, meta = self._checkpoint_state()
+        write_checkpoint(path, arrays, meta)
+
+    @classmethod
+    def load_checkpoint(
+        cls, path: str | Path, monitors: Dict[str, Any] | None = None
+    ) -> "BaselineModel":
+        """Return a model restored from a checkpoint written by this class.
+
+        A checkpoint taken with monitors attached needs fresh ``monitors``
+        of the same names and types; their saved state is loaded into them.
+        """
+        arrays, meta = read_checkpoint(path)
+        model = cls(**meta["params"], monitors=monitors or {})
+        restore_monitors(model.monitors, arrays, meta.get("monitors", {}))
+        model.tick = meta["tick"]
+        model.stocks.state = arrays["stocks.state"]
+        for stock, flow in zip(model.stocks.stocks(), meta["flows"]):
+            if flow is not None:
+                stock.set_flow(LinearFlow(*flow))
+        model.market.prices = meta["prices"]
+        model.market.ecological_limits = meta["ecological_limits"]
+        model.market.per_trade = meta["per_trade"]
+        model.market.submit_orders(
+            (model.agents[i], resource, quantity)
+            for i, resource, quantity in meta["orders"]
+        )
+        if meta["technologies"] is not None:
+            model.technologies = meta["technologies"]
+        for name, agents in model._agent_groups().items():
+            set_agent_columns(name, agents, arrays)
+            for attr, values in meta["agents"][name].items():
+                for agent, value in zip(agents, values):
+                    setattr(agent, attr, value)
+            set_agent_random_states(name, agents, arrays, meta["agent_random"][name])
+        for population in model.populations:
+            name = type(population).__name__
+            population.restore_checkpoint(name, arrays, meta["populations"][name])
+        if "recorder.array" in arrays:
+            model.recorder = ArrayRecorder(STOCK_REPORTERS, index="step")
+            model.recorder.load(arrays["recorder.array"], arrays["recorder.steps"])
+        return model
@@ -0,0 +1,240 @@
+"""Many independent baseline models advanced together.
+
+:class:`BatchedBaselineModel` holds the state of ``M`` per-agent
+:class:`~src.models.baseline.BaselineModel` scenarios in ``(M, ...)``
+arrays: stocks, flows, prices and ecological limits are ``(M, 4)`` and the
+agents of each kind are ``(M, K)`` (or ``(M, K, 4)`` for resource rates),
+padded with zeros for scenarios with fewer than ``K`` agents of that kind.
+A tick is a few array operations per agent slot instead of a Python loop
+over every agent of every model.
+
+Agents draw on the stocks in the same order as in :meth:`BaselineModel.step`
+(one slot at a time) and padded slots subtract zero, so every scenario's
+records are bit-identical to running its model on its own.  Without
+``technologies`` the baseline dynamics draw no random numbers, so results
+depend neither on seeds nor on which scenarios share a batch.  Models with
+``technologies`` (whose households draw a random choice every tick) or
+``monitors`` are rejected rather than silently run without them.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+
+from ..agents import FinancialIntermediary, Firm, Government, Household
+from ..biophysics.stocks import STOCK_NAMES
+from ..recording import STOCK_REPORTERS, ArrayRecorder
+from .baseline import BaselineModel
+
+_RATES = ("carbon_rate", "water_rate", "biomass_rate", "mineral_rate")
+_PROGRAMS = (
+    "carbon_capture",
+    "water_supply",
+    "biomass_program",
+    "mineral_program",
+)
+#: Agent kinds in the order :class:`BaselineModel` creates and steps them.
+_ORDER = (Household, Firm, Government, FinancialIntermediary)
+
+
+def _slots(groups: List[List[Any]], fields: Sequence[str]) -> Dict[str, np.ndarray]:
+    """Return ``fields`` of per-scenario agent lists as zero-padded ``(M, K)``."""
+    width = max((len(g) for g in groups), default=0)
+    arrays = {name: np.zeros((len(groups), width)) for name in fields}
+    for m, agents in enumerate(groups):
+        for name in fields:
+            arrays[name][m, : len(agents)] = [getattr(a, name) for a in agents]
+    return arrays
+
+
+def _vector(arrays: Dict[str, np.ndarray], fields: Sequence[str]) -> np.ndarray:
+    """Stack per-resource ``(M, K)`` columns into an ``(M, K, 4)`` array."""
+    return np.stack([arrays.pop(name) for name in fields], axis=-1)
+
+
+class BatchedBaselineModel:
+    """Advance ``M`` per-agent :class:`BaselineModel` scenarios at once.
+
+    ``models`` must be freshly built or all at the same ``tick``, use
+    per-agent (not vectorised) populations and :class:`LinearFlow` stock
+    flows, and have no ``technologies`` or ``monitors``.  Use :meth:`from_scenarios` to build them from keyword arguments.
+    """
+
+    def __init__(self, models: Sequence[BaselineModel]) -> None:
+        models = list(models)
+        for model in models:
+            if model.vectorized:
+                raise ValueError("batched models must use per-agent populations")
+            if model.production is not None:
+                raise ValueError("batched models do not support a production network")
+            if not all(stock.is_linear for stock in model.stocks.stocks()):
+                raise ValueError("batched models require LinearFlow stock flows")
+            if getattr(model, "technologies", None):
+                raise ValueError(
+                    "batched models do not support technologies, whose choices "
+                    "are random; run these models separately"
+                )
+            if model.monitors:
+                raise ValueError(
+                    "batched models do not update monitors; run these models "
+                    "separately"
+                )
+        ticks = {model.tick for model in models}
+        if len(ticks) > 1:
+            raise ValueError("batched models must be at the same tick")
+        self.size = len(models)
+        self.tick = ticks.pop() if ticks else 0
+        self.seeds: List[int | None] = [None] * self.size
+
+        width = len(STOCK_NAMES)
+        self.state = np.array([m.stocks.state for m in models]).reshape(-1, width)
+        flows = [[s.flow for s in m.stocks.stocks()] for m in models]
+        self.flow_rates = np.array(
+            [[f.rate for f in row] for row in flows]
+        ).reshape(-1, width)
+        self.flow_coefficients = np.array(
+            [[f.coefficient for f in row] for row in flows]
+        ).reshape(-1, width)
+        self.prices = np.array(
+            [[m.market.prices[name] for name in STOCK_NAMES] for m in models]
+        ).reshape(-1, width)
+        # A missing or non-positive limit leaves that price unchanged.
+        self.limits = np.array(
+            [
+                [m.market.ecological_limits.get(name, 0.0) for name in STOCK_NAMES]
+                for m in models
+            ]
+        ).reshape(-1, width)
+        self.price_sensitivity = np.array(
+            [m.market.price_sensitivity for m in models], dtype=float
+        )[:, None]
+
+        groups = self._group(models)
+        households = _slots(groups[Household], ("income", "wealth") + _RATES)
+        self.household_rates = _vector(households, _RATES)
+        self.income = households["income"]
+        self.wealth = households["wealth"]
+
+        firms = _slots(groups[Firm], ("capital", "productivity", "output") + _RATES)
+        self.firm_rates = _vector(firms, _RATES)
+        self.capital = firms["capital"]
+        self.productivity = firms["productivity"]
+        self.output = firms["output"]
+
+        gov = _slots(groups[Government], ("tax_rate", "revenue") + _PROGRAMS)
+        self.programs = _vector(gov, _PROGRAMS)
+        self.tax_rate = gov["tax_rate"]
+        self.revenue = gov["revenue"]
+
+        bank_fields = ("deposits", "loans", "interest_rate") + _RATES
+        banks = _slots(groups[FinancialIntermediary], bank_fields)
+        self.bank_rates = _vector(banks, _RATES)
+        self.deposits = banks["deposits"]
+        self.loans = banks["loans"]
+        self.interest_rate = banks["interest_rate"]
+
+        self._taxable = np.zeros(self.size)
+        self._refresh_taxable()
+        self._history = np.zeros((0, self.size, len(STOCK_NAMES)))
+        self._steps: List[int] = []
+
+    @classmethod
+    def from_scenarios(
+        cls, scenarios: Sequence[Dict[str, Any]]
+    ) -> "BatchedBaselineModel":
+        """Build the batch from ``BaselineModel`` keyword arguments.
+
+        A scenario may also give its ``seed``; it is kept in :attr:`seeds`
+        (``None`` where absent) to label the results, which do not depend
+        on it.
+        """
+        seeds = [params.get("seed") for params in scenarios]
+        batch = cls(
+            [
+                BaselineModel(**{k: v for k, v in params.items() if k != "seed"})
+                for params in scenarios
+            ]
+        )
+        batch.seeds = seeds
+        return batch
+
+    @staticmethod
+    def _group(models: Sequence[BaselineModel]) -> Dict[type, List[List[Any]]]:
+        groups: Dict[type, List[List[Any]]] = {kind: [] for kind in _ORDER}
+        for model in models:
+            rank = [_ORDER.index(type(agent)) for agent in model.agents]
+            if rank != sorted(rank):
+                raise ValueError(
+                    "agents must be ordered households, firms, government, bank"
+                )
+            for kind in _ORDER:
+                groups[kind].append([a for a in model.agents if type(a) is kind])
+        return groups
+
+    def _refresh_taxable(self) -> None:
+        # Matches TaxBase.total, the exactly rounded sum of incomes and outputs.
+        for m in range(self.size):
+            self._taxable[m] = math.fsum(
+                self.income[m].tolist() + self.output[m].tolist()
+            )
+
+    def step(self) -> None:
+        """Advance every scenario by one tick."""
+        state = self.state
+        self.wealth += self.income
+        for k in range(self.household_rates.shape[1]):
+            state -= self.household_rates[:, k]
+
+        output = self.capital * self.productivity
+        if not np.array_equal(output, self.output):
+            self.output = output
+            self._refresh_taxable()
+        for k in range(self.firm_rates.shape[1]):
+            state -= self.firm_rates[:, k]
+
+        for k in range(self.programs.shape[1]):
+            self.revenue[:, k] += self._taxable * self.tax_rate[:, k]
+            state += self.programs[:, k]
+
+        self.loans *= 1 + self.interest_rate
+        self.deposits *= 1 + self.interest_rate * 0.5
+        for k in range(self.bank_rates.shape[1]):
+            state -= self.bank_rates[:, k]
+
+        state += self.flow_rates + self.flow_coefficients * state
+
+        limited = self.limits > 0
+        ratio = np.divide(state, self.limits, out=np.zeros_like(state), where=limited)
+        scarcity = np.maximum(0.0, 1.0 - ratio)
+        adjusted = self.prices * (1 + self.price_sensitivity * scarcity)
+        self.prices = np.where(limited, adjusted, self.prices)
+        self.tick += 1
+
+    def run(self, steps: int) -> List[List[Dict[str, float]]]:
+        """Run ``steps`` ticks and return each scenario's records of this call."""
+        start = len(self._steps)
+        history = np.zeros((start + steps, self.size, len(STOCK_NAMES)))
+        history[:start] = self._history
+        for i in range(steps):
+            self.step()
+            history[start + i] = self.state
+            self._steps.append(self.tick - 1)
+        self._history = history
+        return [self.records(m, start) for m in range(self.size)]
+
+    def records(self, scenario: int, start: int = 0) -> List[Dict[str, float]]:
+        """Return the stock levels of one scenario from row ``start`` on."""
+        recorder = ArrayRecorder(STOCK_REPORTERS, index="step")
+        recorder.load(self._history[:, scenario], np.array(self._steps))
+        return recorder.to_records(start)
+
+    def stock_matrix(self, name: str) -> np.ndarray:
+        """Return the ``(M, steps)`` history of one stock across scenarios."""
+        return self._history[:, :, STOCK_NAMES.index(name)].T.copy()
+
+    def market_prices(self, scenario: int) -> Dict[str, float]:
+        """Return the current prices of one scenario keyed by resource."""
+        return dict(zip(STOCK_NAMES, self.prices[scenario].tolist()))
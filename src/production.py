@@ -0,0 +1,265 @@
+"""Sector-linked production through a sparse input-output network.
+
+:func:`technical_coefficients` turns an input-output table (as returned by
+:func:`~src.data.io.read_io_table`, or a memory-mapped
+:class:`~src.data.io.IOMatrix`) into the technical-coefficient matrix
+``A[i, j] = Z[i, j] / x[j]`` stored as a :class:`CSRMatrix`, so only the
+non-zero coefficients are kept.  :class:`ProductionNetwork` finds the gross
+output ``x = A x + f`` that delivers a final demand ``f`` by iterating
+``x <- f + A x`` with sparse matrix-vector products, which converges for any
+productive economy (every column of ``A`` summing to less than one).
+
+Each solve starts from the previous tick's gross output and an unchanged
+final demand returns the stored solution without iterating, so steady runs
+pay for the solve once.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+#: Table column holding each sector's total output, if present.
+TOTAL_OUTPUT_COLUMN = "total_output"
+
+#: Rows of a dense matrix converted at a time by :meth:`CSRMatrix.from_dense`.
+CHUNK_ROWS = 4096
+
+
+@dataclass
+class CSRMatrix:
+    """Compressed sparse row matrix with the few operations the model needs."""
+
+    data: np.ndarray
+    indices: np.ndarray
+    indptr: np.ndarray
+    shape: Tuple[int, int]
+    _rows: np.ndarray = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.data = np.asarray(self.data, dtype=float)
+        self.indices = np.asarray(self.indices, dtype=np.intp)
+        self.indptr = np.asarray(self.indptr, dtype=np.intp)
+        if len(self.indptr) != self.shape[0] + 1:
+            raise ValueError("indptr must have one entry per row plus one")
+        # Row of every stored entry, used to sum products per row.
+        self._rows = np.repeat(np.arange(self.shape[0]), np.diff(self.indptr))
+
+    @classmethod
+    def from_dense(
+        cls,
+        array: np.ndarray,
+        column_scale: np.ndarray | None = None,
+        chunk_rows: int = CHUNK_ROWS,
+    ) -> "CSRMatrix":
+        """Return the non-zero entries of ``array``, optionally column-scaled.
+
+        ``array`` is read ``chunk_rows`` rows at a time, so it may be a
+        memory-mapped matrix larger than memory.  Each column ``j`` is
+        multiplied by ``column_scale[j]``.
+        """
+        rows, cols = array.shape
+        data: List[np.ndarray] = []
+        indices: List[np.ndarray] = []
+        counts = np.zeros(rows, dtype=np.intp)
+        for start in range(0, rows, chunk_rows):
+            block = np.asarray(array[start : start + chunk_rows], dtype=float)
+            if column_scale is not None:
+                block = block * column_scale
+            r, c = np.nonzero(block)
+            data.append(block[r, c])
+            indices.append(c)
+            counts[start : start + len(block)] = np.bincount(r, minlength=len(block))
+        indptr = np.concatenate(([0], np.cumsum(counts)))
+        return cls(
+            np.concatenate(data) if data else np.zeros(0),
+            np.concatenate(indices) if indices else np.zeros(0, dtype=np.intp),
+            indptr,
+            (rows, cols),
+        )
+
+    @property
+    def nnz(self) -> int:
+        """Number of stored entries."""
+        return len(self.data)
+
+    @property
+    def density(self) -> float:
+        """Fraction of entries that are stored."""
+        size = self.shape[0] * self.shape[1]
+        return self.nnz / size if size else 0.0
+
+    def matvec(self, x: np.ndarray) -> np.ndarray:
+        """Return the product of the matrix and the vector ``x``."""
+        products = self.data * np.asarray(x, dtype=float)[self.indices]
+        return np.bincount(self._rows, weights=products, minlength=self.shape[0])
+
+    def __matmul__(self, x: np.ndarray) -> np.ndarray:
+        return self.matvec(x)
+
+    def column_sums(self) -> np.ndarray:
+        """Return the sum of every column."""
+        return np.bincount(self.indices, weights=self.data, minlength=self.shape[1])
+
+    def toarray(self) -> np.ndarray:
+        """Return the matrix as a dense array."""
+        dense = np.zeros(self.shape)
+        dense[self._rows, self.indices] = self.data
+        return dense
+
+
+def _output_scale(total_output: np.ndarray) -> np.ndarray:
+    total_output = np.asarray(total_output, dtype=float)
+    if np.any(total_output < 0):
+        raise ValueError("total output must be non-negative")
+    # Sectors without output buy nothing.
+    return np.divide(
+        1.0,
+        total_output,
+        out=np.zeros_like(total_output),
+        where=total_output > 0,
+    )
+
+
+def technical_coefficients(
+    table: Any, total_output: Sequence[float] | Dict[str, float] | None = None
+) -> Tuple[CSRMatrix, List[str]]:
+    """Return the sparse coefficient matrix of an IO table and its sectors.
+
+    ``table`` is either a :class:`~src.data.io.IOMatrix` of inter-industry
+    flows, which needs ``total_output``, or a table as returned by
+    :func:`~src.data.io.read_io_table`: the first column holds row labels,
+    the columns named after those labels are the inter-industry flows and
+    any other numeric columns (final demand) add to each sector's output.
+    Rows not named after a sector column, such as value added, are ignored.
+    Total output comes from ``total_output`` (a sequence in row order or a
+    mapping by sector), a ``total_output`` column, or else the row sums.
+    """
+    if hasattr(table, "row_labels"):
+        if total_output is None:
+            raise ValueError("an IOMatrix needs total_output")
+        sectors = list(table.row_labels)
+        if list(table.col_labels) != sectors:
+            raise ValueError("IO matrix rows and columns must list the same sectors")
+        if isinstance(total_output, dict):
+            total_output = [total_output[s] for s in sectors]
+        return CSRMatrix.from_dense(table.data, _output_scale(total_output)), sectors
+
+    label, *columns = list(table.columns)
+    labels = [str(value) for value in table[label]]
+    sectors = [c for c in columns if c in labels]
+    keep = [labels.index(s) for s in sectors]
+
+    def column(name: str) -> np.ndarray:
+        return np.asarray(list(table[name]), dtype=float)[keep]
+
+    flows = np.zeros((len(sectors), len(sectors)))
+    for j, sector in enumerate(sectors):
+        flows[:, j] = column(sector)
+    if total_output is None:
+        if TOTAL_OUTPUT_COLUMN in columns:
+            total = column(TOTAL_OUTPUT_COLUMN)
+        else:
+            final = [column(c) for c in columns if c not in sectors]
+            total = flows.sum(axis=1) + sum(final, np.zeros(len(sectors)))
+    elif isinstance(total_output, dict):
+        total = np.array([total_output[s] for s in sectors], dtype=float)
+    else:
+        total = np.asarray(total_output, dtype=float)
+    return CSRMatrix.from_dense(flows, _output_scale(total)), sectors
+
+
+class ProductionNetwork:
+    """Leontief production stage linking firms through a coefficient matrix.
+
+    ``solve`` tolerates a relative change of ``tol`` between iterations and
+    raises :class:`RuntimeError` after ``max_iter`` iterations, which only
+    happens for coefficient matrices that are not productive.
+    """
+
+    def __init__(
+        self,
+        coefficients: CSRMatrix,
+        sectors: Sequence[str] | None = None,
+        tol: float = 1e-12,
+        max_iter: int = 10_000,
+    ) -> None:
+        rows, cols = coefficients.shape
+        if rows != cols:
+            raise ValueError("the coefficient matrix must be square")
+        self.coefficients = coefficients
+        self.sectors = list(sectors) if sectors is not None else list(range(rows))
+        if len(self.sectors) != rows:
+            raise ValueError("expected one sector label per row")
+        self.tol = tol
+        self.max_iter = max_iter
+        #: Iterations taken by the most recent :meth:`solve`.
+        self.iterations = 0
+        self._final_demand: np.ndarray | None = None
+        self._output = np.zeros(rows)
+
+    @classmethod
+    def from_table(
+        cls,
+        table: Any,
+        total_output: Sequence[float] | Dict[str, float] | None = None,
+        **kwargs: Any,
+    ) -> "ProductionNetwork":
+        """Build the network from an IO table, see :func:`technical_coefficients`."""
+        coefficients, sectors = technical_coefficients(table, total_output)
+        return cls(coefficients, sectors, **kwargs)
+
+    def __len__(self) -> int:
+        return self.coefficients.shape[0]
+
+    def solve(self, final_demand: Sequence[float]) -> np.ndarray:
+        """Return the gross output by sector that meets ``final_demand``."""
+        demand = np.asarray(final_demand, dtype=float)
+        if demand.shape != (len(self),):
+            raise ValueError(f"expected final demand for {len(self)} sectors")
+        if self._final_demand is not None and np.array_equal(
+            demand, self._final_demand
+        ):
+            self.iterations = 0
+            return self._output.copy()
+        matrix = self.coefficients
+        output = self._output
+        for iteration in range(1, self.max_iter + 1):
+            new = demand + matrix.matvec(output)
+            change = np.max(np.abs(new - output), initial=0.0)
+            output = new
+            if change <= self.tol * max(1.0, np.max(np.abs(new), initial=0.0)):
+                break
+        else:
+            raise RuntimeError(
+                f"gross output did not converge in {self.max_iter} iterations; "
+                "are the coefficients productive?"
+            )
+        self.iterations = iteration
+        self._final_demand = demand
+        self._output = output
+        return output.copy()
+
+    def intermediate_demand(self, output: Sequence[float]) -> np.ndarray:
+        """Return the inputs each sector supplies to produce ``output``."""
+        return self.coefficients.matvec(output)
+
+    def assign_sectors(self, firms: int) -> np.ndarray:
+        """Return a sector index for each of ``firms`` firms, round robin."""
+        return np.arange(firms) % len(self) if len(self) else np.zeros(0, int)
+
+    def multipliers(
+        self, final_output: np.ndarray, firm_sectors: np.ndarray
+    ) -> np.ndarray:
+        """Return each firm's ratio of gross to final output.
+
+        The firms' ``final_output`` is summed per sector into the final demand,
+        gross output is solved and every firm of a sector is scaled by the
+        same ratio, so firms keep their share of their sector's production.
+        """
+        demand = np.bincount(firm_sectors, weights=final_output, minlength=len(self))
+        gross = self.solve(demand)
+        ratio = np.divide(gross, demand, out=np.ones_like(gross), where=demand > 0)
+        return ratio[firm_sectors]
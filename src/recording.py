@@ -0,0 +1,187 @@
+"""Preallocated recording of model reporters.
+
+:class:`ArrayRecorder` replaces the list-of-dicts pattern used to record time
+series.  Reporter values are written in place into a ``(steps,
+n_reporters)`` float array allocated up front, and the result is converted to
+a DataFrame or list of dicts only when requested.  Optional agent reporters
+are written the same way into a ``(steps, n_agents, n_agent_reporters)``
+array.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, List, Sequence
+
+import numpy as np
+
+from .biophysics.stocks import STOCK_NAMES
+
+
+def _stock_reporter(name: str) -> Callable[[Any], float]:
+    return lambda model: getattr(model.stocks, name).value
+
+
+#: Reporters recording each bio-physical stock of a model with ``stocks``.
+STOCK_REPORTERS: Dict[str, Callable[[Any], float]] = {
+    name: _stock_reporter(name) for name in STOCK_NAMES
+}
+
+
+class ArrayRecorder:
+    """Record model reporters into a preallocated float array.
+
+    ``model_reporters`` maps column names to functions of the model, as for
+    Mesa's ``DataCollector``.  ``capacity`` rows are allocated up front; the
+    buffer doubles if more ticks are collected.  When ``index`` is given an
+    integer column of that name (e.g. ``"step"``) is stored alongside the
+    reporters.
+
+    ``agent_reporters`` map column names to functions of an agent and are
+    evaluated for every agent returned by ``agents(model)`` (by default
+    ``model.schedule.agents``, as in Mesa).  The agents seen on the first
+    collection fix the ``agent_ids`` and the agent dimension of the array.
+    """
+
+    def __init__(
+        self,
+        model_reporters: Dict[str, Callable[[Any], float]],
+        capacity: int = 0,
+        index: str | None = None,
+        agent_reporters: Dict[str, Callable[[Any], float]] | None = None,
+        agents: Callable[[Any], Sequence[Any]] | None = None,
+    ) -> None:
+        self.model_reporters = dict(model_reporters)
+        self.columns = list(self.model_reporters)
+        self.index = index
+        self._funcs = list(self.model_reporters.values())
+        self._data = np.empty((capacity, len(self.columns)))
+        self._steps = np.empty(capacity, dtype=np.int64)
+        self._rows = 0
+        self.agent_reporters = dict(agent_reporters or {})
+        self.agent_columns = list(self.agent_reporters)
+        self._agent_funcs = list(self.agent_reporters.values())
+        self._agents = agents or (lambda model: model.schedule.agents)
+        self.agent_ids: List[Any] = []
+        self._agent_data = np.empty((capacity, 0, len(self.agent_columns)))
+
+    def __len__(self) -> int:
+        return self._rows
+
+    def _grow(self, capacity: int | None = None) -> None:
+        if capacity is None:
+            capacity = max(1, 2 * self._data.shape[0])
+        data = np.empty((capacity, len(self.columns)))
+        data[: self._rows] = self._data[: self._rows]
+        steps = np.empty(capacity, dtype=np.int64)
+        steps[: self._rows] = self._steps[: self._rows]
+        agent_data = np.empty((capacity,) + self._agent_data.shape[1:])
+        agent_data[: self._rows] = self._agent_data[: self._rows]
+        self._data, self._steps, self._agent_data = data, steps, agent_data
+
+    def reserve(self, rows: int) -> None:
+        """Ensure space for ``rows`` more rows without reallocating."""
+        if self._rows + rows > self._data.shape[0]:
+            self._grow(self._rows + rows)
+
+    def load(
+        self,
+        array: np.ndarray,
+        steps: np.ndarray,
+        agent_array: np.ndarray | None = None,
+        agent_ids: Sequence[Any] = (),
+    ) -> None:
+        """Replace the recorded rows with ``array`` and their ``steps``.
+
+        ``agent_array`` and ``agent_ids`` restore the agent reporters.
+        """
+        self._data = np.array(array, dtype=float).reshape(-1, len(self.columns))
+        self._steps = np.array(steps, dtype=np.int64)
+        self._rows = self._data.shape[0]
+        self.agent_ids = list(agent_ids)
+        shape = (self._rows, len(self.agent_ids), len(self.agent_columns))
+        if agent_array is None:
+            self._agent_data = np.empty(shape)
+        else:
+            self._agent_data = np.array(agent_array, dtype=float).reshape(shape)
+
+    def collect(self, model, step: int | None = None) -> None:
+        """Evaluate every reporter on ``model`` and store one row."""
+        row = self._rows
+        if row == self._data.shape[0]:
+            self._grow()
+        self._data[row] = [func(model) for func in self._funcs]
+        self._steps[row] = row if step is None else step
+        if self._agent_funcs:
+            self._collect_agents(self._agents(model), row)
+        self._rows = row + 1
+
+    def _collect_agents(self, agents: Sequence[Any], row: int) -> None:
+        n = len(agents)
+        if not self.agent_ids and self._rows == 0:
+            self.agent_ids = [agent.unique_id for agent in agents]
+            self._agent_data = np.empty(
+                (self._data.shape[0], n, len(self.agent_columns))
+            )
+        elif n != len(self.agent_ids):
+            raise ValueError(
+                f"agent reporters recorded {len(self.agent_ids)} agents, got {n}"
+            )
+        block = self._agent_data[row]
+        for j, func in enumerate(self._agent_funcs):
+            block[:, j] = np.fromiter((func(agent) for agent in agents), float, n)
+
+    @property
+    def array(self) -> np.ndarray:
+        """Return the recorded ``(rows, n_reporters)`` array (a view)."""
+        return self._data[: self._rows]
+
+    @property
+    def steps(self) -> np.ndarray:
+        """Return the recorded step index for each row (a view)."""
+        return self._steps[: self._rows]
+
+    @property
+    def agent_array(self) -> np.ndarray:
+        """Return the recorded ``(rows, n_agents, n_agent_reporters)`` array."""
+        return self._agent_data[: self._rows]
+
+    def to_records(self, start: int = 0) -> List[Dict[str, float]]:
+        """Return the recorded rows from row ``start`` on as a list of dicts."""
+        rows = self.array[start:].tolist()
+        if self.index is None:
+            return [dict(zip(self.columns, row)) for row in rows]
+        return [
+            {self.index: step, **dict(zip(self.columns, row))}
+            for step, row in zip(self.steps[start:].tolist(), rows)
+        ]
+
+    def to_dataframe(self):
+        """Return the recorded rows as a :class:`pandas.DataFrame`."""
+        import pandas as pd
+
+        cols = {} if self.index is None else {self.index: self.steps.copy()}
+        for j, name in enumerate(self.columns):
+            cols[name] = self.array[:, j].copy()
+        return pd.DataFrame(cols)
+
+    def get_model_vars_dataframe(self):
+        """Alias of :meth:`to_dataframe` matching Mesa's ``DataCollector``."""
+        return self.to_dataframe()
+
+    def get_agent_vars_dataframe(self):
+        """Return the agent reporters with one row per step and agent.
+
+        The ``Step`` and ``AgentID`` columns stand in for the index of Mesa's
+        ``DataCollector.get_agent_vars_dataframe``.
+        """
+        import pandas as pd
+
+        n = len(self.agent_ids)
+        cols: Dict[str, Any] = {
+            "Step": np.repeat(self.steps, n),
+            "AgentID": self.agent_ids * self._rows,
+        }
+        values = self.agent_array.reshape(self._rows * n, len(self.agent_columns))
+        for j, name in enumerate(self.agent_columns):
+            cols[name] = values[:, j].copy()
+        return pd.DataFrame(cols)
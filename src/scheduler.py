@@ -0,0 +1,164 @@
+"""Event-driven activation that skips idle agents.
+
+:class:`EventScheduler` keeps the set of *active* agents and steps only
+those, plus agents woken for this tick, in the order they were added.  After
+its step an agent with an ``is_idle()`` method that returns true leaves the
+active set; agents without the method are always active.  Idle agents come
+back when they are
+
+* woken directly with :meth:`EventScheduler.wake`, e.g. by a
+  :class:`~src.agents.household.Household` whose ``income`` changes,
+* due on a timer set with :meth:`EventScheduler.schedule` (a heap ordered by
+  tick),
+* subscribed to an event passed to :meth:`EventScheduler.publish` (agents
+  subscribe to the events listed in their ``wake_events`` when added), or
+* watching a price threshold crossed in :meth:`EventScheduler.observe_price`
+  (heaps ordered by threshold).
+
+A tick therefore costs work proportional to the active and woken agents, not
+to all agents.  An idle agent's step must do nothing, so skipping it changes
+no results.  Wake-ups during a tick take effect on the next tick.  Like
+mesa's ``SimultaneousActivation``, agents with an ``advance`` method have it
+called after every stepped agent has stepped.
+"""
+
+from __future__ import annotations
+
+import heapq
+from typing import Any, Dict, Hashable, List, Set, Tuple
+
+
+class EventScheduler:
+    """Step only the agents that have something to do this tick."""
+
+    def __init__(self, model: Any = None) -> None:
+        self.model = model
+        self.steps = 0
+        self.time = 0
+        #: Number of agents stepped in the most recent :meth:`step`.
+        self.last_activated = 0
+        self._order: Dict[Any, int] = {}
+        self._added = 0
+        self._active: Set[Any] = set()
+        # The active agents in insertion order, while the active set is unchanged.
+        self._ordered: List[Any] | None = None
+        self._woken: Set[Any] = set()
+        self._timers: List[Tuple[int, int, Any]] = []
+        self._subscribers: Dict[Hashable, Set[Any]] = {}
+        # (threshold, order, agent); prices at or above / at or below wake.
+        self._above: List[Tuple[float, int, Any]] = []
+        self._below: List[Tuple[float, int, Any]] = []
+
+    def add(self, agent: Any) -> None:
+        """Register ``agent``; it is active until its first step says idle."""
+        self._order[agent] = self._added
+        self._added += 1
+        self._active.add(agent)
+        self._ordered = None
+        for event in getattr(agent, "wake_events", ()):
+            self.subscribe(agent, event)
+
+    def remove(self, agent: Any) -> None:
+        """Unregister ``agent`` and drop its subscriptions."""
+        del self._order[agent]
+        self._active.discard(agent)
+        self._ordered = None
+        self._woken.discard(agent)
+        for subscribers in self._subscribers.values():
+            subscribers.discard(agent)
+
+    @property
+    def agents(self) -> List[Any]:
+        """All registered agents in the order they were added."""
+        return list(self._order)
+
+    def get_agent_count(self) -> int:
+        return len(self._order)
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    @property
+    def active_count(self) -> int:
+        """Number of agents that will step next tick without being woken."""
+        return len(self._active)
+
+    def wake(self, agent: Any) -> None:
+        """Step ``agent`` on the next tick; unregistered agents are ignored."""
+        if agent in self._order:
+            self._woken.add(agent)
+
+    def schedule(self, agent: Any, tick: int) -> None:
+        """Wake ``agent`` on ``tick`` (the current :attr:`time` at the latest)."""
+        heapq.heappush(self._timers, (tick, self._order[agent], agent))
+
+    def subscribe(self, agent: Any, event: Hashable) -> None:
+        """Wake ``agent`` whenever ``event`` is published."""
+        self._subscribers.setdefault(event, set()).add(agent)
+
+    def unsubscribe(self, agent: Any, event: Hashable) -> None:
+        self._subscribers.get(event, set()).discard(agent)
+
+    def publish(self, event: Hashable) -> None:
+        """Wake every subscriber of ``event`` for the next tick."""
+        subscribers = self._subscribers.get(event)
+        if subscribers:
+            self._woken |= subscribers
+
+    def watch_price(self, agent: Any, threshold: float, above: bool = True) -> None:
+        """Wake ``agent`` once a price rises to ``threshold``.
+
+        With ``above=False`` the agent wakes when the price falls to it.
+        """
+        if above:
+            heapq.heappush(self._above, (threshold, self._order[agent], agent))
+        else:
+            heapq.heappush(self._below, (-threshold, self._order[agent], agent))
+
+    def observe_price(self, price: float) -> None:
+        """Wake the agents whose price thresholds ``price`` has crossed."""
+        above, below = self._above, self._below
+        while above and above[0][0] <= price:
+            self.wake(heapq.heappop(above)[2])
+        while below and -below[0][0] >= price:
+            self.wake(heapq.heappop(below)[2])
+
+    def step(self) -> None:
+        """Step the active, woken and due agents once, in insertion order."""
+        order = self._order
+        woken = self._woken
+        timers = self._timers
+        while timers and timers[0][0] <= self.time:
+            agent = heapq.heappop(timers)[2]
+            if agent in order:
+                woken.add(agent)
+        self._woken = set()
+        active = self._active
+        if woken - active or self._ordered is None:
+            due = active | woken
+            agents = sorted((a for a in due if a in order), key=order.__getitem__)
+        else:
+            # Same agents as the cached active order.
+            agents = self._ordered
+        changed = False
+        for agent in agents:
+            agent.step()
+            is_idle = getattr(agent, "is_idle", None)
+            if is_idle is not None and is_idle():
+                if agent in active:
+                    active.discard(agent)
+                    changed = True
+            elif agent not in active:
+                active.add(agent)
+                changed = True
+        for agent in agents:
+            advance = getattr(agent, "advance", None)
+            if advance is not None:
+                advance()
+        if changed or len(agents) != len(active):
+            self._ordered = None
+        else:
+            self._ordered = agents
+        self.last_activated = len(agents)
+        self.steps += 1
+        self.time += 1
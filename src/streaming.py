@@ -0,0 +1,372 @@
+"""Streaming metrics updated while a model runs.
+
+The functions in :mod:`src.metrics` need the full recorded series.  The
+accumulators here consume one observation per tick instead and keep only
+constant state (a logarithmic sketch plus the last observed vector for
+:class:`StreamingGini`), so long or large runs can report doughnut metrics
+without recording every step.
+
+Every accumulator has ``update`` for direct use and ``observe(model)``,
+which feeds it ``source(model)``.  Models take a ``monitors`` dict of name to
+accumulator and call ``observe`` after each tick::
+
+    model = BaselineModel(monitors={
+        "carbon": OvershootTracker(0.0, source=lambda m: m.stocks.carbon_budget.value),
+        "gini": StreamingGini(source=lambda m: m.household_wealth()),
+    })
+    model.run(1000, record=False)
+    model.monitors["gini"].value
+
+:func:`monitor_state` and :func:`restore_monitors` move the accumulated state
+(everything but ``source``) in and out of model checkpoints.
+"""
+
+from __future__ import annotations
+
+import abc
+import math
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+
+Source = Callable[[Any], Any]
+
+
+class _Accumulator(abc.ABC):
+    source: Source | None = None
+
+    @abc.abstractmethod
+    def update(self, value) -> None:
+        """Add one observation."""
+
+    @property
+    @abc.abstractmethod
+    def value(self) -> Any:
+        """Current value of the metric."""
+
+    def observe(self, model) -> None:
+        """Update with ``source(model)``."""
+        self.update(self._read(model))
+
+    def _read(self, model) -> Any:
+        if self.source is None:
+            raise ValueError(f"{type(self).__name__} has no source to observe")
+        return self.source(model)
+
+    def state(self) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+        """Return the accumulated state as arrays plus JSON metadata."""
+        return {}, {k: v for k, v in vars(self).items() if k != "source"}
+
+    def load_state(self, arrays: Dict[str, np.ndarray], meta: Dict[str, Any]) -> None:
+        """Restore state returned by :meth:`state`, keeping ``source``."""
+        vars(self).update(meta)
+
+
+class OvershootTracker(_Accumulator):
+    """Running :func:`~src.metrics.overshoot_depth` of a series."""
+
+    def __init__(self, limit: float, source: Source | None = None) -> None:
+        self.limit = limit
+        self.source = source
+        self.count = 0
+        self._depth = 0.0
+
+    def update(self, value: float) -> None:
+        depth = self.limit - value
+        if self.count == 0 or depth > self._depth:
+            self._depth = depth
+        self.count += 1
+
+    @property
+    def value(self) -> float:
+        """Maximum depth below ``limit`` so far (0 if never below)."""
+        return max(0.0, self._depth) if self.count else 0.0
+
+
+class BoundaryTracker(_Accumulator):
+    """Track time spent outside ``[lower, upper]`` and the first return time.
+
+    :attr:`return_time` matches :func:`~src.metrics.return_time_to_boundaries`
+    of the series seen so far; :attr:`time_outside` counts every tick outside
+    the boundaries.
+    """
+
+    def __init__(
+        self, lower: float, upper: float, source: Source | None = None
+    ) -> None:
+        self.lower = lower
+        self.upper = upper
+        self.source = source
+        self.count = 0
+        self.time_outside = 0
+        self.excursions = 0
+        self.inside = True
+        self._crossed = False
+        self._returned = False
+        self._steps = 0
+
+    def update(self, value: float) -> None:
+        inside = bool(self.lower <= value <= self.upper)
+        if not inside:
+            self.time_outside += 1
+            if self.inside:
+                self.excursions += 1
+        if not self._crossed:
+            self._crossed = not inside
+        elif not self._returned:
+            self._steps += 1
+            self._returned = inside
+        self.inside = inside
+        self.count += 1
+
+    @property
+    def return_time(self) -> int:
+        """Ticks from the first exit until the first return (or until now)."""
+        return self._steps
+
+    @property
+    def value(self) -> Dict[str, int]:
+        return {
+            "return_time": self.return_time,
+            "time_outside": self.time_outside,
+            "excursions": self.excursions,
+        }
+
+
+class StreamingWelfare(_Accumulator):
+    """Running :func:`~src.metrics.welfare_indices` of a series."""
+
+    def __init__(self, source: Source | None = None) -> None:
+        self.source = source
+        self.count = 0
+        self.total = 0.0
+        self.minimum = 0.0
+
+    def update(self, value: float) -> None:
+        if self.count == 0 or value < self.minimum:
+            self.minimum = value
+        self.total += value
+        self.count += 1
+
+    @property
+    def value(self) -> Dict[str, float]:
+        if self.count == 0:
+            return {"utilitarian": 0.0, "average": 0.0, "rawlsian": 0.0}
+        return {
+            "utilitarian": self.total,
+            "average": self.total / self.count,
+            "rawlsian": self.minimum,
+        }
+
+
+class StreamingGini(_Accumulator):
+    """Approximate Gini coefficient from a logarithmic quantile sketch.
+
+    Values are counted in buckets whose bounds grow geometrically (as in
+    DDSketch), so every value is represented within ``relative_accuracy`` of
+    its true magnitude and memory grows with the logarithm of the value
+    range rather than with the number of values.  ``update`` adds one value
+    or an array of values and ``remove`` takes them out again.
+
+    :meth:`observe` tracks the latest ``source(model)`` distribution: it
+    keeps the previously observed values and moves only the entries that
+    changed (and landed in a different bucket) from their old bucket to
+    the new one, so a tick in which few agents' wealth changes costs little
+    more than the comparison of the two vectors.
+    """
+
+    def __init__(
+        self, source: Source | None = None, relative_accuracy: float = 0.01
+    ) -> None:
+        if not 0.0 < relative_accuracy < 1.0:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self.source = source
+        self._set_accuracy(relative_accuracy)
+        self.clear()
+
+    def _set_accuracy(self, relative_accuracy: float) -> None:
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1.0 + relative_accuracy) / (1.0 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+
+    def clear(self) -> None:
+        """Remove all values."""
+        self.count = 0
+        self._zeros = 0
+        self._positive: Dict[int, int] = {}
+        self._negative: Dict[int, int] = {}
+        self._last: np.ndarray | None = None
+
+    def update(self, value) -> None:
+        self._apply(np.asarray(value, dtype=float).ravel(), 1)
+
+    def remove(self, value) -> None:
+        """Remove values previously added with :meth:`update`."""
+        self._apply(np.asarray(value, dtype=float).ravel(), -1)
+
+    def observe(self, model) -> None:
+        values = np.array(self._read(model), dtype=float).ravel()
+        last = self._last
+        if last is None or last.shape != values.shape:
+            if last is not None:
+                self.remove(last)
+            self.update(values)
+        else:
+            changed = np.flatnonzero(values != last)
+            if changed.size:
+                old = last[changed]
+                new = values[changed]
+                moved = (np.sign(old) != np.sign(new)) | (
+                    self._keys(old) != self._keys(new)
+                )
+                self.remove(old[moved])
+                self.update(new[moved])
+        self._last = values
+
+    def _keys(self, values: np.ndarray) -> np.ndarray:
+        magnitudes = np.abs(values)
+        keys = np.zeros(values.shape, dtype=np.int64)
+        nonzero = magnitudes > 0.0
+        keys[nonzero] = np.ceil(np.log(magnitudes[nonzero]) / self._log_gamma)
+        return keys
+
+    def _apply(self, values: np.ndarray, sign: int) -> None:
+        self.count += sign * values.size
+        self._zeros += sign * int(np.count_nonzero(values == 0.0))
+        self._add(self._positive, values[values > 0.0], sign)
+        self._add(self._negative, -values[values < 0.0], sign)
+
+    def _add(self, store: Dict[int, int], magnitudes: np.ndarray, sign: int) -> None:
+        if magnitudes.size == 0:
+            return
+        keys = self._keys(magnitudes)
+        low = int(keys.min())
+        counts = np.bincount(keys - low)
+        for offset in np.flatnonzero(counts).tolist():
+            key = low + offset
+            count = store.get(key, 0) + sign * int(counts[offset])
+            if count:
+                store[key] = count
+            else:
+                store.pop(key, None)
+
+    def _representative(self, key: int) -> float:
+        return 2.0 * self._gamma**key / (self._gamma + 1.0)
+
+    def buckets(self) -> List[Tuple[float, int]]:
+        """Return ``(value, count)`` pairs in ascending order of value."""
+        result = [
+            (-self._representative(k), self._negative[k])
+            for k in sorted(self._negative, reverse=True)
+        ]
+        if self._zeros:
+            result.append((0.0, self._zeros))
+        result.extend(
+            (self._representative(k), self._positive[k]) for k in sorted(self._positive)
+        )
+        return result
+
+    def quantile(self, q: float) -> float:
+        """Return the approximate ``q``-quantile of the values."""
+        if self.count == 0:
+            return math.nan
+        rank = q * (self.count - 1)
+        seen = 0
+        for value, count in self.buckets():
+            seen += count
+            if seen > rank:
+                return value
+        return value
+
+    @property
+    def value(self) -> float:
+        """Approximate Gini coefficient (see :func:`~src.metrics.inequality_index`)."""
+        n = self.count
+        if n == 0:
+            return 0.0
+        cumulative = 0.0
+        total = 0.0
+        rank = 0
+        for value, count in self.buckets():
+            # Sum of (2 * i - n - 1) over the ranks rank + 1 .. rank + count.
+            cumulative += value * count * (2 * rank + count - n)
+            total += value * count
+            rank += count
+        if total == 0:
+            return 0.0
+        return cumulative / (n * total)
+
+    def state(self) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+        arrays = {} if self._last is None else {"last": self._last.copy()}
+        meta = {
+            "relative_accuracy": self.relative_accuracy,
+            "count": self.count,
+            "zeros": self._zeros,
+            "positive": sorted(self._positive.items()),
+            "negative": sorted(self._negative.items()),
+        }
+        return arrays, meta
+
+    def load_state(self, arrays: Dict[str, np.ndarray], meta: Dict[str, Any]) -> None:
+        self._set_accuracy(meta["relative_accuracy"])
+        self.clear()
+        self.count = meta["count"]
+        self._zeros = meta["zeros"]
+        self._positive = {int(k): int(c) for k, c in meta["positive"]}
+        self._negative = {int(k): int(c) for k, c in meta["negative"]}
+        if "last" in arrays:
+            self._last = np.array(arrays["last"], dtype=float)
+
+
+def observe_all(monitors: Dict[str, _Accumulator], model) -> None:
+    """Call ``observe(model)`` on every monitor."""
+    for monitor in monitors.values():
+        monitor.observe(model)
+
+
+def results(monitors: Dict[str, _Accumulator]) -> Dict[str, Any]:
+    """Return the current ``value`` of every monitor."""
+    return {name: monitor.value for name, monitor in monitors.items()}
+
+
+def monitor_state(
+    monitors: Dict[str, _Accumulator],
+) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+    """Return the state of every monitor as checkpoint arrays plus metadata."""
+    arrays: Dict[str, np.ndarray] = {}
+    meta: Dict[str, Any] = {}
+    for name, monitor in monitors.items():
+        monitor_arrays, state = monitor.state()
+        meta[name] = {"type": type(monitor).__name__, "state": state}
+        for key, array in monitor_arrays.items():
+            arrays[f"monitors.{name}.{key}"] = array
+    return arrays, meta
+
+
+def restore_monitors(
+    monitors: Dict[str, _Accumulator],
+    arrays: Dict[str, np.ndarray],
+    meta: Dict[str, Any],
+) -> None:
+    """Load the state saved by :func:`monitor_state` into ``monitors``.
+
+    ``monitors`` must hold an accumulator of the saved type under every
+    saved name; their ``source`` callables are kept.
+    """
+    missing = sorted(set(meta) - set(monitors))
+    if missing:
+        raise ValueError(f"checkpoint has state for monitors {missing}; pass them")
+    for name, saved in meta.items():
+        monitor = monitors[name]
+        if type(monitor).__name__ != saved["type"]:
+            raise TypeError(
+                f"monitor {name!r} is a {type(monitor).__name__}, "
+                f"checkpoint holds a {saved['type']}"
+            )
+        prefix = f"monitors.{name}."
+        monitor_arrays = {
+            key[len(prefix) :]: array
+            for key, array in arrays.items()
+            if key.startswith(prefix)
+        }
+        monitor.load_state(monitor_arrays, saved["state"])
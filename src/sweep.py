@@ -0,0 +1,192 @@
+"""Parameter sweep designs and execution.
+
+A sweep varies entries of a run configuration addressed by dotted paths such
+as ``price_sensitivity``, ``agents.households``, ``initial_stocks.water`` or
+``rates.households.water_rate``.  Each parameter is given either as explicit
+``values`` or as a ``low``/``high`` range (with ``num`` points for a grid and
+``integer: true`` for counts)::
+
+    parameters:
+      price_sensitivity: {low: 0.1, high: 0.9, num: 5}
+      agents.households: {low: 10, high: 1000, integer: true}
+      initial_stocks.water: {values: [50.0, 100.0, 200.0]}
+
+:func:`grid_design` takes the Cartesian product of the values and
+:func:`latin_hypercube` draws a Latin hypercube sample of the ranges.
+:func:`run_sweep` runs every design point for every seed, in parallel if
+requested, and reuses results stored in a :class:`~src.cache.ResultCache`.
+"""
+
+from __future__ import annotations
+
+import copy
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from itertools import product
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from .cache import ResultCache, config_hash
+
+Runner = Callable[[Dict[str, Any], int], List[Dict[str, Any]]]
+
+
+@dataclass(frozen=True)
+class Parameter:
+    """One swept configuration entry."""
+
+    name: str
+    low: float | None = None
+    high: float | None = None
+    values: tuple | None = None
+    num: int | None = None
+    integer: bool = False
+
+    @classmethod
+    def from_spec(
+        cls, name: str, spec: Dict[str, Any] | Sequence[Any]
+    ) -> "Parameter":
+        """Build a parameter from its sweep file entry (a list means values)."""
+        if not isinstance(spec, dict):
+            spec = {"values": list(spec)}
+        values = spec.get("values")
+        param = cls(
+            name,
+            low=spec.get("low"),
+            high=spec.get("high"),
+            values=tuple(values) if values is not None else None,
+            num=spec.get("num"),
+            integer=bool(spec.get("integer", False)),
+        )
+        if param.values is None and (param.low is None or param.high is None):
+            raise ValueError(
+                f"parameter {name!r} needs 'values' or 'low' and 'high'"
+            )
+        return param
+
+    def _convert(self, value: float) -> Any:
+        return int(round(value)) if self.integer else float(value)
+
+    def grid_values(self) -> List[Any]:
+        """Return the values used by :func:`grid_design`."""
+        if self.values is not None:
+            return list(self.values)
+        if self.num is None:
+            raise ValueError(f"grid parameter {self.name!r} needs 'values' or 'num'")
+        grid = np.linspace(self.low, self.high, self.num)
+        return [self._convert(v) for v in grid.tolist()]
+
+    def scale(self, unit: np.ndarray) -> List[Any]:
+        """Map samples in ``[0, 1)`` onto the parameter range."""
+        if self.values is not None:
+            count = len(self.values)
+            index = np.minimum((unit * count).astype(int), count - 1)
+            return [self.values[i] for i in index.tolist()]
+        scaled = self.low + unit * (self.high - self.low)
+        return [self._convert(v) for v in scaled.tolist()]
+
+
+def parse_parameters(spec: Dict[str, Any]) -> List[Parameter]:
+    """Return the :class:`Parameter` list of a ``parameters`` mapping."""
+    return [Parameter.from_spec(name, entry) for name, entry in spec.items()]
+
+
+def grid_design(parameters: Sequence[Parameter]) -> List[Dict[str, Any]]:
+    """Return every combination of the parameters' grid values."""
+    names = [p.name for p in parameters]
+    return [
+        dict(zip(names, combo))
+        for combo in product(*(p.grid_values() for p in parameters))
+    ]
+
+
+def latin_hypercube(
+    parameters: Sequence[Parameter], samples: int, seed: int | None = None
+) -> List[Dict[str, Any]]:
+    """Return a Latin hypercube design of ``samples`` points.
+
+    Each parameter's range is split into ``samples`` equal strata and every
+    stratum is sampled exactly once, in an independently shuffled order per
+    parameter.  Parameters with explicit ``values`` pick among them evenly.
+    """
+    rng = np.random.default_rng(seed)
+    columns = {}
+    for param in parameters:
+        unit = (rng.permutation(samples) + rng.random(samples)) / samples
+        columns[param.name] = param.scale(unit)
+    return [
+        {name: values[i] for name, values in columns.items()} for i in range(samples)
+    ]
+
+
+def apply_overrides(base: Dict[str, Any], point: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a copy of ``base`` with each dotted-path entry of ``point`` set."""
+    cfg = copy.deepcopy(base)
+    for path, value in point.items():
+        target = cfg
+        *parents, leaf = path.split(".")
+        for key in parents:
+            target = target.setdefault(key, {})
+        target[leaf] = value
+    return cfg
+
+
+def run_sweep(
+    base: Dict[str, Any],
+    design: Sequence[Dict[str, Any]],
+    seeds: Sequence[int],
+    runner: Runner,
+    workers: int = 1,
+    cache: ResultCache | None = None,
+) -> List[Dict[str, Any]]:
+    """Run ``runner(cfg, seed)`` for every design point and seed.
+
+    Results already present in ``cache`` are not recomputed; new results
+    are stored in it as they finish.  ``runner`` must be a module-level
+    function when ``workers > 1``.  Returns one entry per (point, seed), in
+    design order, with the point, seed, config hash, records and whether
+    the records came from the cache.
+    """
+    results: List[Dict[str, Any]] = []
+    for index, point in enumerate(design):
+        cfg = apply_overrides(base, point)
+        key = config_hash(cfg)
+        for seed in seeds:
+            records = cache.get(cfg, seed) if cache is not None else None
+            results.append(
+                {
+                    "point": index,
+                    "seed": seed,
+                    "parameters": point,
+                    "config": cfg,
+                    "key": key,
+                    "records": records,
+                    "cached": records is not None,
+                }
+            )
+    # Identical (config, seed) pairs, e.g. from rounded integer parameters,
+    # are computed once.
+    pending: Dict[Tuple[str, int], List[Dict[str, Any]]] = {}
+    for result in results:
+        if result["records"] is None:
+            pending.setdefault((result["key"], result["seed"]), []).append(result)
+
+    def finish(group: List[Dict[str, Any]], records: List[Dict[str, Any]]) -> None:
+        for result in group:
+            result["records"] = records
+        if cache is not None:
+            cache.put(group[0]["config"], group[0]["seed"], records)
+
+    if workers <= 1:
+        for group in pending.values():
+            finish(group, runner(group[0]["config"], group[0]["seed"]))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(runner, group[0]["config"], group[0]["seed"]): group
+                for group in pending.values()
+            }
+            for future in as_completed(futures):
+                finish(futures[future], future.result())
+    return results
@@ -0,0 +1,80 @@
+"""Shared test set-up: import paths and a stand-in for mesa.
+
+mesa is optional, so the agent classes are built on :class:`StubAgent`.
+Some test modules reload the agent modules, which replaces the classes that
+models check with ``isinstance``; the fixtures below therefore reload the
+agents, and the modules using them, when a test starts rather than at
+collection.
+"""
+
+import importlib
+import random
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+for path in (ROOT, ROOT / "scripts", ROOT / "benchmarks"):
+    if str(path) not in sys.path:
+        sys.path.append(str(path))
+
+AGENT_MODULES = (
+    "src.agents.household",
+    "src.agents.firm",
+    "src.agents.government",
+    "src.agents.financial_intermediary",
+    "src.agents.population",
+    "src.agents",
+)
+
+
+class StubAgent:
+    """Minimal ``mesa.Agent`` with a per-agent random generator."""
+
+    def __init__(self, unique_id=None, model=None):
+        self.unique_id = unique_id
+        self.model = model
+        self.random = random.Random(unique_id)
+
+
+mesa = sys.modules.setdefault("mesa", types.ModuleType("mesa"))
+if not hasattr(mesa, "Agent"):
+    mesa.Agent = StubAgent
+
+
+def _reload(*names):
+    return [importlib.reload(importlib.import_module(name)) for name in names]
+
+
+@pytest.fixture
+def reload_modules():
+    """Rebuild the agents on :class:`StubAgent`; return a module reloader.
+
+    ``reload_modules("src.models.baseline", ...)`` reloads the named modules
+    on top of the fresh agent classes and returns them in order.
+    """
+    mesa.Agent = StubAgent
+    _reload(*AGENT_MODULES)
+    return _reload
+
+
+@pytest.fixture
+def baseline_model(reload_modules):
+    """``BaselineModel`` built on freshly reloaded agent classes."""
+    (baseline,) = reload_modules("src.models.baseline")
+    return baseline.BaselineModel
+
+
+@pytest.fixture
+def run_simulation(reload_modules):
+    """``scripts/run_simulation.py`` on freshly reloaded agent classes."""
+    return reload_modules("src", "run_simulation")[1]
+
+
+@pytest.fixture
+def run_sweep(run_simulation, reload_modules):
+    """``scripts/run_sweep.py``, importing the reloaded ``run_simulation``."""
+    (run_sweep,) = reload_modules("run_sweep")
+    return run_sweep
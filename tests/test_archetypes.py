@@ -1,12 +1,10 @@
-import sys
-import types
-from pathlib import Path
+import asyncio
+import threading
+import time
 
-sys.path.append(str(Path(__file__).resolve().parents[1]))
+import pytest
 
-sys.modules.setdefault("mesa", types.ModuleType("mesa")).Agent = object
-
-from src.behavior.archetypes import RLArchetype
+from src.behavior.archetypes import LLMArchetype, QTable, RLArchetype
 
 
 def test_rl_archetype_updates_q_values():
@@ -14,3 +12,124 @@ def test_rl_archetype_updates_q_values():
     arch.update("s1", "a", reward=1.0, next_state="s2")
     assert arch.q_table["s1"]["a"] == 1.0
     assert arch.choose_action("s1") == "a"
+
+
+def test_next_max_only_covers_visited_actions():
+    arch = RLArchetype(actions=["a", "b"], learning_rate=1.0, discount=1.0, epsilon=0.0)
+    arch.update("t", "a", -5.0, "u")
+    arch.update("s", "a", 0.0, "t")
+    assert arch.q_table["s"]["a"] == -5.0
+    assert arch.q_table["t"] == {"a": -5.0}
+    assert "u" not in arch.q_table
+
+
+def test_q_table_view_reads_defaults_and_writes_through():
+    arch = RLArchetype(actions=["a", "b"], learning_rate=1.0, discount=1.0, epsilon=0.0)
+    assert "s" not in arch.q_table
+    assert arch.q_table["s"]["b"] == 0.0
+    assert arch.q_table["s"] == {"b": 0.0}
+    arch.q_table["s"]["a"] = 3.0
+    arch.q_table["t"] = {"b": 2.0}
+    assert arch.table.get("s", "a") == 3.0
+    assert arch.choose_action("t") == "b"
+    arch.update("u", "a", 1.0, "t")
+    assert arch.q_table["u"]["a"] == 3.0
+    arch.q_table["s"]["a"] += 1.0
+    del arch.q_table["t"]
+    assert dict(arch.q_table) == {"s": {"a": 4.0, "b": 0.0}, "u": {"a": 3.0}}
+
+
+def test_choose_actions_is_greedy_for_a_population():
+    arch = RLArchetype(actions=["a", "b", "c"], learning_rate=1.0, epsilon=0.0)
+    arch.update_batch(["s1", "s2"], ["b", "c"], [1.0, 2.0], ["s1", "s2"])
+    assert arch.choose_actions(["s1", "s2", "s1"]) == ["b", "c", "b"]
+
+
+def test_update_batch_matches_sequential_updates_for_distinct_pairs():
+    batched = RLArchetype(actions=[0, 1], learning_rate=0.5, discount=0.9)
+    single = RLArchetype(actions=[0, 1], learning_rate=0.5, discount=0.9)
+    states, actions, rewards = ["x", "y", "z"], [0, 1, 1], [1.0, -2.0, 0.5]
+    batched.update_batch(states, actions, rewards, ["u", "v", "w"])
+    for s, a, r in zip(states, actions, rewards):
+        single.update(s, a, r, "next")
+    assert batched.q_table == single.q_table
+    assert batched.table.get("y", 1) == -1.0
+
+
+def test_update_batch_accumulates_repeated_pairs():
+    arch = RLArchetype(actions=["a"], learning_rate=0.5, discount=0.0)
+    arch.update_batch(["s", "s"], ["a", "a"], [1.0, 3.0], ["t", "t"])
+    assert arch.q_table["s"]["a"] == 2.0
+
+
+def test_shared_table_and_seeded_exploration():
+    table = QTable(["a", "b"], capacity=1)
+    first = RLArchetype(["a", "b"], epsilon=1.0, table=table, seed=3)
+    second = RLArchetype(["a", "b"], epsilon=1.0, table=table, seed=3)
+    states = [f"s{i}" for i in range(100)]
+    assert first.choose_actions(states) == second.choose_actions(states)
+    assert len(table) == 100 and len(table.values) >= 100
+    first.update("s0", "b", 1.0, "s1")
+    assert second.q_table["s0"]["b"] > 0
+    with pytest.raises(ValueError):
+        RLArchetype(["b", "a"], table=table)
+
+
+def test_generate_batch_deduplicates_and_bounds_concurrency():
+    calls = []
+    active = [0, 0]
+    lock = threading.Lock()
+
+    def call(prompt):
+        with lock:
+            calls.append(prompt)
+            active[0] += 1
+            active[1] = max(active)
+        time.sleep(0.01)
+        with lock:
+            active[0] -= 1
+        return prompt.upper()
+
+    arch = LLMArchetype("p", call, max_concurrency=3)
+    inputs = [f"in{i % 8}" for i in range(40)]
+    assert arch.generate_batch(inputs) == [f"P\nIN{i % 8}" for i in range(40)]
+    assert sorted(calls) == sorted(f"p\nin{i}" for i in range(8))
+    assert active[1] <= 3
+
+    assert arch.generate_batch(inputs[:8]) == [f"P\nIN{i}" for i in range(8)]
+    assert len(calls) == 8
+    assert arch.stats.hits == 8 and arch.stats.misses == 8
+
+
+def test_llm_cache_evicts_least_recently_used_and_supports_async():
+    async def call(prompt):
+        await asyncio.sleep(0)
+        return prompt[-1]
+
+    arch = LLMArchetype("p", call, cache_size=2)
+    assert arch.generate_batch(["a", "b"]) == ["a", "b"]
+    assert arch.generate("a") == "a"
+    arch.generate_batch(["c"])
+    assert arch.stats.evictions == 1
+    hits = arch.stats.hits
+    arch.generate("a")
+    assert arch.stats.hits == hits + 1
+    arch.generate("b")
+    assert arch.stats.hits == hits + 1
+
+
+def test_blocking_generate_refuses_a_running_loop():
+    async def call(prompt):
+        return prompt[-1]
+
+    arch = LLMArchetype("p", call, cache_size=0)
+
+    async def inside():
+        with pytest.raises(RuntimeError, match="agenerate_batch"):
+            arch.generate_batch(["a"])
+        with pytest.raises(RuntimeError, match="agenerate_batch"):
+            arch.generate("a")
+        return await arch.agenerate_batch(["a", "b"])
+
+    assert asyncio.run(inside()) == ["a", "b"]
+    assert arch.stats.to_dict()["misses"] == 0
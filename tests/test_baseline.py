@@ -1,8 +1,8 @@
 import sys
 import types
-from pathlib import Path
 
-sys.path.append(str(Path(__file__).resolve().parents[1]))
+import pytest
+
 
 class _Agent:
     def __init__(self, unique_id=None, model=None):
@@ -40,3 +40,30 @@ def test_baseline_model_runs():
             "biomass",
             "minerals",
         }
+
+
+def test_monitors_update_without_recording():
+    from src.metrics import inequality_index, overshoot_depth
+    from src.streaming import OvershootTracker, StreamingGini
+
+    def build(record):
+        model = BaselineModel(
+            households=4,
+            firms=1,
+            initial_stocks={"water": 3.0},
+            monitors={
+                "water": OvershootTracker(2.0, source=lambda m: m.stocks.water.value),
+                "gini": StreamingGini(source=lambda m: m.household_wealth()),
+            },
+        )
+        for i, agent in enumerate(model.agents[:4]):
+            agent.income = float(i)
+        return model, model.run(steps=5, record=record)
+
+    recorded, records = build(record=True)
+    model, empty = build(record=False)
+    assert empty == []
+    depth = overshoot_depth([r["water"] for r in records], 2.0)
+    assert model.monitors["water"].value == depth > 0
+    expected = inequality_index(list(recorded.household_wealth()))
+    assert model.monitors["gini"].value == pytest.approx(expected, abs=0.02)
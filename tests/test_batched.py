@@ -0,0 +1,90 @@
+import pytest
+
+import src.agents.firm as firm
+import src.agents.government as government
+import src.agents.household as household
+from src.biophysics import LinearFlow
+
+
+@pytest.fixture
+def models(reload_modules):
+    """``BaselineModel`` and ``BatchedBaselineModel`` on the stub agents."""
+    baseline, batched = reload_modules("src.models.baseline", "src.models.batched")
+    return baseline.BaselineModel, batched.BatchedBaselineModel
+
+
+SCENARIOS = [
+    {"households": 2, "firms": 1},
+    {"households": 5, "firms": 0, "has_bank": False, "price_sensitivity": 0.9},
+    {
+        "households": 0,
+        "firms": 3,
+        "has_government": False,
+        "initial_stocks": {"carbon_budget": 3.0, "water": 0.5, "minerals": 8.0},
+    },
+    {"households": 1, "firms": 2, "initial_stocks": {"biomass": 40.0}},
+]
+
+
+def _models(BaselineModel):
+    models = [BaselineModel(**params) for params in SCENARIOS]
+    models[0].stocks.water.set_flow(0.7)
+    models[3].stocks.biomass.set_flow(LinearFlow(1.0, -0.05))
+    for i, model in enumerate(models):
+        model.market.ecological_limits["carbon_budget"] = 2.0 + i
+        for agent in model.agents:
+            if isinstance(agent, household.Household):
+                agent.income = 0.3 * (i + 1)
+                agent.water_rate = 0.1 * agent.unique_id
+            elif isinstance(agent, firm.Firm):
+                agent.productivity = 1.5
+            elif isinstance(agent, government.Government):
+                agent.tax_rate = 0.2
+            else:
+                agent.interest_rate = 0.01
+                agent.loans = 3.0
+    return models
+
+
+def test_batched_records_match_separate_runs(models):
+    BaselineModel, BatchedBaselineModel = models
+    expected = _models(BaselineModel)
+    expected_records = [model.run(steps=6) for model in expected]
+
+    batch = BatchedBaselineModel(_models(BaselineModel))
+    first = batch.run(steps=2)
+    assert [len(r) for r in first] == [2] * 4
+    records = batch.run(steps=4)
+    assert records == [r[2:] for r in expected_records]
+    assert [batch.records(m) for m in range(4)] == expected_records
+    for m, model in enumerate(expected):
+        assert batch.market_prices(m) == model.market.prices
+        assert list(batch.state[m]) == list(model.stocks.state)
+        gov = [a for a in model.agents if isinstance(a, government.Government)]
+        assert batch.revenue[m].tolist() == [g.revenue for g in gov] + [0.0] * (
+            batch.revenue.shape[1] - len(gov)
+        )
+    assert batch.stock_matrix("water").shape == (4, 6)
+
+
+def test_from_scenarios_and_unsupported_models(models):
+    BaselineModel, BatchedBaselineModel = models
+    batch = BatchedBaselineModel.from_scenarios(
+        [dict(params, seed=seed) for seed, params in enumerate(SCENARIOS[:2])]
+    )
+    assert batch.seeds == [0, 1]
+    assert batch.run(steps=3) == [
+        BaselineModel(**params).run(steps=3) for params in SCENARIOS[:2]
+    ]
+    with pytest.raises(ValueError):
+        BatchedBaselineModel([BaselineModel(vectorized=True)])
+    model = BaselineModel()
+    model.stocks.water.set_flow(lambda: 1.0)
+    with pytest.raises(ValueError):
+        BatchedBaselineModel([model])
+    model = BaselineModel()
+    model.technologies = ["solar", "wind"]
+    with pytest.raises(ValueError, match="technologies"):
+        BatchedBaselineModel([model])
+    with pytest.raises(ValueError, match="monitors"):
+        BatchedBaselineModel.from_scenarios([{"monitors": {"water": object()}}])
@@ -0,0 +1,72 @@
+import pytest
+
+import llm_batching
+
+
+@pytest.fixture
+def run_benchmarks(reload_modules):
+    """``benchmarks/run_benchmarks.py`` on freshly reloaded model classes."""
+    return reload_modules(
+        "src.models.baseline",
+        "src.models.batched",
+        "src.models",
+        "src.doughnut_abm",
+        "run_benchmarks",
+    )[-1]
+
+
+def test_suite_reports_throughput_and_memory(run_benchmarks):
+    names = ["baseline_model", "baseline_model_vectorized", "market_clear"]
+    report = run_benchmarks.run_suite(names, max_agents=100, steps=2)
+    assert [r["benchmark"] for r in report["results"]] == names
+    for result in report["results"]:
+        assert result["agents"] == 100
+        assert result["agent_steps_per_sec"] > 0
+        assert result["peak_bytes"] > 0
+
+
+def test_compare_flags_regressions(run_benchmarks):
+    baseline = {
+        "results": [
+            {"benchmark": "a", "agents": 100, "agent_steps_per_sec": 1000.0},
+            {"benchmark": "b", "agents": 100, "agent_steps_per_sec": 1000.0},
+        ]
+    }
+    report = {
+        "results": [
+            {"benchmark": "a", "agents": 100, "agent_steps_per_sec": 850.0},
+            {"benchmark": "b", "agents": 100, "agent_steps_per_sec": 700.0},
+            {"benchmark": "c", "agents": 100, "agent_steps_per_sec": 1.0},
+        ]
+    }
+    regressions = run_benchmarks.compare(report, baseline, tolerance=0.2)
+    assert len(regressions) == 1
+    assert regressions[0].startswith("b @ 100 agents")
+
+
+def test_population_layouts_use_less_memory_than_agents():
+    import agent_memory
+
+    households = agent_memory.bytes_per_agent("Household", 1000)
+    assert agent_memory.bytes_per_agent("HouseholdPopulation", 1000) < households
+    assert agent_memory.bytes_per_agent("HouseholdView", 1000) < households
+
+
+def test_import_src_is_lazy():
+    import startup
+
+    for module in ("src", "src.data", "src.metrics"):
+        result = startup.import_time(module)
+        assert result["heavy_imports"] == []
+        assert result["cumulative_ms"] > 0
+
+
+def test_llm_batching_matches_sequential_responses():
+    result = llm_batching.measure(
+        agents=40, distinct=5, latency_ms=1.0, concurrency=2
+    )
+    assert result["sequential_calls"] == {"calls": 80, "peak_concurrency": 1}
+    assert result["batched_calls"]["calls"] == 5
+    assert 1 <= result["batched_calls"]["peak_concurrency"] <= 2
+    assert result["cache"]["misses"] == 5
+    assert result["cache"]["hits"] == 5
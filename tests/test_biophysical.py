@@ -1,12 +1,6 @@
-import sys
-import types
-from pathlib import Path
+import pytest
 
-sys.path.append(str(Path(__file__).resolve().parents[1]))
-
-sys.modules.setdefault("mesa", types.ModuleType("mesa")).Agent = object
-
-from src.biophysics.stocks import BioPhysicalStocks, StockModel
+from src.biophysics.stocks import BioPhysicalStocks, LinearFlow, StockModel
 
 
 def test_stockmodel_step_and_apply():
@@ -28,3 +22,70 @@ def test_biophysicalstocks_step():
     assert stocks.water.value == 2.0
     assert stocks.biomass.value == 3.0
     assert stocks.minerals.value == 4.0
+
+
+def test_stocks_share_one_state_vector():
+    stocks = BioPhysicalStocks(carbon_budget=1.0, water=2.0)
+    stocks.water.apply(3.0)
+    stocks.apply([1.0, 0.0, 0.0, 1.0])
+    assert list(stocks.state) == [2.0, 5.0, 0.0, 1.0]
+    assert stocks.minerals.value == 1.0
+
+
+def test_advance_matches_stepping_for_linear_flows():
+    stepped = BioPhysicalStocks(carbon_budget=100.0, water=50.0, biomass=10.0)
+    jumped = BioPhysicalStocks(carbon_budget=100.0, water=50.0, biomass=10.0)
+    for stocks in (stepped, jumped):
+        stocks.carbon_budget.set_flow(-1.5)
+        stocks.water.set_flow(LinearFlow(rate=2.0, coefficient=-0.05))
+        stocks.biomass.flow = LinearFlow(coefficient=0.01)
+    for _ in range(200):
+        stepped.step(dt=0.5)
+    jumped.advance(200, dt=0.5)
+    assert list(jumped.state) == pytest.approx(list(stepped.state))
+    assert jumped.carbon_budget.value == -50.0
+
+
+def test_advance_steps_through_callable_flows():
+    stocks = BioPhysicalStocks(water=1.0)
+    stocks.water.set_flow(lambda: stocks.water.value)
+    stocks.advance(3)
+    assert stocks.water.value == 8.0
+    model = StockModel(initial=1.0, flow=LinearFlow(coefficient=1.0))
+    model.advance(3)
+    assert model.value == 8.0
+
+
+def test_callable_flows_are_evaluated_in_stock_order():
+    stocks = BioPhysicalStocks(carbon_budget=1.0)
+    stocks.carbon_budget.set_flow(lambda: 1.0)
+    stocks.water.set_flow(lambda: stocks.carbon_budget.value)
+    stocks.step()
+    # water sees the carbon budget already updated this tick
+    assert stocks.water.value == 2.0
+
+
+def test_stockmodel_keeps_integrator_api():
+    model = StockModel(5.0)
+    assert model.integ.state == 5.0
+    model.integ.func = lambda: 1.5
+    model.step()
+    assert model.value == 6.5
+    stocks = BioPhysicalStocks(water=2.0)
+    stocks.water.integ.state = 4.0
+    assert stocks.state[1] == 4.0
+
+
+def test_agent_updates_do_not_write_the_state_vector():
+    stocks = BioPhysicalStocks(water=2.0)
+    vector = stocks.state
+    vector.flags.writeable = False
+    for _ in range(4):
+        stocks.water.apply(-0.5)
+        stocks.carbon_budget.apply(1.0)
+    vector.flags.writeable = True
+    assert list(stocks.state) == [4.0, 0.0, 0.0, 0.0]
+    stocks.state = [1.0, 2.0, 3.0, 4.0]
+    stocks.water.set_flow(LinearFlow(coefficient=1.0))
+    stocks.step()
+    assert stocks.water.value == 4.0
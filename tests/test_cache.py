@@ -0,0 +1,59 @@
+import json
+import os
+
+from src.cache import ResultCache, code_version
+
+CONFIG = {
+    "steps": 3,
+    "agents": {"households": 2, "firms": 1},
+    "initial_stocks": {"water": 10.0},
+}
+
+
+def test_run_model_returns_cached_results(run_simulation, tmp_path):
+    cache = run_simulation.open_cache(tmp_path)
+    first = run_simulation.run_model(CONFIG, 1, cache=cache)
+    moved = dict(CONFIG, output_dir="elsewhere")
+    again = run_simulation.run_model(moved, 1, cache=cache)
+    assert again == first
+    assert (cache.stats.hits, cache.stats.misses, cache.stats.stores) == (1, 1, 1)
+    run_simulation.run_model(CONFIG, 2, cache=cache)
+    assert cache.stats.misses == 2 and len(cache) == 2
+
+    bypass = run_simulation.open_cache(tmp_path, bypass=True)
+    assert run_simulation.run_model(CONFIG, 1, cache=bypass) == first
+    assert (bypass.stats.hits, bypass.stats.bypassed, bypass.stats.stores) == (0, 1, 1)
+
+
+def test_code_version_is_part_of_the_key(tmp_path):
+    (tmp_path / "a.py").write_text("x = 1\n")
+    (tmp_path / "b.py").write_text("x = 2\n")
+    old, new = code_version(tmp_path / "a.py"), code_version(tmp_path / "b.py")
+    assert old != new
+    key = ResultCache(tmp_path / "cache", code_version=old).key(CONFIG, 0)
+    assert key == ResultCache(tmp_path / "cache", code_version=old).key(CONFIG, 0)
+    assert key != ResultCache(tmp_path / "cache", code_version=new).key(CONFIG, 0)
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    records = [{"step": 0, "water": 1.0}] * 10
+    entry = len(json.dumps(records))
+    cache = ResultCache(tmp_path, max_bytes=3 * entry, code_version="v")
+    for seed in range(3):
+        cache.put(CONFIG, seed, records)
+    assert cache.get(CONFIG, 0) == records
+    cache.put(CONFIG, 3, records)
+    assert cache.stats.evictions == 1
+    assert cache.get(CONFIG, 1) is None
+    assert cache.get(CONFIG, 0) == records
+    assert cache.size_bytes == 3 * entry
+
+    # Recency survives reopening the directory.
+    stamp = os.stat(tmp_path / f"{cache.key(CONFIG, 2)}.json").st_mtime_ns
+    os.utime(tmp_path / f"{cache.key(CONFIG, 0)}.json", ns=(stamp + 10, stamp + 10))
+    os.utime(tmp_path / f"{cache.key(CONFIG, 3)}.json", ns=(stamp + 20, stamp + 20))
+    reopened = ResultCache(tmp_path, max_bytes=3 * entry, code_version="v")
+    reopened.put(CONFIG, 4, records)
+    assert reopened.get(CONFIG, 2) is None
+    assert reopened.stats.hit_rate == 0.0
+    assert len(reopened) == 3
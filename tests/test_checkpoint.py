@@ -0,0 +1,143 @@
+import numpy as np
+import pytest
+
+STOCKS = {"carbon_budget": 50.0, "water": 40.0, "biomass": 30.0, "minerals": 20.0}
+
+
+def _configure(model):
+    model.stocks.water.set_flow(0.3)
+    gov = next(a for a in model.agents if a.unique_id == "gov")
+    gov.tax_rate = 0.1
+    model.technologies = ["a", "b", "c", "d", "e", "f"]
+    if model.vectorized:
+        model.household_population.income[:] = 0.7
+        model.household_population.rng = np.random.default_rng(7)
+    else:
+        for agent in model.agents[:3]:
+            agent.income = 0.7
+
+
+@pytest.mark.parametrize("vectorized", [False, True])
+def test_restored_run_continues_bit_identically(
+    baseline_model, tmp_path, vectorized
+):
+    reference = baseline_model(
+        households=3, firms=2, initial_stocks=STOCKS, vectorized=vectorized
+    )
+    _configure(reference)
+    expected = reference.run(steps=10)
+
+    model = baseline_model(
+        households=3, firms=2, initial_stocks=STOCKS, vectorized=vectorized
+    )
+    _configure(model)
+    model.run(steps=4)
+    model.save_checkpoint(tmp_path / "ckpt.npz")
+
+    restored = baseline_model.load_checkpoint(tmp_path / "ckpt.npz")
+    assert restored.tick == 4
+    assert restored.run(steps=6) == expected[4:]
+    assert restored.recorder.to_records() == expected
+    assert restored.market.prices == reference.market.prices
+    assert list(restored.stocks.state) == list(reference.stocks.state)
+    assert restored.agents[-2].revenue == reference.agents[-2].revenue
+    if vectorized:
+        pops = (restored.household_population, reference.household_population)
+        assert list(pops[0].technology) == list(pops[1].technology)
+        assert list(pops[0].wealth) == list(pops[1].wealth)
+    else:
+        choices = [[a.technology for a in m.agents[:3]] for m in (restored, reference)]
+        assert choices[0] == choices[1]
+
+
+def test_periodic_checkpoints_during_run(baseline_model, tmp_path):
+    model = baseline_model(households=2, firms=1, initial_stocks=STOCKS)
+    expected = model.run(
+        steps=10, checkpoint_every=5, checkpoint_path=tmp_path / "ckpt_{tick}.npz"
+    )
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "ckpt_10.npz",
+        "ckpt_5.npz",
+    ]
+    restored = baseline_model.load_checkpoint(tmp_path / "ckpt_5.npz")
+    assert len(restored.recorder) == 5
+    assert restored.run(steps=5) == expected[5:]
+
+
+def test_checkpoint_keeps_market_orders_and_technologies(baseline_model, tmp_path):
+    model = baseline_model(households=2, firms=1, initial_stocks=STOCKS)
+    model.technologies = ["solar", "wind"]
+    model.market.per_trade = True
+    model.market.submit_order(model.agents[1], "water", 2.0)
+    model.save_checkpoint(tmp_path / "ckpt.npz")
+
+    restored = baseline_model.load_checkpoint(tmp_path / "ckpt.npz")
+    assert restored.technologies == ["solar", "wind"]
+    assert restored.market.per_trade
+    assert restored.market._orders == [(restored.agents[1], "water", 2.0)]
+
+    model.market.submit_order(object(), "water", 1.0)
+    with pytest.raises(ValueError):
+        model.save_checkpoint(tmp_path / "bad.npz")
+
+
+def _monitors():
+    from src.streaming import BoundaryTracker, OvershootTracker, StreamingGini
+
+    return {
+        "water": OvershootTracker(35.0, source=lambda m: m.stocks.water.value),
+        "walk": BoundaryTracker(0.0, 38.0, source=lambda m: m.stocks.water.value),
+        "gini": StreamingGini(source=lambda m: m.household_wealth()),
+    }
+
+
+def test_restored_monitors_match_uninterrupted_run(baseline_model, tmp_path):
+    from src.streaming import results
+
+    reference = baseline_model(
+        households=3, firms=2, initial_stocks=STOCKS, monitors=_monitors()
+    )
+    _configure(reference)
+    reference.run(steps=10)
+
+    model = baseline_model(
+        households=3, firms=2, initial_stocks=STOCKS, monitors=_monitors()
+    )
+    _configure(model)
+    model.run(steps=4)
+    model.save_checkpoint(tmp_path / "ckpt.npz")
+
+    with pytest.raises(ValueError):
+        baseline_model.load_checkpoint(tmp_path / "ckpt.npz")
+    restored = baseline_model.load_checkpoint(
+        tmp_path / "ckpt.npz", monitors=_monitors()
+    )
+    restored.run(steps=6)
+    assert results(restored.monitors) == results(reference.monitors)
+
+
+@pytest.mark.parametrize("event_driven", [False, True])
+def test_doughnut_resumes_technology_choices(reload_modules, tmp_path, event_driven):
+    (doughnut_abm,) = reload_modules("src.doughnut_abm")
+
+    def build():
+        model = doughnut_abm.DoughnutABM(
+            N_households=4, N_firms=1, years=8, event_driven=event_driven
+        )
+        model.technologies = ["a", "b", "c", "d", "e", "f"]
+        model.households[0].income = 1.0
+        return model
+
+    reference = build()
+    expected = reference.run()
+
+    model = build()
+    model.years = 3
+    model.run()
+    model.years = 8
+    model.save_checkpoint(tmp_path / "abm.npz")
+    restored = doughnut_abm.DoughnutABM.load_checkpoint(tmp_path / "abm.npz")
+    assert restored.technologies == reference.technologies
+    assert restored.run().equals(expected)
+    choices = [[h.technology for h in m.households] for m in (restored, reference)]
+    assert choices[0] == choices[1]
@@ -1,4 +1,7 @@
+import os
+
 import pandas as pd
+import pytest
 
 from src.data.io import read_inventory, read_io_table
 from src.data.normalise import normalise_per_capita
@@ -18,3 +21,150 @@ def test_normalise_per_capita():
     result = normalise_per_capita(df, population=10)
     assert result.iloc[0, 0] == 1
     assert result.iloc[1, 1] == 4
+
+
+def test_save_and_load_ensemble(tmp_path):
+    from src.data import load_ensemble, run_matrix, save_ensemble
+
+    runs = [
+        [{"step": s, "water": 10.0 * r + s} for s in range(3)] for r in range(2)
+    ]
+    path = tmp_path / "ensemble.npy"
+    save_ensemble(runs, path, columns=["water"])
+    data = load_ensemble(path)
+    assert list(data["run_id"]) == [0, 0, 0, 1, 1, 1]
+    assert run_matrix(data, "water").tolist() == [[0.0, 1.0, 2.0], [10.0, 11.0, 12.0]]
+
+
+def _write_matrix(path, labels, values):
+    lines = ["sector," + ",".join(labels)]
+    lines += [
+        label + "," + ",".join(str(v) for v in row) for label, row in zip(labels, values)
+    ]
+    path.write_text("\n".join(lines) + "\n")
+
+
+def test_open_io_matrix_caches_and_selects_regions(tmp_path):
+    import numpy as np
+
+    from src.data import open_io_matrix
+
+    labels = ["A:agri", "A:mfg", "B:agri", "B:mfg"]
+    values = np.arange(16, dtype=float).reshape(4, 4)
+    csv = tmp_path / "mrio.csv"
+    _write_matrix(csv, labels, values.tolist())
+    cache = tmp_path / "cache"
+
+    matrix = open_io_matrix(csv, cache_dir=cache)
+    assert isinstance(matrix.data, np.memmap)
+    assert matrix.shape == (4, 4)
+    assert (cache / "mrio.csv.matrix").exists()
+    np.testing.assert_array_equal(matrix.data, values)
+    assert matrix.regions() == ["A", "B"]
+    np.testing.assert_array_equal(matrix.region("B"), values[2:, 2:])
+    np.testing.assert_array_equal(matrix.region("A", "B"), values[:2, 2:])
+    np.testing.assert_array_equal(
+        matrix.block(["B:mfg"], ["A:agri", "B:agri"]), [[12.0, 14.0]]
+    )
+    assert [start for start, _ in matrix.chunks(3)] == [0, 3]
+
+    _write_matrix(csv, labels[:2], [[1, 2], [3, 4]])
+    os.utime(csv, ns=(0, 0))
+    assert open_io_matrix(csv, cache_dir=cache).shape == (2, 2)
+
+
+def test_convert_io_table_streams_chunks_and_rejects_ragged_rows(tmp_path):
+    import numpy as np
+
+    from src.data.io import convert_io_table, open_io_matrix
+
+    labels = [f"s{i}" for i in range(7)]
+    values = np.arange(49, dtype=float).reshape(7, 7) / 3
+    csv = tmp_path / "io.csv"
+    _write_matrix(csv, labels, values.tolist())
+    convert_io_table(csv, chunk_rows=2)
+    np.testing.assert_array_equal(open_io_matrix(csv).data, values)
+
+    csv.write_text("sector,a,b\na,1,2\nb,3\n")
+    with pytest.raises(ValueError):
+        convert_io_table(csv)
+
+
+def test_normalise_in_place_and_chunked(tmp_path):
+    import numpy as np
+
+    from src.data import normalise_matrix, open_io_matrix
+
+    df = pd.DataFrame({"a": [10, 20]})
+    assert normalise_per_capita(df, 10, inplace=True) is df
+    assert df.iloc[1, 0] == 2
+
+    csv = tmp_path / "io.csv"
+    _write_matrix(csv, ["x", "y", "z"], [[2, 4, 6], [8, 10, 12], [14, 16, 18]])
+    matrix = open_io_matrix(csv, mode="c")
+    result = normalise_matrix(matrix.data, 2.0, chunk_rows=2)
+    assert result is matrix.data
+    assert result[2].tolist() == [7.0, 8.0, 9.0]
+    assert open_io_matrix(csv).data[2].tolist() == [14.0, 16.0, 18.0]
+
+    source = open_io_matrix(csv)
+    per_region = normalise_matrix(source.data, [1.0, 2.0, 3.0], out=tmp_path / "n.npy")
+    assert per_region[0].tolist() == [2.0, 2.0, 2.0]
+    assert np.load(tmp_path / "n.npy")[1].tolist() == [8.0, 5.0, 4.0]
+    with pytest.raises(ValueError):
+        normalise_matrix(source.data, [1.0, 0.0, 1.0], out=tmp_path / "bad.npy")
+
+
+def test_normalise_io_matrix_keeps_cache_raw(tmp_path):
+    from src.data import normalise_matrix, open_io_matrix
+
+    csv = tmp_path / "io.csv"
+    _write_matrix(csv, ["x", "y"], [[2, 4], [6, 8]])
+    scaled = normalise_matrix(open_io_matrix(csv, mode="c"), 2.0)
+    assert scaled.row_labels == ["x", "y"]
+    assert scaled.data[1].tolist() == [3.0, 4.0]
+    assert open_io_matrix(csv).data[1].tolist() == [6.0, 8.0]
+
+    written = open_io_matrix(csv, mode="r+")
+    normalise_matrix(written, 2.0)
+    assert open_io_matrix(csv).data[1].tolist() == [6.0, 8.0]
+
+
+def test_read_csv_types_columns_once(tmp_path):
+    from array import array
+
+    csv = tmp_path / "inventory.csv"
+    csv.write_text('name,amount,code\n"a, b",1.5,x\nc,2,7\n\nd,3.25,y\n')
+    df = pd.read_csv(csv)
+    assert df.shape == (3, 3)
+    assert isinstance(df["amount"], array) and list(df["amount"]) == [1.5, 2.0, 3.25]
+    assert df["name"] == ["a, b", "c", "d"]
+    assert df["code"] == ["x", 7.0, "y"]
+    assert df.select_dtypes("number").columns == ["amount"]
+
+    copy = df.copy()
+    copy[["amount"]] = copy[["amount"]].div(0.5)
+    assert copy.iloc[2, 1] == 6.5 and df.iloc[2, 1] == 3.25
+
+
+def test_read_csv_falls_back_when_a_late_cell_is_not_numeric(tmp_path):
+    csv = tmp_path / "late.csv"
+    csv.write_text("a,b\n1,2\n3,4\nn/a,5\n6\n")
+    df = pd.read_csv(csv, sample_rows=2)
+    assert df["a"] == [1.0, 3.0, "n/a", 6.0]
+    assert list(df["b"]) == [2.0, 4.0, 5.0, ""]
+    assert df.equals(pd.DataFrame({"a": [1.0, 3.0, "n/a", 6.0], "b": [2, 4, 5, ""]}))
+
+
+def test_read_csv_falls_back_without_numpy_quotechar(tmp_path, monkeypatch):
+    import numpy as np
+
+    csv = tmp_path / "inventory.csv"
+    csv.write_text('name,amount\n"a, b",1.5\nc,2\n')
+    expected = pd.read_csv(csv)
+
+    def old_loadtxt(*args, quotechar=None, **kwargs):
+        raise TypeError("loadtxt() got an unexpected keyword argument 'quotechar'")
+
+    monkeypatch.setattr(np, "loadtxt", old_loadtxt)
+    assert pd.read_csv(csv).equals(expected)
@@ -1,8 +1,8 @@
+import math
 import sys
 import types
-from pathlib import Path
 
-sys.path.append(str(Path(__file__).resolve().parents[1]))
+import pytest
 
 mesa_mod = sys.modules.setdefault("mesa", types.ModuleType("mesa"))
 
@@ -12,7 +12,6 @@ class DummyAgent:
         self.unique_id = unique_id
         self.model = model
 
-
 import importlib
 
 import src.agents as ag
@@ -27,7 +26,6 @@ def _reload_agents() -> None:
     importlib.reload(ag)
     importlib.reload(sys.modules.get("src.doughnut_abm"))
 
-
 from src.doughnut_abm import BiophysicalStock, DoughnutABM
 
 
@@ -46,3 +44,105 @@ def test_doughnut_abm_run():
     df = model.run()
     assert df.shape[0] == 2
     assert "CarbonStock" in df.columns
+
+
+def test_agent_wealth_is_recorded_per_step():
+    _reload_agents()
+    model = DoughnutABM(N_households=2, N_firms=1, years=3, bio_max=100)
+    model.households[1].income = 2.0
+    model.run()
+    agents = model.datacollector.get_agent_vars_dataframe()
+    assert agents.shape == (9, 3)
+    assert list(agents["AgentID"])[:3] == [0, 1, 2]
+    assert list(agents["Step"])[3:6] == [1, 1, 1]
+    wealth = model.datacollector.agent_array[:, :, 0]
+    assert wealth[-1, 1] == model.households[1].wealth
+
+
+def test_need_satisfaction_aggregates_track_assignments():
+    _reload_agents()
+    model = DoughnutABM(N_households=3, N_firms=0, years=1, social_floor=[1, 1, 2, 2])
+    model.households[0].needs_vector = [2.0, 2.0, 2.0, 2.0]
+    model.households[1].needs_vector = [1.0, 0.5, 3.0, 1.0]
+    model.households[1].needs_vector = [1.0, 0.5, 3.0, 0.0]
+    expected = sum(sum(h.needs_vector) / 4 for h in model.households) / 3
+    assert model._avg_need_satisfaction() == expected
+    assert list(model.needs_ledger.shortfall) == [1, 2, 1, 2]
+    df = model.run()
+    assert df["FloorShortfall1"][0] == 2
+
+
+def test_needs_vector_is_read_only_and_bulk_ledger_is_exact():
+    _reload_agents()
+    model = DoughnutABM(N_households=2, N_firms=0, years=1)
+    with pytest.raises(TypeError):
+        model.households[0].needs_vector[0] += 1.0
+    assert model.needs_ledger.mean() == 0.0
+
+    values = [1e16, 1.0, -1e16, 0.1, 0.2, 0.3]
+    households = [types.SimpleNamespace(needs_vector=(v, 2.0)) for v in values]
+    ledger = ag.NeedsLedger([0.5, 1.0])
+    ledger.register_households(households)
+    assert ledger.sums()[0] == math.fsum(values)
+    assert list(ledger.shortfall) == [4, 0]
+    assert [h._needs_row for h in households] == list(range(6))
+    ledger.update(0, (0.0, 0.0))
+    assert ledger.sums()[0] == math.fsum(values[1:])
+    assert list(ledger.shortfall) == [5, 1]
+
+
+def test_checkpoint_resumes_remaining_years(tmp_path):
+    _reload_agents()
+
+    def build():
+        model = DoughnutABM(N_households=3, N_firms=1, years=6, bio_max=50)
+        for i, h in enumerate(model.households):
+            h.income = 0.5 + i
+            h.needs_vector = [1.0 + i, 0.5, 2.0, 0.0]
+        return model
+
+    expected = build().run()
+
+    model = build()
+    model.years = 2
+    model.run()
+    model.years = 6
+    model.save_checkpoint(tmp_path / "abm.npz")
+    restored = DoughnutABM.load_checkpoint(tmp_path / "abm.npz")
+    assert restored.tick == 2
+    assert restored.households[2].wealth == 5.0
+    assert restored.tax_base.income == model.tax_base.income
+    assert restored.run().equals(expected)
+    assert restored.datacollector.agent_array.shape == (6, 4, 1)
+
+
+def test_monitors_track_carbon_without_recording():
+    _reload_agents()
+    from src.streaming import BoundaryTracker
+
+    walk = BoundaryTracker(0.0, 99.0, source=lambda m: m.bio_stocks["carbon"].value)
+    model = DoughnutABM(
+        N_households=1,
+        N_firms=0,
+        years=3,
+        bio_max=100,
+        monitors={"carbon": walk},
+        record=False,
+    )
+    df = model.run()
+    assert df.shape[0] == 0
+    assert walk.count == 3
+    assert walk.time_outside == 3
+
+
+def test_profiler_times_each_agent_class():
+    _reload_agents()
+    from src.instrumentation import Profiler
+
+    plain = DoughnutABM(N_households=3, N_firms=2, years=3, bio_max=100).run()
+    profiler = Profiler(track_allocations=False)
+    model = DoughnutABM(N_households=3, N_firms=2, years=3, bio_max=100, profiler=profiler)
+    assert model.run().equals(plain)
+    for name in ("Household", "Firm"):
+        assert profiler.phases[f"step;schedule;{name}"].count == 3
+    assert "step" not in vars(model.households[0])
@@ -0,0 +1,24 @@
+import json
+
+from src.instrumentation import Profiler
+
+
+def test_profiler_records_phases_per_agent_class(baseline_model):
+    profiler = Profiler()
+    model = baseline_model(households=2, firms=1, profiler=profiler)
+    records = model.run(steps=3)
+    assert len(records) == 3
+    summary = json.loads(profiler.to_json())
+    for key in ("step;agents;Household", "step;agents;Firm", "step;stocks", "record"):
+        assert summary[key]["count"] == 3
+        assert sum(summary[key]["histogram_ns"].values()) == 3
+    folded = dict(line.rsplit(" ", 1) for line in profiler.to_folded().splitlines())
+    assert "step;market" in folded
+
+
+def test_profiled_run_matches_plain_run(baseline_model):
+    plain = baseline_model(households=3, firms=2, vectorized=True).run(steps=4)
+    profiler = Profiler(track_allocations=False)
+    model = baseline_model(households=3, firms=2, vectorized=True, profiler=profiler)
+    assert model.run(steps=4) == plain
+    assert profiler.phases["step;populations;FirmPopulation"].blocks == 0
@@ -1,11 +1,3 @@
-import sys
-import types
-from pathlib import Path
-
-sys.path.append(str(Path(__file__).resolve().parents[1]))
-
-sys.modules.setdefault("mesa", types.ModuleType("mesa")).Agent = object
-
 from src.biophysics.stocks import BioPhysicalStocks
 from src.markets.market import Market
 
@@ -31,3 +23,44 @@ def test_price_adjustment_on_low_stock():
     market.buy(agent, "carbon_budget", 10)
     assert agent.wealth < 100.0
     assert market.prices["carbon_budget"] > 10.0
+
+
+def _orders(agents):
+    return [
+        (agents[0], "carbon_budget", 5.0),
+        (agents[1], "carbon_budget", 3.0),
+        (agents[0], "water", -2.0),
+    ]
+
+
+def test_clear_settles_orders_in_one_pass():
+    stocks = BioPhysicalStocks(carbon_budget=80, water=50)
+    prices = {"carbon_budget": 2.0, "water": 1.0, "biomass": 1.0, "minerals": 1.0}
+    market = Market(stocks, base_prices=prices)
+    agents = [DummyAgent(100.0), DummyAgent(100.0)]
+    market.submit_orders(_orders(agents))
+    market.clear()
+    assert stocks.carbon_budget.value == 72.0
+    assert stocks.water.value == 52.0
+    assert agents[0].wealth == 100.0 - 10.0 + 2.0
+    assert agents[1].wealth == 94.0
+
+
+def test_per_trade_clearing_matches_buy_and_sell():
+    prices = {"carbon_budget": 2.0, "water": 1.0, "biomass": 1.0, "minerals": 1.0}
+    limits = {"carbon_budget": 100.0, "water": 100.0}
+    replayed = Market(
+        BioPhysicalStocks(carbon_budget=80, water=50),
+        dict(prices),
+        limits,
+        per_trade=True,
+    )
+    direct = Market(BioPhysicalStocks(carbon_budget=80, water=50), dict(prices), limits)
+    a, b = [DummyAgent(100.0), DummyAgent(100.0)], [DummyAgent(100.0), DummyAgent(100.0)]
+    replayed.submit_orders(_orders(a))
+    replayed.clear()
+    direct.buy(b[0], "carbon_budget", 5.0)
+    direct.buy(b[1], "carbon_budget", 3.0)
+    direct.sell(b[0], "water", 2.0)
+    assert replayed.prices == direct.prices
+    assert [x.wealth for x in a] == [x.wealth for x in b]
@@ -0,0 +1,52 @@
+import math
+
+import numpy as np
+import pytest
+
+from src.metrics import (
+    ensemble_inequality_index,
+    ensemble_overshoot_depth,
+    ensemble_return_time_to_boundaries,
+    ensemble_welfare_indices,
+    inequality_index,
+    overshoot_depth,
+    return_time_to_boundaries,
+    welfare_indices,
+)
+
+RNG = np.random.default_rng(3)
+MATRIX = RNG.normal(1.0, 0.6, size=(25, 12))
+MATRIX[0] = 1.0  # never leaves the boundaries
+MATRIX[1, 3:] = 5.0  # leaves and never returns
+
+
+def test_ensemble_series_metrics_match_scalar_functions():
+    rows = [list(row) for row in MATRIX]
+    assert list(ensemble_overshoot_depth(MATRIX, 0.5)) == [
+        overshoot_depth(row, 0.5) for row in rows
+    ]
+    assert list(ensemble_return_time_to_boundaries(MATRIX, 0.2, 1.8)) == [
+        return_time_to_boundaries(row, 0.2, 1.8) for row in rows
+    ]
+    welfare = ensemble_welfare_indices(MATRIX)
+    for i, row in enumerate(rows):
+        for name, value in welfare_indices(row).items():
+            assert math.isclose(welfare[name][i], value, rel_tol=1e-12)
+
+
+def test_ensemble_inequality_index_matches_scalar_gini():
+    wealth = RNG.exponential(2.0, size=(10, 50))
+    wealth[0] = 0.0
+    expected = [inequality_index(list(row)) for row in wealth]
+    assert ensemble_inequality_index(wealth) == pytest.approx(expected, rel=1e-12)
+    assert ensemble_inequality_index(wealth)[0] == 0.0
+
+
+def test_ensemble_metrics_handle_empty_series_and_reject_vectors():
+    empty = np.zeros((3, 0))
+    assert list(ensemble_overshoot_depth(empty, 1.0)) == [0.0] * 3
+    assert list(ensemble_inequality_index(empty)) == [0.0] * 3
+    assert list(ensemble_return_time_to_boundaries(empty, 0, 1)) == [0] * 3
+    assert list(ensemble_welfare_indices(empty)["rawlsian"]) == [0.0] * 3
+    with pytest.raises(ValueError):
+        ensemble_overshoot_depth([1.0, 2.0], 1.0)
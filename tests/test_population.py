@@ -0,0 +1,88 @@
+import pytest
+
+from src.agents.population import FirmPopulation, HouseholdPopulation
+
+STOCKS = {"carbon_budget": 500.0, "water": 400.0, "biomass": 300.0, "minerals": 200.0}
+
+
+def test_household_population_step_accrues_wealth_and_draws_stocks(baseline_model):
+    model = baseline_model(households=0, firms=0, has_government=False, has_bank=False)
+    pop = HouseholdPopulation(3, model=model, income=[1.0, 2.0, 3.0])
+    pop.step()
+    pop.step()
+    assert list(pop.wealth) == [2.0, 4.0, 6.0]
+    assert model.stocks.carbon_budget.value == -6.0
+    assert list(pop.carbon_rate) == [1.0, 1.0, 1.0]
+
+
+def test_vectorized_baseline_matches_per_agent_path(baseline_model):
+    per_agent = baseline_model(households=7, firms=2, initial_stocks=STOCKS)
+    vectorized = baseline_model(
+        households=7, firms=2, initial_stocks=STOCKS, vectorized=True
+    )
+    assert len(vectorized.agents) == len(per_agent.agents) - 9
+    expected = per_agent.run(steps=10)
+    result = vectorized.run(steps=10)
+    for exp, res in zip(expected, result):
+        assert res == pytest.approx(exp)
+    assert vectorized.market.prices == pytest.approx(per_agent.market.prices)
+
+
+def test_from_agents_copies_household_state(baseline_model):
+    model = baseline_model(households=3, firms=0)
+    model.agents[1].income = 5.0
+    pop = HouseholdPopulation.from_agents(model.agents[:3])
+    assert list(pop.income) == [0.0, 5.0, 0.0]
+    assert pop.needs_vector.shape == (3, 4)
+
+
+def test_from_agents_does_not_count_the_tax_base_twice(baseline_model):
+    model = baseline_model(households=2, firms=1)
+    model.agents[0].income = 2.0
+    model.agents[1].income = 3.0
+    model.agents[2].output = 4.0
+    assert (model.tax_base.income, model.tax_base.output) == (5.0, 4.0)
+    households = HouseholdPopulation.from_agents(model.agents[:2], model=model)
+    firms = FirmPopulation.from_agents(model.agents[2:3], model=model)
+    assert (model.tax_base.income, model.tax_base.output) == (5.0, 4.0)
+    households.income[:] = 1.0
+    firms.step()
+    households.step()
+    assert model.tax_base.income == 2.0
+    assert model.tax_base.output == firms.taxable()
+
+
+def test_firm_population_output_and_extraction(baseline_model):
+    model = baseline_model(households=0, firms=0, has_government=False, has_bank=False)
+    pop = FirmPopulation(2, model=model, capital=[2.0, 3.0], productivity=1.5)
+    pop.step()
+    assert list(pop.output) == [3.0, 4.5]
+    assert model.stocks.water.value == -2.0
+    assert model.stocks.minerals.value == pytest.approx(-0.6)
+
+
+def test_views_expose_agent_attributes_over_columns():
+    households = HouseholdPopulation(3, income=[1.0, 2.0, 3.0])
+    view = households[1]
+    assert view.income == 2.0
+    view.wealth = 5.0
+    view.water_rate = 0.25
+    view.needs_vector = [1.0, 2.0, 3.0, 4.0]
+    assert households.wealth[1] == 5.0
+    assert households.rates[1, 1] == 0.25
+    assert list(households.needs_vector[1]) == [1.0, 2.0, 3.0, 4.0]
+    assert not hasattr(view, "__dict__")
+    assert [v.unique_id for v in households] == [0, 1, 2]
+    firms = FirmPopulation(2, capital=[1.0, 4.0])
+    firms.step()
+    assert firms[-1].output == 4.0
+    with pytest.raises(IndexError):
+        firms[2]
+
+
+def test_firm_view_ids_follow_the_households(baseline_model):
+    model = baseline_model(households=3, firms=2, vectorized=True)
+    ids = [v.unique_id for v in model.household_population]
+    ids += [v.unique_id for v in model.firm_population]
+    assert ids == [0, 1, 2, 3, 4]
+    assert FirmPopulation(1, id_offset=7)[0].unique_id == 7
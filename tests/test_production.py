@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.production import CSRMatrix, ProductionNetwork, technical_coefficients
+
+TABLE = pd.DataFrame(
+    {
+        "sector": ["agri", "mfg", "value_added"],
+        "agri": [10.0, 20.0, 70.0],
+        "mfg": [30.0, 40.0, 130.0],
+        "final": [60.0, 140.0, 0.0],
+    }
+)
+
+
+def test_csr_matrix_matches_dense_products():
+    rng = np.random.default_rng(1)
+    dense = np.where(rng.random((50, 40)) < 0.05, rng.random((50, 40)), 0.0)
+    dense[7] = 0.0
+    matrix = CSRMatrix.from_dense(dense, chunk_rows=8)
+    assert matrix.nnz == np.count_nonzero(dense)
+    np.testing.assert_array_equal(matrix.toarray(), dense)
+    x = rng.random(40)
+    np.testing.assert_allclose(matrix @ x, dense @ x, rtol=1e-14, atol=1e-14)
+    np.testing.assert_allclose(matrix.column_sums(), dense.sum(axis=0))
+
+
+def test_technical_coefficients_from_table_and_io_matrix(tmp_path):
+    coefficients, sectors = technical_coefficients(TABLE)
+    assert sectors == ["agri", "mfg"]
+    np.testing.assert_allclose(coefficients.toarray(), [[0.1, 0.15], [0.2, 0.2]])
+
+    from src.data import open_io_matrix
+
+    csv = tmp_path / "z.csv"
+    csv.write_text("sector,agri,mfg\nagri,10,30\nmfg,20,40\n")
+    matrix = open_io_matrix(csv)
+    from_matrix, labels = technical_coefficients(
+        matrix, total_output={"agri": 100.0, "mfg": 200.0}
+    )
+    assert labels == sectors
+    np.testing.assert_array_equal(from_matrix.toarray(), coefficients.toarray())
+    with pytest.raises(ValueError):
+        technical_coefficients(matrix)
+
+
+def test_network_solves_leontief_and_reuses_the_solution():
+    network = ProductionNetwork.from_table(TABLE)
+    np.testing.assert_allclose(network.solve([60.0, 140.0]), [100.0, 200.0])
+    assert network.iterations > 0
+    np.testing.assert_allclose(network.solve([60.0, 140.0]), [100.0, 200.0])
+    assert network.iterations == 0
+    np.testing.assert_allclose(network.intermediate_demand([100.0, 200.0]), [40, 60])
+
+    stuck = ProductionNetwork(CSRMatrix.from_dense(np.array([[1.5]])), max_iter=50)
+    with pytest.raises(RuntimeError):
+        stuck.solve([1.0])
+
+
+def test_baseline_production_stage_scales_output_consistently(baseline_model):
+    results = []
+    for vectorized in (False, True):
+        network = ProductionNetwork.from_table(TABLE)
+        model = baseline_model(
+            households=3, firms=4, vectorized=vectorized, production=network
+        )
+        plain = baseline_model(households=3, firms=4, vectorized=vectorized)
+        model.run(2)
+        plain.run(2)
+        assert model.tax_base.total > plain.tax_base.total
+        assert np.all(model.stocks.state <= plain.stocks.state)
+        results.append((model.stocks.state.copy(), model.tax_base.total))
+        assert list(model.firm_sectors) == [0, 1, 0, 1]
+    np.testing.assert_allclose(results[0][0], results[1][0])
+    assert results[0][1] == pytest.approx(results[1][1])
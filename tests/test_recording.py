@@ -0,0 +1,45 @@
+import types
+
+from src.recording import ArrayRecorder
+
+
+class DummyModel:
+    def __init__(self):
+        self.value = 0.0
+
+
+def test_array_recorder_grows_and_exports():
+    model = DummyModel()
+    recorder = ArrayRecorder(
+        {"value": lambda m: m.value, "double": lambda m: 2 * m.value},
+        capacity=1,
+        index="step",
+    )
+    for step in range(5):
+        model.value = step + 0.5
+        recorder.collect(model, step=step)
+    assert recorder.array.shape == (5, 2)
+    assert recorder.to_records()[2] == {"step": 2, "value": 2.5, "double": 5.0}
+    df = recorder.to_dataframe()
+    assert df.shape == (5, 3)
+    assert df.iloc[4, 1] == 4.5
+
+
+def test_array_recorder_collects_agent_reporters():
+    model = types.SimpleNamespace(
+        agents=[types.SimpleNamespace(unique_id=i, wealth=float(i)) for i in range(3)]
+    )
+    recorder = ArrayRecorder(
+        {},
+        capacity=1,
+        agent_reporters={"Wealth": lambda a: a.wealth},
+        agents=lambda m: m.agents,
+    )
+    for _ in range(2):
+        recorder.collect(model)
+        for agent in model.agents:
+            agent.wealth += 1.0
+    assert recorder.agent_array[:, :, 0].tolist() == [[0, 1, 2], [1, 2, 3]]
+    df = recorder.get_agent_vars_dataframe()
+    assert list(df["AgentID"]) == [0, 1, 2, 0, 1, 2]
+    assert df.iloc[4, 2] == 2.0
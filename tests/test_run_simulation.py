@@ -0,0 +1,54 @@
+CONFIG = {
+    "seed": 7,
+    "ensembles": 4,
+    "steps": 3,
+    "agents": {"households": 2, "firms": 1, "government": True, "bank": True},
+    "initial_stocks": {"carbon_budget": 0.5, "water": 100.0},
+    "price_sensitivity": 0.2,
+}
+
+
+def _outputs(path):
+    return {p.name: p.read_bytes() for p in sorted(path.iterdir())}
+
+
+def test_parallel_ensemble_matches_serial(run_simulation, tmp_path):
+    serial = dict(CONFIG, output_dir=str(tmp_path / "serial"))
+    parallel = dict(CONFIG, output_dir=str(tmp_path / "parallel"))
+    run_simulation.run_ensemble(serial, workers=1)
+    run_simulation.run_ensemble(parallel, workers=2)
+    expected = _outputs(tmp_path / "serial")
+    assert len(expected) == 4
+    assert _outputs(tmp_path / "parallel") == expected
+
+
+def test_npy_output_matches_csv_runs(run_simulation, tmp_path):
+    from src.data import load_ensemble, run_matrix
+
+    cfg = dict(CONFIG, output_dir=str(tmp_path), output_format="npy")
+    run_simulation.run_ensemble(cfg, workers=2)
+    data = load_ensemble(tmp_path / "ensemble.npy")
+    assert data.dtype["run_id"] == "int64"
+    assert data.dtype["water"] == "float64"
+    assert data.shape == (4 * 3,)
+    for idx in range(4):
+        records = run_simulation.run_model(cfg, seed=7 + idx)
+        block = data[data["run_id"] == idx]
+        assert list(block["step"]) == [rec["step"] for rec in records]
+        assert list(block["carbon_budget"]) == [rec["carbon_budget"] for rec in records]
+    assert run_matrix(data, "water").shape == (4, 3)
+
+
+def test_agents_draw_down_stocks_only_when_enabled(run_simulation):
+    from src.biophysics.stocks import BioPhysicalStocks
+
+    stocks = BioPhysicalStocks(**CONFIG["initial_stocks"])
+    expected = []
+    for _ in range(CONFIG["steps"]):
+        stocks.step()
+        expected.append(stocks.water.value)
+    records = run_simulation.run_model(CONFIG, 0)
+    assert [r["water"] for r in records] == expected
+
+    drawn = run_simulation.run_model(dict(CONFIG, draw_down=True), 0)
+    assert drawn[-1]["water"] < records[-1]["water"]
@@ -0,0 +1,85 @@
+import pytest
+
+from src.scheduler import EventScheduler
+
+
+@pytest.fixture
+def doughnut_model(reload_modules):
+    """``DoughnutABM`` built on freshly reloaded agent classes."""
+    (doughnut_abm,) = reload_modules("src.doughnut_abm")
+    return doughnut_abm.DoughnutABM
+
+
+class _Sleeper:
+    def __init__(self, log, name):
+        self.log = log
+        self.name = name
+
+    def step(self):
+        self.log.append(self.name)
+
+    def is_idle(self):
+        return True
+
+
+def test_idle_households_are_skipped_with_identical_results(doughnut_model):
+    models = [
+        doughnut_model(N_households=50, N_firms=3, years=4, event_driven=flag)
+        for flag in (False, True)
+    ]
+    for model in models:
+        for h in model.households[::10]:
+            h.income = 2.0
+    results = [model.run() for model in models]
+    assert results[0].equals(results[1])
+    assert [h.wealth for h in models[0].households] == [
+        h.wealth for h in models[1].households
+    ]
+    schedule = models[1].schedule
+    assert schedule.last_activated == 5 + 3
+    assert schedule.active_count == 8
+
+
+def test_income_changes_and_technologies_wake_households(doughnut_model):
+    model = doughnut_model(N_households=20, N_firms=0, years=10, event_driven=True)
+    model.step()
+    assert model.schedule.active_count == 0
+    model.households[3].income = 1.5
+    model.step()
+    assert model.schedule.last_activated == 1
+    assert model.households[3].wealth == 1.5
+
+    model.technologies = ["solar", "wind"]
+    model.step()
+    assert model.schedule.last_activated == 20
+    assert all(h.technology in ("solar", "wind") for h in model.households)
+    model.technologies = None
+    model.step()
+    model.step()
+    assert model.schedule.last_activated == 1
+
+
+def test_timers_events_and_price_thresholds_wake_in_insertion_order():
+    log = []
+    schedule = EventScheduler()
+    a, b, c = (_Sleeper(log, name) for name in "abc")
+    for agent in (a, b, c):
+        schedule.add(agent)
+    schedule.step()
+    assert log == ["a", "b", "c"] and schedule.active_count == 0
+
+    log.clear()
+    schedule.schedule(c, 4)
+    schedule.subscribe(b, "offer")
+    schedule.watch_price(a, 2.0)
+    schedule.watch_price(c, 0.5, above=False)
+    schedule.step()
+    schedule.publish("offer")
+    schedule.observe_price(2.5)
+    schedule.step()
+    schedule.observe_price(0.4)
+    schedule.step()
+    schedule.observe_price(3.0)
+    schedule.step()
+    assert log == ["a", "b", "c", "c"]
+    assert schedule.time == 5
@@ -0,0 +1,93 @@
+import math
+import types
+
+import numpy as np
+import pytest
+
+from src.metrics import (
+    inequality_index,
+    overshoot_depth,
+    return_time_to_boundaries,
+    welfare_indices,
+)
+from src.streaming import (
+    BoundaryTracker,
+    OvershootTracker,
+    StreamingGini,
+    StreamingWelfare,
+    results,
+)
+
+RNG = np.random.default_rng(11)
+
+
+@pytest.mark.parametrize(
+    "series",
+    [
+        [],
+        [1.0, 1.2, 0.9],
+        [1.0, 2.5, 3.0, 1.5, 2.6, 0.1],
+        [2.5, 3.0, 2.7],
+        list(RNG.normal(1.0, 0.8, size=200)),
+    ],
+)
+def test_trackers_match_post_hoc_metrics(series):
+    overshoot = OvershootTracker(0.5)
+    boundary = BoundaryTracker(0.0, 2.0)
+    welfare = StreamingWelfare()
+    for value in series:
+        overshoot.update(value)
+        boundary.update(value)
+        welfare.update(value)
+    assert overshoot.value == overshoot_depth(series, 0.5)
+    assert boundary.return_time == return_time_to_boundaries(series, 0.0, 2.0)
+    assert boundary.time_outside == sum(not 0.0 <= v <= 2.0 for v in series)
+    assert welfare.value == welfare_indices(series)
+
+
+def test_streaming_gini_within_sketch_accuracy():
+    wealth = RNG.lognormal(0.0, 1.5, size=20_000)
+    wealth[:100] = 0.0
+    wealth[100:150] *= -1
+    sketch = StreamingGini(relative_accuracy=0.01)
+    for chunk in np.array_split(wealth, 7):
+        sketch.update(chunk)
+    assert sketch.count == wealth.size
+    assert sketch.value == pytest.approx(inequality_index(list(wealth)), abs=0.02)
+    assert sketch.quantile(0.5) == pytest.approx(np.median(wealth), rel=0.02)
+    assert len(sketch.buckets()) < 2_000
+    assert StreamingGini().value == 0.0
+    assert math.isnan(StreamingGini().quantile(0.5))
+
+
+def test_streaming_gini_observe_applies_deltas():
+    wealth = RNG.lognormal(0.0, 1.0, size=500)
+    model = types.SimpleNamespace(wealth=wealth)
+    sketch = StreamingGini(source=lambda m: m.wealth)
+    for _ in range(5):
+        sketch.observe(model)
+        wealth[RNG.integers(0, wealth.size, size=20)] *= RNG.uniform(-2.0, 2.0)
+    sketch.observe(model)
+    fresh = StreamingGini()
+    fresh.update(wealth)
+    assert sketch.count == wealth.size
+    assert sketch.buckets() == fresh.buckets()
+
+    model.wealth = wealth[:10]
+    sketch.observe(model)
+    assert sketch.count == 10
+
+
+def test_monitor_without_source_raises():
+    with pytest.raises(ValueError):
+        OvershootTracker(0.0).observe(object())
+
+
+def test_results_reports_each_monitor():
+    monitors = {"depth": OvershootTracker(1.0), "walk": BoundaryTracker(0, 1)}
+    monitors["depth"].update(0.25)
+    monitors["walk"].update(3.0)
+    assert results(monitors) == {
+        "depth": 0.75,
+        "walk": {"return_time": 0, "time_outside": 1, "excursions": 1},
+    }
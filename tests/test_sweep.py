@@ -0,0 +1,80 @@
+from src.cache import ResultCache, config_hash
+from src.sweep import (
+    Parameter,
+    apply_overrides,
+    grid_design,
+    latin_hypercube,
+    parse_parameters,
+    run_sweep as run_design,
+)
+
+BASE = {
+    "draw_down": True,
+    "seed": 3,
+    "steps": 4,
+    "agents": {"households": 2, "firms": 1, "government": True},
+    "initial_stocks": {"carbon_budget": 10.0, "water": 10.0},
+}
+
+
+def test_latin_hypercube_samples_each_stratum_once():
+    params = parse_parameters(
+        {"a": {"low": 0.0, "high": 1.0}, "n": {"low": 0, "high": 9, "integer": True}}
+    )
+    design = latin_hypercube(params, samples=10, seed=1)
+    assert sorted(int(p["a"] * 10) for p in design) == list(range(10))
+    assert all(isinstance(p["n"], int) and 0 <= p["n"] <= 9 for p in design)
+    assert design == latin_hypercube(params, samples=10, seed=1)
+
+
+def test_grid_design_and_overrides():
+    params = [
+        Parameter.from_spec("price_sensitivity", [0.1, 0.2]),
+        Parameter("agents.households", low=1, high=3, num=3, integer=True),
+    ]
+    design = grid_design(params)
+    assert len(design) == 6
+    assert design[-1] == {"price_sensitivity": 0.2, "agents.households": 3}
+    cfg = apply_overrides(
+        BASE, {"agents.households": 5, "rates.firms.water_rate": 0.0}
+    )
+    assert cfg["agents"] == {"households": 5, "firms": 1, "government": True}
+    assert cfg["rates"] == {"firms": {"water_rate": 0.0}}
+    assert BASE["agents"]["households"] == 2
+
+
+def test_config_hash_ignores_run_only_keys():
+    assert config_hash(BASE) == config_hash(dict(BASE, seed=9, output_dir="x"))
+    assert config_hash(BASE) != config_hash(dict(BASE, steps=5))
+
+
+def test_sweep_reuses_cached_points(run_simulation, tmp_path):
+    cache = ResultCache(tmp_path / "cache")
+    design = [{"rates.households.water_rate": r} for r in (0.1, 0.2)]
+    first = run_design(BASE, design, [0, 1], run_simulation.run_model, cache=cache)
+    assert len(cache) == 4
+    assert not any(r["cached"] for r in first)
+    assert first[0]["records"][-1]["water"] != first[2]["records"][-1]["water"]
+
+    extended = design + [{"rates.households.water_rate": 0.3}]
+    second = run_design(
+        BASE, extended, [0, 1], run_simulation.run_model, workers=2, cache=cache
+    )
+    assert [r["cached"] for r in second] == [True] * 4 + [False] * 2
+    assert [r["records"] for r in second[:4]] == [r["records"] for r in first]
+    assert second[4]["records"] == run_simulation.run_model(second[4]["config"], 0)
+
+
+def test_sweep_script_writes_summary(run_sweep, tmp_path):
+    spec = {
+        "base": BASE,
+        "method": "grid",
+        "seeds": [0],
+        "cache_dir": str(tmp_path / "cache"),
+        "output": str(tmp_path / "sweep.csv"),
+        "parameters": {"price_sensitivity": {"values": [0.1, 0.5]}},
+    }
+    results = run_sweep.sweep(spec)
+    lines = (tmp_path / "sweep.csv").read_text().splitlines()
+    assert len(results) == 2 and len(lines) == 3
+    assert lines[0].startswith("point,seed,key,cached,price_sensitivity,carbon_budget")
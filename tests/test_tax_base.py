@@ -0,0 +1,73 @@
+import math
+
+import pytest
+
+from src.agents.aggregates import TaxBase
+from src.agents.government import scan_tolerance
+
+
+def _government(model):
+    return next(a for a in model.agents if a.unique_id == "gov")
+
+
+def test_tax_base_totals_are_exact():
+    base = TaxBase()
+    value = 0.0
+    for _ in range(1000):
+        base.update_income(value, value + 0.1)
+        value += 0.1
+    assert base.income == value
+    base.update_income(base.income, 0.0)
+    assert base.income == 0.0
+
+
+@pytest.mark.parametrize("vectorized", [False, True])
+def test_government_revenue_matches_scan(baseline_model, vectorized):
+    model = baseline_model(households=4, firms=3, vectorized=vectorized, tax_debug=True)
+    if vectorized:
+        model.household_population.income[:] = [1.0, 2.0, 3.0, 4.0]
+    else:
+        for i, agent in enumerate(model.agents[:4], start=1):
+            agent.income = float(i)
+    gov = _government(model)
+    gov.tax_rate = 0.25
+    model.run(steps=3)
+    # 10 income + 3 output per tick, taxed at 25% for three ticks.
+    assert gov.revenue == 3 * 0.25 * 13.0
+
+
+def test_debug_mode_detects_stale_aggregate(baseline_model):
+    model = baseline_model(households=2, firms=1, tax_debug=True)
+    _government(model).tax_rate = 0.1
+    model.tax_base.update_income(0.0, 5.0)
+    with pytest.raises(RuntimeError):
+        model.step()
+
+
+def test_revenue_is_exact_sum_within_scan_tolerance(baseline_model):
+    incomes = [0.1] * 10
+    model = baseline_model(households=10, firms=0, has_bank=False, tax_debug=True)
+    for agent, income in zip(model.agents, incomes):
+        agent.income = income
+    gov = _government(model)
+    gov.tax_rate = 1.0
+    model.step()
+    scanned = 0.0
+    for income in incomes:
+        scanned += income * gov.tax_rate
+    assert gov.revenue == math.fsum(incomes) * gov.tax_rate == 1.0
+    assert scanned != gov.revenue
+    assert abs(gov.revenue - scanned) <= scan_tolerance(len(incomes), scanned)
+
+
+def test_unchanged_assignments_skip_the_tax_base(baseline_model):
+    model = baseline_model(households=1, firms=1)
+    household, firm = model.agents[:2]
+    updates = []
+    model.tax_base.update_income = lambda old, new: updates.append((old, new))
+    model.tax_base.update_output = lambda old, new: updates.append((old, new))
+    household.income = household.income
+    firm.step()
+    firm.step()
+    household.income = 2.0
+    assert updates == [(0.0, 1.0), (0.0, 2.0)]